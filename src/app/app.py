@@ -5,7 +5,6 @@ import argparse
 from fasthtml.common import *
 from math_construct.problems import get_problem_class
 from scripts.analyze import analyze_run
-from math_construct.problems import get_all_problem_classes
 import yaml 
 from loguru import logger
 
@@ -27,10 +26,6 @@ run_dir = args.run
 results = {} 
 #logger.info(f"Done analyzing run {run_dir}.")
 
-# Prepare problem classes
-problem_classes = get_all_problem_classes()
-problem_classes = {problem_class.config.name: problem_class for problem_class in problem_classes}
-
 app, rt = fast_app(live=False, hdrs=[
     Meta(name="color-scheme", content="only light"),
     #KatexMarkdownJS(),
@@ -331,7 +326,7 @@ def get(model: str, problem_name: str):
     instances_html = []
     for i, entry in enumerate(res): 
         try:
-            problem_class = problem_classes[problem_name]
+            problem_class = get_problem_class(problem_name)
             instance = problem_class.from_json(entry["problem"])
         except Exception as e:
             logger.info(f"Error parsing an instance of the problem {problem_name}: {e}")
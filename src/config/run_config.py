@@ -13,8 +13,19 @@ class InferenceConfig(PBMwODP, extra="forbid"):  # type: ignore
     temperature: float = Field(..., description="Temperature for sampling")
     top_p: float = Field(..., description="Top p for sampling")
     max_tokens: Optional[int] = Field(..., description="Max tokens for sampling")
-    concurrent_requests: int = Field(..., description="API concurrent requests")
+    concurrent_requests: int = Field(..., description="API concurrent requests (asyncio tasks sharing one client per provider, can be in the hundreds)")
     timeout: int = Field(500, description="Timeout for API")
+    requests_per_minute: Optional[float] = Field(None, description="Requests per minute allowed by the provider, None for no limit")
+    tokens_per_minute: Optional[float] = Field(None, description="Tokens per minute allowed by the provider, None for no limit")
+    cache_dir: Optional[str] = Field(None, description="Directory of the LLM response cache, None to disable it")
+    cache_mode: str = Field("rw", description="Mode of the response cache: rw (read-write), ro (replay only) or wo (write only)")
+    stream: bool = Field(False, description="Stream responses (OpenAI and Anthropic), records time to first token and tokens/s")
+    stop_after_boxed_tokens: Optional[int] = Field(None, description="Stop a streamed response this many tokens after a complete \\boxed{} answer")
+    max_output_bytes: Optional[int] = Field(None, description="Stop a streamed response once it exceeds this many bytes")
+    batch: bool = Field(False, description="Run the queries through the provider's batch API (OpenAI, Anthropic) at half the price")
+    batch_dir: str = Field("outputs/batches", description="Directory where the IDs of submitted batches are saved to resume them")
+    batch_poll_interval: float = Field(60, description="Seconds between checks of a submitted batch")
+    base_url: Optional[str] = Field(None, description="Base URL replacing the provider's, e.g. of a local mock server (scripts/mock_server.py)")
 
 class SolverConfig(PBMwODP, extra="forbid"):  # type: ignore
     type_solver: SolverEnum = Field(SolverEnum.CoT, description="Type of solver")
@@ -47,4 +58,5 @@ class RunConfig(PBMwODP):
     problems: List[str] = Field(..., description="List of problem regexes, we run the union of all matched problems")
     n_variations: int = Field(..., description="Number of variations to generate for each problem")
     tags: List[str] = Field([], description="List of problem tags to filter by.")
-    n_try_variations: Optional[int] = Field(None, description="Number of variations to generate for each problem before filtering by tags")
\ No newline at end of file
+    n_try_variations: Optional[int] = Field(None, description="Number of variations to generate for each problem before filtering by tags")
+    n_generation_workers: int = Field(1, description="Number of worker processes used to generate the variations, the result does not depend on it")
\ No newline at end of file
@@ -0,0 +1,346 @@
+import re
+import sys
+import time
+from fractions import Fraction
+from functools import lru_cache
+from typing import Optional, Union
+from sympy import N, Add, Integer, Mul, Pow, Rational, binomial, factorial, integer_nthroot
+from math_construct.utils import latex2sympy_fixed
+
+# Number of distinct LaTeX tokens whose parsed expression (and evaluations) are kept per process
+LATEX_CACHE_SIZE = 1 << 14
+
+SIGNED_INT_RE = re.compile(r"[+-]?[0-9]+", re.ASCII)
+SIMPLE_FRACTION_RE = re.compile(r"(-?)\s*(?:([0-9]+)\s*/\s*([0-9]+)|\\[dt]?frac\s*\{\s*([0-9]+)\s*\}\s*\{\s*([0-9]+)\s*\})", re.ASCII)
+ARITHMETIC_TOKEN_RE = re.compile(r"\s*(?:([0-9]+)|(\\cdot|\\times)(?![a-zA-Z])|([-+*^(){}]))", re.ASCII)
+# Bounds of the exact fast path, beyond them values are left to sympy: they are well below the bounds of the exact
+# evaluation of sympy expressions, and floats of fractions with huge denominators may round differently
+MAX_FAST_INT_BITS = 1 << 20
+MAX_FAST_DENOMINATOR_BITS = 3000
+# Integer values (and intermediate results) up to this size are evaluated exactly, larger ones with N(.., 50001)
+MAX_EXACT_INT_BITS = 1 << 22
+MAX_EXACT_FACTORIAL = 100000
+
+class BranchTimings:
+    """
+    Number of evaluations and total time per branch of the evaluation of answer tokens in this process: "fast" (and
+    "fast_miss") for the Python fast path, "parse" for latex2sympy, then the (cached) sympy evaluations "float",
+    "exact" (exact integers), "int" (N(.., 50001) for values that are not rational) and "numer_denom".
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.times = {}
+
+    def add(self, branch: str, seconds: float):
+        self.counts[branch] = self.counts.get(branch, 0) + 1
+        self.times[branch] = self.times.get(branch, 0.0) + seconds
+
+    def reset(self):
+        self.counts, self.times = {}, {}
+
+    def to_dict(self) -> dict[str, dict]:
+        """Branch -> {"count", "time_total", "time_mean"}, the slowest branch (in total) first."""
+        return {
+            branch: {"count": self.counts[branch], "time_total": self.times[branch],
+                     "time_mean": self.times[branch] / self.counts[branch]}
+            for branch in sorted(self.times, key=self.times.get, reverse=True)
+        }
+
+_branch_timings = BranchTimings()
+
+def get_branch_timings() -> BranchTimings:
+    return _branch_timings
+
+class LatexExpression:
+    """
+    A LaTeX token parsed once with latex2sympy_fixed, together with the numeric evaluations that were requested
+    for it. Instances are shared through the LRU cache of get_latex_expression, so they must not be modified.
+    """
+
+    def __init__(self, latex: str):
+        self.latex = latex
+        self.expr = None
+        self.error = None
+        self.evaluations = {}
+        ts_start = time.perf_counter()
+        try:
+            self.expr = latex2sympy_fixed(latex)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+        _branch_timings.add("parse", time.perf_counter() - ts_start)
+
+    def get_expr(self):
+        """The sympy expression, raises a ValueError if the token could not be parsed."""
+        if self.error is not None:
+            raise ValueError(f"Could not parse LaTeX '{self.latex}': {self.error}")
+        return self.expr
+
+    def _evaluate(self, key: tuple, fn):
+        # evaluations that failed are cached as well, tokens that are no expressions are seen many times
+        if key not in self.evaluations:
+            ts_start = time.perf_counter()
+            try:
+                self.evaluations[key] = (True, fn(self.get_expr()))
+            except Exception as e:
+                self.evaluations[key] = (False, f"{type(e).__name__}: {e}")
+            _branch_timings.add(key[0], time.perf_counter() - ts_start)
+        success, value = self.evaluations[key]
+        if not success:
+            raise ValueError(f"Could not evaluate LaTeX '{self.latex}': {value}")
+        return value
+
+    def to_float(self, n_digits: int) -> float:
+        """float(N(expr, n_digits))"""
+        return self._evaluate(("float", n_digits), lambda expr: float(N(expr, n_digits)))
+
+    def to_int(self, n_digits: int) -> int:
+        """int(N(expr, n_digits)), which is exact for integers with up to n_digits digits."""
+        return self._evaluate(("int", n_digits), lambda expr: int(N(expr, n_digits)))
+
+    def to_exact_int(self) -> int:
+        """
+        The integer part (truncated like int()) of the exact value of expr, which must be rational. Falls back to
+        to_int(50001) if it is not, e.g. for irrational values or values too large to evaluate exactly.
+        """
+        try:
+            return self._evaluate(("exact",), lambda expr: int(evaluate_exact(expr)))
+        except ValueError:
+            return self.to_int(50001)
+
+    def get_numer_denom(self) -> Optional[tuple[int, int]]:
+        """Numerator and denominator of expr.as_numer_denom() if both are integers, None otherwise."""
+        def numer_denom(expr):
+            numerator, denominator = expr.as_numer_denom()
+            if not isinstance(numerator, Integer) or not isinstance(denominator, Integer):
+                return None
+            return int(numerator), int(denominator)
+        return self._evaluate(("numer_denom",), numer_denom)
+
+    def get_value(self, primitive_type: type = None) -> Optional[Union[int, Fraction, float]]:
+        """
+        Value of the expression as used by the answer parser: an exact int for integers (evaluated with enough digits
+        for large integers), a Fraction if primitive_type is Fraction, a float otherwise.
+        Returns None if primitive_type is Fraction but the expression is not a fraction of two integers.
+        """
+        float_val = self.to_float(101)
+        if float_val.is_integer() or float("inf") == float_val or float("-inf") == float_val:
+            return self.to_exact_int() # important for large ints
+        elif primitive_type == Fraction:
+            numer_denom = self.get_numer_denom()
+            return Fraction(*numer_denom) if numer_denom is not None else None
+        return float_val
+
+def _check_exact_size(value: Fraction) -> Fraction:
+    if max(abs(value.numerator), value.denominator).bit_length() > MAX_EXACT_INT_BITS:
+        raise ValueError("Too large to evaluate exactly")
+    return value
+
+def evaluate_exact(expr) -> Fraction:
+    """
+    Exact value of a sympy expression built from integers and rationals with +, *, powers (rational exponents only
+    if the root is exact), factorials and binomials. Raises a ValueError for anything else (floats, symbols,
+    irrational values) and for values or intermediate results above MAX_EXACT_INT_BITS.
+    """
+    if isinstance(expr, Rational): # Integer is a Rational
+        return _check_exact_size(Fraction(int(expr.p), int(expr.q)))
+    if isinstance(expr, Add):
+        value = Fraction(0)
+        for arg in expr.args:
+            value = _check_exact_size(value + evaluate_exact(arg))
+        return value
+    if isinstance(expr, Mul):
+        value = Fraction(1)
+        for arg in expr.args:
+            value = _check_exact_size(value * evaluate_exact(arg))
+        return value
+    if isinstance(expr, Pow):
+        base, exponent = evaluate_exact(expr.args[0]), evaluate_exact(expr.args[1])
+        if base == 0 and exponent <= 0:
+            raise ValueError("Zero to a non-positive power")
+        root = exponent.denominator
+        if root != 1:
+            if base < 0:
+                raise ValueError("Root of a negative number")
+            numerator, is_exact_numerator = integer_nthroot(base.numerator, root)
+            denominator, is_exact_denominator = integer_nthroot(base.denominator, root)
+            if not is_exact_numerator or not is_exact_denominator:
+                raise ValueError("Irrational root")
+            base = Fraction(int(numerator), int(denominator))
+        exponent = exponent.numerator
+        if abs(base) != 1 and abs(exponent) * max(abs(base.numerator), base.denominator).bit_length() > MAX_EXACT_INT_BITS:
+            raise ValueError("Too large to evaluate exactly")
+        return base ** exponent
+    if isinstance(expr, factorial):
+        n = evaluate_exact(expr.args[0])
+        if n.denominator != 1 or n < 0 or n > MAX_EXACT_FACTORIAL:
+            raise ValueError("Unsupported factorial")
+        return _check_exact_size(Fraction(int(factorial(int(n)))))
+    if isinstance(expr, binomial):
+        n, k = evaluate_exact(expr.args[0]), evaluate_exact(expr.args[1])
+        if n.denominator != 1 or k.denominator != 1 or n < 0 or min(k, n - k) > MAX_EXACT_FACTORIAL:
+            raise ValueError("Unsupported binomial")
+        return _check_exact_size(Fraction(int(binomial(int(n), int(k)))))
+    raise ValueError(f"Cannot evaluate {type(expr).__name__} exactly")
+
+@lru_cache(maxsize=LATEX_CACHE_SIZE)
+def get_latex_expression(latex: str) -> LatexExpression:
+    """
+    Returns the parsed LaTeX token, parsing it only on the first call for that token in this process.
+    The cache is bounded (least recently used tokens are dropped), see get_latex_expression.cache_info().
+    """
+    return LatexExpression(latex)
+
+class _ArithmeticParser:
+    """
+    Exact evaluator of + - * ^ (and \\cdot, \\times, braces and parentheses) on integer literals, following the operator
+    precedence of sympy's LaTeX parser. Anything the two could disagree on raises a ValueError: implicit multiplication,
+    chained or unbraced non-integer exponents, leading zeros and sums whose terms cancel, which sympy's N() cannot
+    evaluate exactly.
+    """
+
+    def __init__(self, latex: str):
+        self.tokens = []
+        pos = 0
+        latex = latex.rstrip()
+        while pos < len(latex):
+            match = ARITHMETIC_TOKEN_RE.match(latex, pos)
+            if match is None:
+                raise ValueError(f"Unsupported token at {pos}")
+            number, command, operator = match.groups()
+            if number is not None:
+                if len(number) > 1 and number[0] == "0":
+                    raise ValueError("Leading zeros")
+                self.tokens.append(("num", int(number)))
+            else:
+                self.tokens.append(("op", "*" if command is not None else operator))
+            pos = match.end()
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def expect(self, op: str):
+        if self.peek() != ("op", op):
+            raise ValueError(f"Expected {op}")
+        self.pos += 1
+
+    def parse(self) -> Fraction:
+        value = self.parse_sum()
+        if self.pos != len(self.tokens):
+            raise ValueError("Unexpected trailing tokens")
+        return value
+
+    def parse_sum(self) -> Fraction:
+        value = self.parse_product()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            op = self.peek()[1]
+            self.pos += 1
+            term = self.parse_product()
+            result = value + term if op == "+" else value - term
+            # sympy keeps the sum unevaluated and N() of cancelling terms is not exact (3-2-1 gives 3e-210)
+            if 2 * abs(result) < max(abs(value), abs(term)):
+                raise ValueError("Cancellation")
+            value = result
+        return value
+
+    def parse_product(self) -> Fraction:
+        value = self.parse_unary()
+        while self.peek() == ("op", "*"):
+            self.pos += 1
+            value = self.check_size(value * self.parse_unary())
+        return value
+
+    def parse_unary(self) -> Fraction:
+        kind, token = self.peek()
+        if kind == "op" and token in ("+", "-"):
+            self.pos += 1
+            value = self.parse_unary()
+            return -value if token == "-" else value
+        return self.parse_power()
+
+    def parse_power(self) -> Fraction:
+        base = self.parse_atom()
+        if self.peek() != ("op", "^"):
+            return base
+        self.pos += 1
+        kind, token = self.peek()
+        if kind == "num":
+            self.pos += 1
+            exponent = Fraction(token)
+        elif (kind, token) == ("op", "{"):
+            self.pos += 1
+            exponent = self.parse_sum()
+            self.expect("}")
+        else:
+            # sympy parses 2^-1 and 2^(3) as 2
+            raise ValueError("Unsupported exponent")
+        if self.peek() == ("op", "^"):
+            raise ValueError("Chained exponents")
+        if exponent.denominator != 1:
+            raise ValueError("Non-integer exponent")
+        if base == 0 and exponent < 0:
+            raise ValueError("Division by zero")
+        if abs(base) > 1 and abs(exponent) * max(abs(base.numerator), base.denominator).bit_length() > MAX_FAST_INT_BITS:
+            raise ValueError("Too large")
+        return base ** int(exponent)
+
+    def parse_atom(self) -> Fraction:
+        kind, token = self.peek()
+        if kind == "num":
+            self.pos += 1
+            return Fraction(token)
+        for opening, closing in (("(", ")"), ("{", "}")):
+            if (kind, token) == ("op", opening):
+                self.pos += 1
+                value = self.parse_sum()
+                self.expect(closing)
+                return value
+        raise ValueError("Expected a number")
+
+    @staticmethod
+    def check_size(value: Fraction) -> Fraction:
+        if max(abs(value.numerator), value.denominator).bit_length() > MAX_FAST_INT_BITS:
+            raise ValueError("Too large")
+        return value
+
+def get_fast_value(latex: str, primitive_type: type = None) -> Optional[Union[int, Fraction, float]]:
+    """
+    Evaluates simple tokens (signed integers, a/b, -\\frac{a}{b} and + - * ^ on integer literals) exactly in Python.
+    The result is identical to get_latex_expression(latex).get_value(primitive_type), None if the token is not simple
+    enough and has to go through sympy.
+    """
+    is_simple_fraction = False
+    match = SIMPLE_FRACTION_RE.fullmatch(latex.strip())
+    if match is not None:
+        sign, numerator, denominator = match.group(1), match.group(2) or match.group(4), match.group(3) or match.group(5)
+        if int(denominator) == 0 or any(len(x) > 1 and x[0] == "0" for x in (numerator, denominator)):
+            return None
+        value = Fraction(-int(numerator) if sign else int(numerator), int(denominator))
+        is_simple_fraction = True
+    else:
+        try:
+            value = _ArithmeticParser(latex).parse()
+        except (ValueError, ZeroDivisionError, IndexError):
+            return None
+
+    if value.denominator == 1:
+        if value.numerator.bit_length() > MAX_FAST_INT_BITS:
+            return None
+        return int(value)
+    if value.denominator.bit_length() > MAX_FAST_DENOMINATOR_BITS or value.numerator.bit_length() > MAX_FAST_INT_BITS:
+        return None
+    try:
+        float_val = float(value)
+    except OverflowError:
+        float_val = float("inf")
+    if abs(float_val) < sys.float_info.min:
+        # sympy rounds subnormal floats differently
+        return None
+    if float_val.is_integer() or float("inf") == float_val or float("-inf") == float_val:
+        # int() truncates, like int(N(..)) of a non-integer
+        return int(value)
+    elif primitive_type == Fraction:
+        # as_numer_denom() of other expressions (e.g. 2^{-1}) is left to sympy
+        return value if is_simple_fraction else None
+    return float_val
@@ -1,3 +1,4 @@
 from .api import APIQuery
 from .dummy import DummyLLM
+from .streaming import StopPredicate, BoxedAnswerStop, ByteBudgetStop
 from .solvers import Solver, CoTSolver, CodeSolver
@@ -3,11 +3,17 @@ from loguru import logger
 import re
 import os
 from tqdm import tqdm
-from google import genai
-from openai import OpenAI
 import anthropic
+import asyncio
+import math
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+from .clients import get_client_pool, run_sync
+from .rate_limit import FATAL, RATE_LIMITED, classify_error, get_backoff, get_rate_limiter
+from .response_cache import ResponseCache, get_cache_key
+from .streaming import StreamState
+from .batch import BATCH_APIS, BATCH_COST_FACTOR, BatchState, get_custom_id
+from .telemetry import RequestTelemetry
 
 class APIQuery:
     def __init__(self, model, 
@@ -23,6 +29,19 @@ class APIQuery:
                  write_cost=1,
                  sleep_on_error=60,
                  sleep_after_request=0.1,
+                 backoff_base=1,
+                 max_rate_limit_retries=30,
+                 requests_per_minute=None,
+                 tokens_per_minute=None,
+                 cache_dir=None,
+                 cache_mode="rw",
+                 stream=False,
+                 stop_predicates=None,
+                 batch=False,
+                 batch_dir=os.path.join("outputs", "batches"),
+                 batch_poll_interval=60,
+                 telemetry_path=None,
+                 base_url=None,
                  throw_error_on_failure=False,
                  max_tokens_param="max_tokens", 
                  reasoning_effort=None,
@@ -37,9 +56,22 @@ class APIQuery:
             return_logprobs (bool, optional): Whether to return log probabilities. Defaults to False.
             api (str, optional): The API to be used, one of "openai", "together", "huggingface", "google", "claude", "hyperbolic", "sambanova". Defaults to 'openai'.
             chat (bool, optional): Whether to enable chat mode. Defaults to True.
-            max_retries (int, optional): The maximum number of retries. Defaults to 20.
-            concurrent_requests (int, optional): The number of concurrent requests. Defaults to 30.
-            check_every_n_seconds (float, optional): The interval for checking rate limits. Defaults to 0.1.
+            max_retries (int, optional): The maximum number of retries of retryable errors (timeouts, server errors). Defaults to 5.
+            concurrent_requests (int, optional): The maximum number of concurrent requests, lowered adaptively on rate limits. Defaults to 10.
+            sleep_on_error (float, optional): The maximum backoff in seconds between retries. Defaults to 60.
+            backoff_base (float, optional): The backoff of the first retry in seconds, doubled on each retry. Defaults to 1.
+            max_rate_limit_retries (int, optional): The maximum number of retries of rate limit errors. Defaults to 30.
+            requests_per_minute (float, optional): Requests per minute allowed by the provider, None for no limit. Defaults to None.
+            tokens_per_minute (float, optional): Tokens (input and output) per minute allowed by the provider, None for no limit. Defaults to None.
+            cache_dir (str, optional): Directory of the response cache (see ResponseCache), None to disable it. Defaults to None.
+            cache_mode (str, optional): Mode of the response cache, one of "rw", "ro" (replay) and "wo". Defaults to "rw".
+            stream (bool, optional): Whether to stream the OpenAI and Anthropic responses, which records their time to first token and tokens per second. Defaults to False.
+            stop_predicates (list, optional): StopPredicates that end a streamed generation early (see streaming.py). Defaults to None.
+            batch (bool, optional): Whether to run the queries through the provider's batch API (OpenAI and Anthropic) at half the price. Defaults to False.
+            batch_dir (str, optional): Directory where the IDs of submitted batches are saved to resume them after a restart. Defaults to "outputs/batches".
+            batch_poll_interval (float, optional): Seconds between checks of a submitted batch. Defaults to 60.
+            telemetry_path (str, optional): JSONL file to append an event for every request attempt to (see telemetry.py), None to disable it. Defaults to None.
+            base_url (str, optional): Base URL replacing the provider's, e.g. of a local MockLLMServer. Defaults to None.
             read_cost (float, optional): The cost of read operations. Defaults to None.
             write_cost (float, optional): The cost of write operations. Defaults to None.
             throw_error_on_failure (bool, optional): Whether to throw an error on too many failures or just return None. Defaults to False.
@@ -81,6 +113,17 @@ class APIQuery:
         self.no_system_messages = no_system_messages
         self.sleep_on_error = sleep_on_error
         self.sleep_after_request = sleep_after_request
+        self.backoff_base = backoff_base
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.cache = ResponseCache(cache_dir, cache_mode) if cache_dir is not None else None
+        self.stream = stream or bool(stop_predicates)
+        self.stop_predicates = stop_predicates or []
+        self.batch = batch
+        self.batch_dir = batch_dir
+        self.batch_poll_interval = batch_poll_interval
+        self.telemetry = RequestTelemetry(telemetry_path) if telemetry_path is not None else None
         self.max_tokens_param = max_tokens_param
 
         self.api = api
@@ -88,7 +131,12 @@ class APIQuery:
         self.base_url = None
 
         self.initialize_api_keys()
+        if base_url is not None:
+            self.base_url = base_url
         self.initialize_read_write_costs(model, read_cost, write_cost)
+        if self.batch and self.api not in BATCH_APIS:
+            logger.warning(f"Batch mode is not supported for the {self.api} API, sending the queries one by one.")
+            self.batch = False
 
     def initialize_read_write_costs(self, model, read_cost, write_cost):
         if read_cost is None or read_cost == 1:
@@ -160,30 +208,60 @@ class APIQuery:
         return query
     
     def get_cost(self, response):
+        if response.get("cached", False): # replayed from the response cache, nothing was spent
+            return 0
         cost = response["input_tokens"] * self.read_cost + response["output_tokens"] * self.write_cost
+        if response.get("batch", False):
+            cost *= BATCH_COST_FACTOR
         return cost / (10 ** 6)
 
     def run_queries(self, queries):
-        logger.info(f"Running {len(queries)} queries.")
-        with ThreadPoolExecutor(max_workers=self.concurrent_requests) as executor:
-            future_to_index = {
-                executor.submit(self.run_query_with_retry, query): i
-                for i, query in enumerate(queries)
-            }
-
-            results = [None] * len(queries)
+        """
+        Runs the queries (with run_queries_async) and waits for all of them, for synchronous callers. The clients
+        stay open in the background loop of run_sync for the next call.
+        """
+        return run_sync(self.run_queries_async(queries))
 
-            for future in tqdm(as_completed(future_to_index), total=len(future_to_index)):
-                i = future_to_index[future]
-                results[i] = future.result()
+    async def run_queries_async(self, queries):
+        """
+        Runs the queries concurrently on the running event loop, at most concurrent_requests at a time.
+        Requests to the same provider share one client (see AsyncClientPool), async callers close them with
+        get_client_pool().aclose() when they are done. They also share one RateLimiter, which throttles them
+        to the provider's limits.
+        In batch mode, the queries are first submitted as one provider batch, the ones that fail in it are sent
+        one by one.
+        Returns the outputs, the cost of each query and the total cost.
+        """
+        logger.info(f"Running {len(queries)} queries.")
+        limiter = self.get_rate_limiter()
+        cache_keys = self.get_cache_keys(queries)
+        batch_results = await self.run_batch(queries, cache_keys) if self.batch else [None] * len(queries)
+        with tqdm(total=len(queries), initial=sum(result is not None for result in batch_results)) as progress_bar:
+            async def run_one(query, cache_key):
+                result = self.read_cache(cache_key) if not self.batch else None
+                if result is None:
+                    result = await self.run_query_with_retry(query, limiter, cache_key)
+                progress_bar.update(1)
+                return result
+            async def get_result(query, cache_key, batch_result):
+                return batch_result if batch_result is not None else await run_one(query, cache_key)
+            results = await asyncio.gather(*[get_result(query, cache_key, batch_result)
+                                             for query, cache_key, batch_result in zip(queries, cache_keys, batch_results)])
+        logger.info(f"Rate limiter stats: {limiter.get_stats()}")
+        if self.cache is not None:
+            stats = self.cache.get_stats()
+            logger.info(f"Response cache: {stats['hits']} hits, {stats['misses']} misses (hit rate {stats['hit_rate'] or 0:.1%}), "
+                        f"{stats['writes']} writes, saved ${stats['saved_cost']:.4f}")
         detailed_cost = [
             {
                 "cost": self.get_cost(result),
                 "input_tokens": result["input_tokens"],
                 "output_tokens": result["output_tokens"],
+                **{key: result[key] for key in ("ttft", "tokens_per_second", "truncated", "cached") if key in result},
             }
             for result in results
         ]
+        self.log_stream_stats(detailed_cost)
         cost = {
             "cost": sum([d["cost"] for d in detailed_cost]),
             "input_tokens": sum([d["input_tokens"] for d in detailed_cost]),
@@ -191,20 +269,178 @@ class APIQuery:
         }
         return [result['output'] for result in results], detailed_cost, cost
     
-    def run_query_with_retry(self, query):
-        i = 0
-        while i < self.max_retries:
+    def log_stream_stats(self, detailed_cost):
+        ttfts = sorted(d["ttft"] for d in detailed_cost if d.get("ttft") is not None)
+        speeds = [d["tokens_per_second"] for d in detailed_cost if d.get("tokens_per_second") is not None]
+        if len(ttfts) == 0:
+            return
+        logger.info(f"Streamed {len(ttfts)} responses: median time to first token {ttfts[len(ttfts) // 2]:.2f}s, "
+                    f"mean {sum(speeds) / max(1, len(speeds)):.1f} tokens/s, {sum(d.get('truncated', False) for d in detailed_cost)} stopped early")
+
+    def should_stop(self, state):
+        return any(predicate(state) for predicate in self.stop_predicates)
+
+    def get_stream_result(self, state, input_tokens, output_tokens, truncated):
+        """
+        The result of a streamed response. A stream stopped early does not receive the provider's final usage,
+        its tokens are estimated from the streamed chunks (and the prompt), which is what the provider bills.
+        """
+        state.finish()
+        if output_tokens is None:
+            output_tokens = state.estimate_output_tokens()
+        return {
+            "output": state.text,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "ttft": state.get_ttft(),
+            "tokens_per_second": state.get_tokens_per_second(output_tokens),
+            "truncated": truncated,
+        }
+
+    def get_batch_params(self, query):
+        """Request parameters of a query in a provider batch."""
+        query = self.prepare_query(query)
+        if self.api == "anthropic" and query[0]["role"] == "system":
+            return {"model": self.model, "system": query[0]["content"], "messages": query[1:], "temperature": self.temperature, **self.kwargs}
+        return {"model": self.model, "messages": query, "temperature": self.temperature, **self.kwargs}
+
+    async def run_batch(self, queries, cache_keys):
+        """
+        Runs the (uncached) queries as one provider batch: submits it, or resumes the batch saved for the same
+        requests in batch_dir, polls it until it ends and maps the results back to the queries.
+        Returns the results of the queries, None for the ones that failed in the batch.
+        """
+        results = [self.read_cache(cache_key) for cache_key in cache_keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if len(pending) == 0:
+            return results
+        batch_api = BATCH_APIS[self.api]
+        client = self.get_client()
+        requests = [batch_api.build_request(get_custom_id(i), self.get_batch_params(queries[i])) for i in pending]
+        state = BatchState(self.batch_dir, self.api, requests)
+        batch_id = state.load()
+        if batch_id is not None:
+            logger.info(f"Resuming batch {batch_id} of {len(requests)} queries from {state.path}")
+        else:
+            batch_id = await batch_api.submit(client, requests)
+            state.save(batch_id, len(requests))
+            logger.info(f"Submitted batch {batch_id} of {len(requests)} queries, saved to {state.path}")
+        while True:
+            done, status = await batch_api.get_status(client, batch_id)
+            logger.info(f"Batch {batch_id}: {status}")
+            if done:
+                break
+            await asyncio.sleep(self.batch_poll_interval)
+        batch_results = await batch_api.get_results(client, batch_id)
+        for i in pending:
+            result = batch_results.get(get_custom_id(i))
+            if result is not None:
+                results[i] = {**result, "batch": True}
+                if cache_keys[i] is not None:
+                    self.cache.put(cache_keys[i], results[i])
+                self.record_attempt({"attempt": 0}, results[i])
+        n_failed = sum(results[i] is None for i in pending)
+        if n_failed > 0:
+            logger.warning(f"{n_failed} of {len(pending)} queries failed in batch {batch_id}, sending them one by one.")
+        state.remove()
+        return results
+
+    def get_provider_name(self):
+        return urlsplit(self.base_url).netloc if self.base_url is not None else self.api
+
+    def record_attempt(self, event, output=None):
+        """Records a request attempt in the telemetry, with the tokens and cost of its output if it succeeded."""
+        if self.telemetry is None:
+            return
+        event = {"provider": self.get_provider_name(), "model": self.model, "ts_start": time.time(), **event}
+        if output is not None:
+            event.update(input_tokens=output["input_tokens"], output_tokens=output["output_tokens"], cost=self.get_cost(output))
+            event.update({key: output[key] for key in ("ttft", "truncated", "batch", "cached") if key in output})
+        self.telemetry.record(**event)
+
+    def get_rate_limiter(self):
+        return get_rate_limiter(self.api, self.base_url, self.model, self.concurrent_requests, self.requests_per_minute, self.tokens_per_minute)
+
+    def estimate_tokens(self, query):
+        # ~4 characters per token for the prompt, the full budget for the completion
+        n_chars = sum(len(message["content"]) for message in query if isinstance(message.get("content"), str))
+        return n_chars / 4 + (self.kwargs.get(self.max_tokens_param) or 0)
+
+    def get_cache_keys(self, queries):
+        """
+        Cache keys of the queries. Identical queries of one call are numbered with a sample index, so that they
+        get independent samples, which are all reused by the next run.
+        """
+        if self.cache is None:
+            return [None] * len(queries)
+        keys, n_samples = [], {}
+        for query in queries:
+            request = {
+                "api": self.api,
+                "base_url": self.base_url,
+                "model": self.model,
+                "messages": self.prepare_query(query),
+                "temperature": self.temperature,
+                "kwargs": self.kwargs, # top_p, max tokens, reasoning effort, ...
+            }
+            request_key = get_cache_key(request)
+            request["sample_index"] = n_samples.get(request_key, 0)
+            n_samples[request_key] = request["sample_index"] + 1
+            keys.append(get_cache_key(request))
+        return keys
+
+    def read_cache(self, cache_key):
+        if cache_key is None:
+            return None
+        result = self.cache.get(cache_key)
+        if result is None:
+            return None
+        # the saved cost is what the response cost when it was queried, e.g. the batch price
+        self.cache.add_saved_cost(self.get_cost(result))
+        result = {**result, "cached": True}
+        self.record_attempt({"attempt": 0}, result)
+        return result
+
+    async def run_query_with_retry(self, query, limiter, cache_key=None):
+        n_errors, n_rate_limits = 0, 0
+        estimated_tokens = self.estimate_tokens(query)
+        while n_errors < self.max_retries and n_rate_limits < self.max_rate_limit_retries:
+            event = {"attempt": n_errors + n_rate_limits}
+            ts_queued = time.perf_counter()
             try:
-                output = self.run_query(query)
-                time.sleep(self.sleep_after_request)
+                # waiting for a retry does not hold a slot of the limiter
+                async with limiter.slot(estimated_tokens):
+                    ts_sent = time.perf_counter()
+                    event.update(ts_start=time.time(), queue_wait=ts_sent - ts_queued)
+                    output = await self.run_query(query)
+                    event["latency"] = time.perf_counter() - ts_sent
+                    headers = output.pop("headers", None)
+                    limiter.on_success(estimated_tokens, output["input_tokens"] + output["output_tokens"], headers)
+                self.record_attempt(event, output)
+                # an output cut short by a stop predicate is not a full completion for runs with other predicates
+                if cache_key is not None and not output.get("truncated", False):
+                    self.cache.put(cache_key, {key: output[key] for key in ("output", "input_tokens", "output_tokens")})
+                # the slot is already free for the next request, the limiter does the pacing
+                await asyncio.sleep(self.sleep_after_request)
                 return output
             except Exception as e:
-                logger.error(f"Error: {e}")
-                time.sleep(self.sleep_on_error)
-                # if api error is not due to rate limit, try again
-                if "rate limit" not in str(e).lower() and "429" not in str(e):
-                    i += 1
-                continue
+                kind, retry_after = classify_error(e)
+                limiter.on_error(kind, retry_after)
+                logger.error(f"Error ({kind}): {e}")
+                if "ts_start" in event:
+                    event["latency"] = time.perf_counter() - ts_sent
+                event.update(error=kind, error_class=type(e).__name__, backoff=0)
+                if kind == FATAL:
+                    self.record_attempt(event)
+                    break
+                if kind == RATE_LIMITED:
+                    n_rate_limits += 1
+                else:
+                    n_errors += 1
+                # the limiter pauses all requests for retry_after, the backoff spreads out the retries
+                event["backoff"] = get_backoff(n_errors + n_rate_limits - 1, self.backoff_base, self.sleep_on_error)
+                self.record_attempt(event)
+                await asyncio.sleep(event["backoff"])
         if self.throw_error_on_failure:
             raise ValueError("Max retries reached.")
         else:
@@ -214,44 +450,75 @@ class APIQuery:
                 "output_tokens": 0,
             }
     
-    def run_query(self, query):
+    async def run_query(self, query):
         query = self.prepare_query(query)
         if self.api == "openai":
-            return self.openai_query(query)
-        elif self.api == "together":
-            return self.together_query(query)
+            return await self.openai_query(query)
         elif self.api == "google":
-            return self.google_query(query)
+            return await self.google_query(query)
         elif self.api == "anthropic":
-            return self.anthropic_query(query)
+            return await self.anthropic_query(query)
+
+    def get_client(self):
+        return get_client_pool().get_client(self.api, self.api_key, self.base_url, self.timeout)
         
-    def anthropic_query(self, query):
-        client = anthropic.Anthropic(
-            api_key=self.api_key,
-            max_retries=0,
-            timeout=self.timeout,
-        )
+    async def anthropic_query(self, query):
+        client = self.get_client()
         system_message = anthropic.NOT_GIVEN
         if query[0]["role"] == "system":
             system_message = query[0]["content"]
             query = query[1:]
-        result = client.messages.create(
+        if self.stream:
+            return await self.anthropic_stream_query(client, query, system_message)
+        raw_result = await client.messages.with_raw_response.create(
             model=self.model,
             messages=query,
             system=system_message,
             temperature=self.temperature,
             **self.kwargs
         )
+        result = raw_result.parse()
         return {
             "output": result.content[0].text,
             "input_tokens": result.usage.input_tokens,
             "output_tokens": result.usage.output_tokens,
+            "headers": raw_result.headers,
         }
     
-    def google_query(self, query):
-        client = genai.Client(api_key=self.api_key, http_options={'api_version':'v1alpha'})
+    async def anthropic_stream_query(self, client, query, system_message):
+        # the time to first token counts from sending the request, the headers arrive before the first token
+        state = StreamState()
+        raw_stream = await client.messages.with_raw_response.create(
+            model=self.model,
+            messages=query,
+            system=system_message,
+            temperature=self.temperature,
+            stream=True,
+            **self.kwargs
+        )
+        stream = raw_stream.parse()
+        input_tokens, output_tokens, truncated = 0, None, False
+        try:
+            async for event in stream:
+                if event.type == "message_start":
+                    input_tokens = event.message.usage.input_tokens
+                elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+                    state.add(event.delta.text)
+                    if self.should_stop(state):
+                        truncated = True
+                        break
+                elif event.type == "message_delta":
+                    output_tokens = event.usage.output_tokens
+        finally:
+            await stream.close()
+        result = self.get_stream_result(state, input_tokens, output_tokens if not truncated else None, truncated)
+        result["headers"] = raw_stream.headers
+        return result
+
+    async def google_query(self, query):
+        client = self.get_client()
         config = {'thinking_config': {'include_thoughts': True}}
-        response = client.models.generate_content(
+        response = await client.models.generate_content(
             model=self.model,
             contents=query,
             config=config,
@@ -262,16 +529,17 @@ class APIQuery:
             "output_tokens": response.usage_metadata.candidates_token_count,
         }
     
-    def openai_query(self, query):
-        client = OpenAI(api_key=self.api_key, base_url=self.base_url, 
-                        timeout=self.timeout, max_retries=0)
-        
-        response = client.chat.completions.create(
+    async def openai_query(self, query):
+        client = self.get_client()
+        if self.stream:
+            return await self.openai_stream_query(client, query)
+        raw_response = await client.chat.completions.with_raw_response.create(
             model=self.model,
             messages=query,
             temperature=self.temperature,
             **self.kwargs
         )
+        response = raw_response.parse()
 
         output = response.choices[0].message.content
         if hasattr(response.choices[0].message, "reasoning_content"):
@@ -280,4 +548,45 @@ class APIQuery:
             "output": output,
             "input_tokens": response.usage.prompt_tokens,
             "output_tokens": response.usage.completion_tokens,
+            "headers": raw_response.headers,
         }
+
+    async def openai_stream_query(self, client, query):
+        state, reasoning = StreamState(), StreamState()
+        raw_stream = await client.chat.completions.with_raw_response.create(
+            model=self.model,
+            messages=query,
+            temperature=self.temperature,
+            stream=True,
+            stream_options={"include_usage": True},
+            **self.kwargs
+        )
+        stream = raw_stream.parse()
+        usage, truncated = None, False
+        try:
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                if len(chunk.choices) == 0:
+                    continue
+                delta = chunk.choices[0].delta
+                if getattr(delta, "reasoning_content", None):
+                    reasoning.add(delta.reasoning_content)
+                    state.ts_first_token = state.ts_first_token or reasoning.ts_first_token
+                state.add(delta.content)
+                if self.should_stop(state):
+                    truncated = True
+                    break
+        finally:
+            await stream.close()
+        if usage is not None:
+            input_tokens, output_tokens = usage.prompt_tokens, usage.completion_tokens
+        else:
+            # stopped early, or a backend without usage in streams
+            input_tokens = math.ceil(sum(len(str(message["content"])) for message in query) / 4)
+            output_tokens = state.estimate_output_tokens() + reasoning.estimate_output_tokens()
+        result = self.get_stream_result(state, input_tokens, output_tokens, truncated)
+        if len(reasoning.parts) > 0:
+            result["output"] = reasoning.text + "\n\n" + result["output"]
+        result["headers"] = raw_stream.headers
+        return result
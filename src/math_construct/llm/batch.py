@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Optional
+from loguru import logger
+
+# Batch requests cost half of the regular price (OpenAI batches, Anthropic message batches)
+BATCH_COST_FACTOR = 0.5
+
+def get_custom_id(index: int) -> str:
+    return f"query-{index}"
+
+def get_index(custom_id: str) -> int:
+    return int(custom_id.split("-")[-1])
+
+class OpenAIBatchAPI:
+    """Batches of chat completions: a JSONL file uploaded with the files API and submitted to /v1/batches."""
+
+    TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+    def build_request(self, custom_id: str, params: dict) -> dict:
+        return {"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": params}
+
+    async def submit(self, client, requests: list[dict]) -> str:
+        content = "".join(json.dumps(request) + "\n" for request in requests).encode()
+        input_file = await client.files.create(file=("batch.jsonl", content), purpose="batch")
+        batch = await client.batches.create(input_file_id=input_file.id, endpoint="/v1/chat/completions", completion_window="24h")
+        return batch.id
+
+    async def get_status(self, client, batch_id: str) -> tuple[bool, str]:
+        batch = await client.batches.retrieve(batch_id)
+        return batch.status in self.TERMINAL_STATUSES, f"{batch.status} {batch.request_counts}"
+
+    async def get_results(self, client, batch_id: str) -> dict[str, Optional[dict]]:
+        """Results by custom_id, None for requests that failed."""
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status != "completed":
+            logger.warning(f"Batch {batch_id} ended with status {batch.status}")
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id is None:
+                continue
+            content = await client.files.content(file_id)
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response = entry.get("response") or {}
+                if response.get("status_code") == 200:
+                    results[entry["custom_id"]] = self.parse_response(response["body"])
+                else:
+                    logger.error(f"Batch request {entry['custom_id']} failed: {entry.get('error') or response.get('body')}")
+                    results[entry["custom_id"]] = None
+        return results
+
+    def parse_response(self, body: dict) -> dict:
+        message = body["choices"][0]["message"]
+        output = message["content"]
+        if message.get("reasoning_content") is not None:
+            output = message["reasoning_content"] + "\n\n" + output
+        return {"output": output, "input_tokens": body["usage"]["prompt_tokens"], "output_tokens": body["usage"]["completion_tokens"]}
+
+class AnthropicBatchAPI:
+    """Anthropic message batches, the requests are sent inline."""
+
+    def build_request(self, custom_id: str, params: dict) -> dict:
+        return {"custom_id": custom_id, "params": params}
+
+    async def submit(self, client, requests: list[dict]) -> str:
+        batch = await client.messages.batches.create(requests=requests)
+        return batch.id
+
+    async def get_status(self, client, batch_id: str) -> tuple[bool, str]:
+        batch = await client.messages.batches.retrieve(batch_id)
+        return batch.processing_status == "ended", f"{batch.processing_status} {batch.request_counts}"
+
+    async def get_results(self, client, batch_id: str) -> dict[str, Optional[dict]]:
+        results = {}
+        async for entry in await client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                message = entry.result.message
+                results[entry.custom_id] = {"output": message.content[0].text, "input_tokens": message.usage.input_tokens,
+                                            "output_tokens": message.usage.output_tokens}
+            else:
+                logger.error(f"Batch request {entry.custom_id} {entry.result.type}: {getattr(entry.result, 'error', None)}")
+                results[entry.custom_id] = None
+        return results
+
+BATCH_APIS = {
+    "openai": OpenAIBatchAPI(),
+    "anthropic": AnthropicBatchAPI(),
+}
+
+class BatchState:
+    """
+    Submitted batch of a set of requests, saved to `batch_dir` so that a restarted run with the same requests
+    resumes polling the batch instead of submitting (and paying for) it again.
+    """
+
+    def __init__(self, batch_dir: str, api: str, requests: list[dict]):
+        key = hashlib.sha256(json.dumps([api, requests], sort_keys=True).encode()).hexdigest()
+        self.path = os.path.join(batch_dir, f"{api}-{key[:32]}.json")
+
+    def load(self) -> Optional[str]:
+        """Batch ID of the requests if they were already submitted."""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "r") as f:
+            return json.load(f)["batch_id"]
+
+    def save(self, batch_id: str, n_requests: int):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump({"batch_id": batch_id, "n_requests": n_requests, "submitted": datetime.now().isoformat(timespec="seconds")}, f)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
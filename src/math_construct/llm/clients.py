@@ -0,0 +1,102 @@
+import asyncio
+import atexit
+import os
+import threading
+from typing import Any, Coroutine, Optional
+from loguru import logger
+import anthropic
+from google import genai
+from openai import AsyncOpenAI
+
+def create_async_client(api: str, api_key: str, base_url: Optional[str] = None, timeout: Optional[float] = None):
+    """Creates the async client of a provider, retries are done by APIQuery."""
+    if api == "openai":
+        return AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0)
+    elif api == "anthropic":
+        return anthropic.AsyncAnthropic(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0)
+    elif api == "google":
+        return genai.Client(api_key=api_key, http_options={'api_version': 'v1alpha'}).aio
+    raise ValueError(f"API {api} not supported.")
+
+async def close_async_client(client):
+    if hasattr(client, "close"): # openai and anthropic
+        await client.close()
+    elif hasattr(client, "aclose"): # google
+        await client.aclose()
+
+class AsyncClientPool:
+    """
+    Long-lived async provider clients, one per (api, base_url, api_key, timeout) and event loop. All requests of a
+    run share the connection pool of their client instead of opening a new connection (and TLS session) each.
+    Clients are bound to the event loop they were created in, aclose() closes those of the running loop. The
+    clients of synchronous callers live in the background loop of run_sync until the process exits.
+    """
+
+    def __init__(self):
+        self.clients = {}
+
+    def get_client(self, api: str, api_key: str, base_url: Optional[str] = None, timeout: Optional[float] = None):
+        key = (asyncio.get_running_loop(), api, base_url, api_key, timeout)
+        if key not in self.clients:
+            self.clients[key] = create_async_client(api, api_key, base_url, timeout)
+        return self.clients[key]
+
+    def __len__(self):
+        return len(self.clients)
+
+    async def aclose(self):
+        """Closes (and forgets) the clients of the running event loop."""
+        loop = asyncio.get_running_loop()
+        for key in [key for key in self.clients if key[0] is loop]:
+            await close_async_client(self.clients.pop(key))
+
+_client_pool = AsyncClientPool()
+
+def get_client_pool() -> AsyncClientPool:
+    return _client_pool
+
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the event loop that runs the coroutines of run_sync, in a daemon thread. It lives as long as the process,
+    and so do the clients of the pool created in it. A forked child process starts its own loop.
+    """
+    global _loop, _loop_pid
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            threading.Thread(target=_loop.run_forever, name="run-sync-loop", daemon=True).start()
+        return _loop
+
+def run_sync(coroutine: Coroutine) -> Any:
+    """
+    Runs a coroutine to completion from synchronous code, on the background loop of the process (see
+    get_background_loop). Successive calls, e.g. the rounds of a solver, reuse the pooled clients and their
+    connections. This also works from a thread that runs its own event loop (e.g. in a notebook).
+    """
+    loop = get_background_loop()
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is loop:
+        raise RuntimeError("run_sync cannot be called from a coroutine of its own event loop")
+    return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+@atexit.register
+def close_background_loop():
+    """Closes the clients of the background loop and stops it."""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(_client_pool.aclose(), _loop).result(timeout=10)
+        except Exception as e:
+            logger.warning(f"Could not close the API clients: {e}")
+        _loop.call_soon_threadsafe(_loop.stop)
+        _loop = None
@@ -0,0 +1,104 @@
+import glob
+import json
+import os
+from typing import Iterable, Optional
+from loguru import logger
+from math_construct.problems import get_problem_class
+from math_construct.problems.problem import Problem
+from math_construct.problems.parser_benchmark import format_answer
+from math_construct.llm.mock_server import get_text
+
+class PromptIndex:
+    """
+    Finds the problem a request is about. The solvers start the first user message with str(problem) followed
+    by "\\n\\n" and the formatting instructions, so the message is looked up at each "\\n\\n" boundary.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    def add(self, prompt: str, value):
+        self.values[prompt] = value
+
+    def __len__(self):
+        return len(self.values)
+
+    def find(self, messages: list[dict]):
+        content = next((get_text(message["content"]) for message in messages if message["role"] == "user"), "")
+        candidates = [content] + [content[:i] for i in range(len(content)) if content.startswith("\n\n", i)]
+        for candidate in candidates:
+            if candidate in self.values:
+                self.stats["hits"] += 1
+                return self.values[candidate]
+        self.stats["misses"] += 1
+        return None
+
+class SolutionResponder:
+    """
+    Answers each problem with its own solution (get_solution()), written as a \\boxed{} answer like
+    format_answer does. Unknown problems get `fallback`.
+    """
+
+    def __init__(self, problems: Iterable[Problem], fallback: str = "I do not know this problem. \\boxed{0}"):
+        self.index = PromptIndex()
+        for problem in problems:
+            if problem.get_solution() is not None:
+                self.index.add(str(problem), f"Here is a construction.\n\n\\boxed{{{format_answer(problem.get_solution())}}}")
+        self.fallback = fallback
+        logger.info(f"Solution responder knows {len(self.index)} problems")
+
+    def __call__(self, messages: list[dict], model: str) -> Optional[str]:
+        answer = self.index.find(messages)
+        return answer if answer is not None else self.fallback
+
+class ReplayResponder:
+    """
+    Replays the responses of recorded runs (outputs/<run>/<model>/<problem>.json). A request gets the recorded
+    assistant message of its problem at the same turn (feedback rounds add turns). Unknown problems get `fallback`.
+    """
+
+    def __init__(self, run_dirs: list[str], model: Optional[str] = None, fallback: str = "I do not know this problem. \\boxed{0}"):
+        self.index = PromptIndex()
+        for run_dir in run_dirs:
+            pattern = os.path.join(run_dir, model.replace("/", "__") if model is not None else "*", "*.json")
+            for path in sorted(glob.glob(pattern)):
+                for problem, replies in iter_recorded_replies(path):
+                    self.index.add(str(problem), replies)
+        self.fallback = fallback
+        logger.info(f"Replay responder knows {len(self.index)} problems")
+
+    def __call__(self, messages: list[dict], model: str) -> Optional[str]:
+        replies = self.index.find(messages)
+        if replies is None or len(replies) == 0:
+            return self.fallback
+        turn = sum(message["role"] == "assistant" for message in messages)
+        return replies[min(turn, len(replies) - 1)]
+
+def iter_recorded_replies(path: str):
+    """Yields (problem instance, assistant messages) of a recorded run file."""
+    try:
+        with open(path, "r") as f:
+            entries = json.load(f)
+    except Exception as e:
+        logger.warning(f"Could not load {path}: {e}")
+        return
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict) or "problem" not in entry:
+            continue
+        problem_class = get_problem_class(entry["problem"]["config"]["name"])
+        if problem_class is None:
+            continue
+        replies = [message["content"] for message in entry.get("response", []) if isinstance(message, dict) and message.get("role") == "assistant"]
+        yield problem_class.from_json(entry["problem"]), replies
+
+def load_problem_instances(path: str) -> list[Problem]:
+    """Problem instances of a JSON file of Problem.to_json() entries (e.g. data/revised_problems.json)."""
+    with open(path, "r") as f:
+        entries = json.load(f)
+    problems = []
+    for entry in entries:
+        problem_class = get_problem_class(entry["config"]["name"])
+        if problem_class is not None:
+            problems.append(problem_class.from_json(entry))
+    return problems
@@ -0,0 +1,454 @@
+import asyncio
+import email.parser
+import email.policy
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Optional, Union
+from urllib.parse import parse_qs, urlsplit
+from loguru import logger
+
+# Responder of the mock server: (messages, model) -> response text, None makes the request fail
+Responder = Callable[[list[dict], str], Optional[str]]
+
+def echo_responder(messages: list[dict], model: str) -> str:
+    return f"Mock response to: {get_text(messages[-1]['content']) if len(messages) > 0 else ''}"
+
+def get_text(content: Union[str, list]) -> str:
+    """Text of a message content, which is a string or a list of content blocks."""
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content if isinstance(block, dict))
+
+def count_tokens(text: str) -> int:
+    """Rough token count (4 characters per token) of the mock usage."""
+    return max(1, math.ceil(len(text) / 4))
+
+def get_id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:24]}"
+
+def split_tokens(text: str) -> list[str]:
+    """The mock tokens of a text (4 characters each, consistent with count_tokens), streamed one per chunk."""
+    return [text[i:i + 4] for i in range(0, len(text), 4)] or [""]
+
+def parse_distribution(spec: str) -> Callable[[random.Random], float]:
+    """
+    A distribution of durations in seconds: "fixed:0.5", "uniform:0.1,2", "exponential:<mean>" or
+    "lognormal:<mu>,<sigma>" (of the logarithm, e.g. lognormal:0,0.5 has a median of 1s).
+    """
+    name, _, args = spec.partition(":")
+    values = [float(value) for value in args.split(",")] if args else []
+    if name == "fixed":
+        return lambda rng: values[0]
+    if name == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if name == "exponential":
+        return lambda rng: rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    if name == "lognormal":
+        return lambda rng: rng.lognormvariate(values[0], values[1])
+    raise ValueError(f"Unknown distribution {spec}, use fixed:<s>, uniform:<a>,<b>, exponential:<mean> or lognormal:<mu>,<sigma>.")
+
+def sse(data: dict, event: Optional[str] = None) -> bytes:
+    return (f"event: {event}\n" if event is not None else "").encode() + f"data: {json.dumps(data)}\n\n".encode()
+
+class MockRequest:
+    def __init__(self, method: str, target: str, headers: dict[str, str], body: bytes):
+        url = urlsplit(target)
+        self.method = method
+        self.path = url.path
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body or b"null")
+
+    def form(self) -> dict[str, bytes]:
+        """Fields of a multipart/form-data body (e.g. an uploaded file)."""
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {self.headers.get('content-type', '')}\r\n\r\n".encode() + self.body)
+        return {part.get_param("name", header="content-disposition"): part.get_payload(decode=True) for part in message.iter_parts()}
+
+class MockResponse:
+    """A response of the mock server, `body` is bytes or an async iterator of chunks (sent chunked, e.g. for SSE)."""
+
+    def __init__(self, status: int = 200, body: Union[bytes, AsyncIterator[bytes]] = b"", content_type: str = "application/json",
+                 headers: Optional[dict[str, str]] = None):
+        self.status = status
+        self.body = body
+        self.headers = {"content-type": content_type, **(headers or {})}
+
+    @classmethod
+    def json(cls, data: Any, status: int = 200, headers: Optional[dict[str, str]] = None) -> "MockResponse":
+        return cls(status, json.dumps(data).encode(), headers=headers)
+
+    @classmethod
+    def error(cls, status: int, message: str, headers: Optional[dict[str, str]] = None) -> "MockResponse":
+        return cls.json({"type": "error", "error": {"type": "mock_error", "message": message, "code": status}}, status, headers)
+
+    async def write(self, writer: asyncio.StreamWriter):
+        head = [f"HTTP/1.1 {self.status} Mock"] + [f"{key}: {value}" for key, value in self.headers.items()]
+        if isinstance(self.body, bytes):
+            writer.write(("\r\n".join(head + [f"content-length: {len(self.body)}"]) + "\r\n\r\n").encode() + self.body)
+        else:
+            writer.write(("\r\n".join(head + ["transfer-encoding: chunked"]) + "\r\n\r\n").encode())
+            async for chunk in self.body:
+                writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+class MockLLMServer:
+    """
+    A local HTTP server that speaks enough of the OpenAI and Anthropic APIs to run APIQuery offline: chat completions,
+    messages, and the batch endpoints (OpenAI files and /v1/batches, Anthropic message batches). Point an APIQuery at
+    it with base_url=server.url (OpenAI clients) or server.url without /v1 (Anthropic clients).
+
+    Responses come from `responder` (see mock_responders.py for replayed runs and templated solutions). Completions
+    take a time to first token drawn from `latency` (see parse_distribution) plus their output tokens at
+    `tokens_per_second`, and are streamed (SSE) if requested. A fraction `rate_limit_rate` of the requests gets a
+    429 with a Retry-After of `retry_after` seconds, as do requests beyond `max_in_flight` concurrent ones, and a
+    fraction `error_rate` gets a 500.
+
+    Batches finish `batch_delay` seconds after they were created, and a fraction `batch_error_rate` of their
+    requests fails. The server runs on its own event loop in a background thread, so synchronous code (and tests)
+    can use it with start()/stop() or as a context manager, or awaits serve().
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, responder: Optional[Responder] = None,
+                 latency: str = "fixed:0", tokens_per_second: Optional[float] = None, rate_limit_rate: float = 0.0,
+                 error_rate: float = 0.0, retry_after: float = 1.0, max_in_flight: Optional[int] = None,
+                 batch_delay: float = 0.0, batch_error_rate: float = 0.0, seed: int = 0):
+        self.host = host
+        self.port = port
+        self.responder = responder or echo_responder
+        self.latency = parse_distribution(latency)
+        self.tokens_per_second = tokens_per_second
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.max_in_flight = max_in_flight
+        self.batch_delay = batch_delay
+        self.batch_error_rate = batch_error_rate
+        self.rng = random.Random(seed)
+        self.files = {}
+        self.batches = {}
+        self.in_flight = 0
+        self.stats = {"requests": 0, "completions": 0, "streams": 0, "rate_limited": 0, "errors": 0, "max_in_flight": 0,
+                      "batches_created": 0, "batch_requests": 0}
+        self.routes = [
+            ("POST", r"/v1/chat/completions", self.chat_completions),
+            ("POST", r"/v1/messages", self.messages),
+            ("POST", r"/v1/files", self.create_file),
+            ("GET", r"/v1/files/(?P<file_id>[^/]+)/content", self.get_file_content),
+            ("POST", r"/v1/batches", self.create_openai_batch),
+            ("GET", r"/v1/batches/(?P<batch_id>[^/]+)", self.get_openai_batch),
+            ("POST", r"/v1/messages/batches", self.create_anthropic_batch),
+            ("GET", r"/v1/messages/batches/(?P<batch_id>[^/]+)", self.get_anthropic_batch),
+            ("GET", r"/v1/messages/batches/(?P<batch_id>[^/]+)/results", self.get_anthropic_batch_results),
+        ]
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.writers = set()
+
+    @property
+    def url(self) -> str:
+        """Base URL of the OpenAI API of the server, Anthropic clients take it without the /v1."""
+        return f"http://{self.host}:{self.port}/v1"
+
+    # --- server ---
+
+    def start(self) -> "MockLLMServer":
+        started = threading.Event()
+        self.thread = threading.Thread(target=lambda: asyncio.run(self.serve(started)), daemon=True)
+        self.thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.stop_event.set)
+            self.thread.join()
+            self.loop = None
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    async def serve(self, started: Optional[threading.Event] = None):
+        """Runs the server on the current event loop until stop() is called (or the task is cancelled)."""
+        self.loop = asyncio.get_running_loop()
+        self.stop_event = asyncio.Event()
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port, backlog=4096)
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info(f"Mock LLM server listening on {self.url}")
+        if started is not None:
+            started.set()
+        try:
+            await self.stop_event.wait()
+        finally:
+            # clients keep their connections alive, close them so that the server can shut down
+            self.server.close()
+            for writer in list(self.writers):
+                writer.close()
+            await self.server.wait_closed()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, value = line.decode("latin-1").split(":", 1)
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                response = await self.dispatch(MockRequest(method, target, headers, body))
+                await response.write(writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    async def dispatch(self, request: MockRequest) -> MockResponse:
+        self.stats["requests"] += 1
+        for method, pattern, handler in self.routes:
+            match = re.fullmatch(pattern, request.path)
+            if method == request.method and match is not None:
+                try:
+                    return await handler(request, **match.groupdict())
+                except Exception as e:
+                    logger.exception(f"Mock server error on {request.method} {request.path}")
+                    return MockResponse.error(500, f"{type(e).__name__}: {e}")
+        return MockResponse.error(404, f"No route for {request.method} {request.path}")
+
+    # --- completions ---
+
+    def complete_openai(self, body: dict) -> tuple[int, dict]:
+        """Status and body of an OpenAI chat completion."""
+        self.stats["completions"] += 1
+        text = self.responder(body.get("messages", []), body.get("model", ""))
+        if text is None:
+            return 500, {"error": {"message": "Mock responder failed", "type": "server_error", "code": 500}}
+        prompt_tokens = sum(count_tokens(get_text(message.get("content", ""))) for message in body.get("messages", []))
+        completion_tokens = count_tokens(text)
+        return 200, {
+            "id": get_id("chatcmpl"), "object": "chat.completion", "created": int(time.time()), "model": body.get("model", ""),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    def complete_anthropic(self, body: dict) -> tuple[int, dict]:
+        """Status and body of an Anthropic message."""
+        self.stats["completions"] += 1
+        messages = body.get("messages", [])
+        if body.get("system"):
+            messages = [{"role": "system", "content": body["system"]}] + messages
+        text = self.responder(messages, body.get("model", ""))
+        if text is None:
+            return 500, {"type": "error", "error": {"type": "api_error", "message": "Mock responder failed"}}
+        return 200, {
+            "id": get_id("msg"), "type": "message", "role": "assistant", "model": body.get("model", ""),
+            "content": [{"type": "text", "text": text}], "stop_reason": "end_turn", "stop_sequence": None,
+            "usage": {"input_tokens": sum(count_tokens(get_text(message.get("content", ""))) for message in messages),
+                      "output_tokens": count_tokens(text)},
+        }
+
+    def get_injected_error(self) -> Optional[MockResponse]:
+        """A 429 or 500 response for the requests that are to fail, None for the others."""
+        if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+            self.stats["rate_limited"] += 1
+            return MockResponse.error(429, "Too many concurrent requests", {"retry-after": str(self.retry_after)})
+        value = self.rng.random()
+        if value < self.rate_limit_rate:
+            self.stats["rate_limited"] += 1
+            return MockResponse.error(429, "Rate limit exceeded (injected)", {"retry-after": str(self.retry_after)})
+        if value < self.rate_limit_rate + self.error_rate:
+            self.stats["errors"] += 1
+            return MockResponse.error(500, "Internal server error (injected)")
+        return None
+
+    async def generate(self, n_tokens: int, stream: bool) -> AsyncIterator[int]:
+        """
+        Waits like a model generating n_tokens, yields the number of tokens generated so far: once at the end, or
+        after each token if streamed. Counts the request as in flight meanwhile.
+        """
+        self.in_flight += 1
+        self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.in_flight)
+        try:
+            await asyncio.sleep(self.latency(self.rng))
+            time_per_token = 1 / self.tokens_per_second if self.tokens_per_second else 0.0
+            if not stream:
+                await asyncio.sleep(n_tokens * time_per_token)
+                yield n_tokens
+                return
+            for i in range(n_tokens):
+                if i > 0 and time_per_token > 0:
+                    await asyncio.sleep(time_per_token)
+                yield i + 1
+        finally:
+            self.in_flight -= 1
+
+    async def serve_completion(self, body: dict, complete: Callable[[dict], tuple[int, dict]],
+                               stream_events: Callable[[dict, dict], AsyncIterator[bytes]]) -> MockResponse:
+        error = self.get_injected_error()
+        if error is not None:
+            return error
+        status, result = complete(body)
+        if status != 200:
+            return MockResponse.json(result, status)
+        if body.get("stream", False):
+            self.stats["streams"] += 1
+            return MockResponse(200, stream_events(body, result), content_type="text/event-stream")
+        usage = result["usage"]
+        async for _ in self.generate(usage.get("completion_tokens", usage.get("output_tokens", 0)), stream=False):
+            pass
+        return MockResponse.json(result)
+
+    async def openai_events(self, body: dict, result: dict) -> AsyncIterator[bytes]:
+        tokens = split_tokens(result["choices"][0]["message"]["content"])
+        chunk = {"id": result["id"], "object": "chat.completion.chunk", "created": result["created"], "model": result["model"]}
+        async for i in self.generate(len(tokens), stream=True):
+            delta = {"role": "assistant", "content": tokens[i - 1]} if i == 1 else {"content": tokens[i - 1]}
+            yield sse({**chunk, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+        yield sse({**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        if (body.get("stream_options") or {}).get("include_usage", False):
+            yield sse({**chunk, "choices": [], "usage": result["usage"]})
+        yield b"data: [DONE]\n\n"
+
+    async def anthropic_events(self, body: dict, result: dict) -> AsyncIterator[bytes]:
+        tokens = split_tokens(result["content"][0]["text"])
+        message = {**result, "content": [], "stop_reason": None, "usage": {"input_tokens": result["usage"]["input_tokens"], "output_tokens": 1}}
+        yield sse({"type": "message_start", "message": message}, "message_start")
+        yield sse({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}, "content_block_start")
+        async for i in self.generate(len(tokens), stream=True):
+            yield sse({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": tokens[i - 1]}}, "content_block_delta")
+        yield sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+        yield sse({"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                   "usage": {"output_tokens": result["usage"]["output_tokens"]}}, "message_delta")
+        yield sse({"type": "message_stop"}, "message_stop")
+
+    async def chat_completions(self, request: MockRequest) -> MockResponse:
+        return await self.serve_completion(request.json(), self.complete_openai, self.openai_events)
+
+    async def messages(self, request: MockRequest) -> MockResponse:
+        return await self.serve_completion(request.json(), self.complete_anthropic, self.anthropic_events)
+
+    # --- batches ---
+
+    def is_batch_done(self, batch: dict) -> bool:
+        return time.time() >= batch["created_at"] + self.batch_delay
+
+    def run_batch(self, batch: dict, requests: list[dict], complete: Callable[[dict], tuple[int, dict]]) -> list[tuple[str, int, dict]]:
+        """(custom_id, status, body) of each request of a batch, a fraction batch_error_rate fails."""
+        self.stats["batch_requests"] += len(requests)
+        results = []
+        for request in requests:
+            if self.rng.random() < self.batch_error_rate:
+                results.append((request["custom_id"], 500, {"error": {"message": "Injected batch error", "type": "server_error"}}))
+            else:
+                results.append((request["custom_id"], *complete(request["body" if "body" in request else "params"])))
+        return results
+
+    async def create_file(self, request: MockRequest) -> MockResponse:
+        form = request.form()
+        file_id = get_id("file")
+        self.files[file_id] = form["file"]
+        return MockResponse.json({"id": file_id, "object": "file", "bytes": len(form["file"]), "created_at": int(time.time()),
+                                  "filename": "batch.jsonl", "purpose": form.get("purpose", b"batch").decode(), "status": "processed"})
+
+    async def get_file_content(self, request: MockRequest, file_id: str) -> MockResponse:
+        if file_id not in self.files:
+            return MockResponse.error(404, f"No file {file_id}")
+        return MockResponse(200, self.files[file_id], content_type="application/octet-stream")
+
+    async def create_openai_batch(self, request: MockRequest) -> MockResponse:
+        body = request.json()
+        if body.get("input_file_id") not in self.files:
+            return MockResponse.error(400, f"No file {body.get('input_file_id')}")
+        self.stats["batches_created"] += 1
+        batch_id = get_id("batch")
+        self.batches[batch_id] = {
+            "id": batch_id, "object": "batch", "endpoint": body["endpoint"], "input_file_id": body["input_file_id"],
+            "completion_window": body.get("completion_window", "24h"), "status": "in_progress", "created_at": time.time(),
+            "output_file_id": None, "error_file_id": None, "errors": None,
+            "request_counts": {"total": 0, "completed": 0, "failed": 0}, "metadata": body.get("metadata"),
+        }
+        return MockResponse.json(self.get_openai_batch_object(self.batches[batch_id]))
+
+    def get_openai_batch_object(self, batch: dict) -> dict:
+        if batch["status"] == "in_progress" and self.is_batch_done(batch):
+            requests = [json.loads(line) for line in self.files[batch["input_file_id"]].decode().splitlines() if line.strip()]
+            output_lines, error_lines = [], []
+            for custom_id, status, body in self.run_batch(batch, requests, self.complete_openai):
+                line = {"id": get_id("batch_req"), "custom_id": custom_id}
+                if status == 200:
+                    output_lines.append({**line, "response": {"status_code": status, "request_id": get_id("req"), "body": body}, "error": None})
+                else:
+                    error_lines.append({**line, "response": {"status_code": status, "request_id": get_id("req"), "body": body}, "error": None})
+            for key, lines in (("output_file_id", output_lines), ("error_file_id", error_lines)):
+                if len(lines) > 0:
+                    batch[key] = get_id("file")
+                    self.files[batch[key]] = "".join(json.dumps(line) + "\n" for line in lines).encode()
+            batch["status"] = "completed"
+            batch["request_counts"] = {"total": len(requests), "completed": len(output_lines), "failed": len(error_lines)}
+        return {**batch, "created_at": int(batch["created_at"])}
+
+    async def get_openai_batch(self, request: MockRequest, batch_id: str) -> MockResponse:
+        if batch_id not in self.batches:
+            return MockResponse.error(404, f"No batch {batch_id}")
+        return MockResponse.json(self.get_openai_batch_object(self.batches[batch_id]))
+
+    async def create_anthropic_batch(self, request: MockRequest) -> MockResponse:
+        self.stats["batches_created"] += 1
+        batch_id = get_id("msgbatch")
+        self.batches[batch_id] = {"id": batch_id, "requests": request.json()["requests"], "created_at": time.time(), "results": None}
+        return MockResponse.json(self.get_anthropic_batch_object(self.batches[batch_id]))
+
+    def get_anthropic_batch_object(self, batch: dict) -> dict:
+        if batch["results"] is None and self.is_batch_done(batch):
+            batch["results"] = []
+            for custom_id, status, body in self.run_batch(batch, batch["requests"], self.complete_anthropic):
+                if status == 200:
+                    result = {"type": "succeeded", "message": body}
+                else:
+                    result = {"type": "errored", "error": {"type": "error", "error": {"type": "api_error", "message": body["error"]["message"]}}}
+                batch["results"].append({"custom_id": custom_id, "result": result})
+        ended = batch["results"] is not None
+        counts = {"processing": 0 if ended else len(batch["requests"]), "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0}
+        for entry in batch["results"] or []:
+            counts[entry["result"]["type"]] += 1
+        created_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(batch["created_at"]))
+        return {
+            "id": batch["id"], "type": "message_batch", "processing_status": "ended" if ended else "in_progress",
+            "request_counts": counts, "created_at": created_at, "expires_at": created_at, "ended_at": created_at if ended else None,
+            "archived_at": None, "cancel_initiated_at": None,
+            "results_url": f"http://{self.host}:{self.port}/v1/messages/batches/{batch['id']}/results" if ended else None,
+        }
+
+    async def get_anthropic_batch(self, request: MockRequest, batch_id: str) -> MockResponse:
+        if batch_id not in self.batches:
+            return MockResponse.error(404, f"No batch {batch_id}")
+        return MockResponse.json(self.get_anthropic_batch_object(self.batches[batch_id]))
+
+    async def get_anthropic_batch_results(self, request: MockRequest, batch_id: str) -> MockResponse:
+        if batch_id not in self.batches or self.batches[batch_id]["results"] is None:
+            return MockResponse.error(404, f"No results of batch {batch_id}")
+        lines = "".join(json.dumps(entry) + "\n" for entry in self.batches[batch_id]["results"])
+        return MockResponse(200, lines.encode(), content_type="application/binary")
@@ -0,0 +1,246 @@
+import asyncio
+import random
+import re
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+import anthropic
+import httpx
+import openai
+
+# Error kinds of classify_error
+RATE_LIMITED = "rate_limited"
+RETRYABLE = "retryable"
+FATAL = "fatal"
+
+# Status codes of transient errors: timeouts, conflicts and server errors (529 is Anthropic's "overloaded")
+RETRYABLE_STATUS_CODES = {408, 409, 500, 502, 503, 504}
+RATE_LIMITED_STATUS_CODES = {429, 529}
+DURATION_RE = re.compile(r"(?:(\d+(?:\.\d+)?)h)?(?:(\d+(?:\.\d+)?)m(?!s))?(?:(\d+(?:\.\d+)?)s)?(?:(\d+(?:\.\d+)?)ms)?")
+
+def parse_duration(value: str) -> Optional[float]:
+    """
+    Seconds until a rate limit resets, from the header formats providers use: seconds ("30"), Go durations
+    (OpenAI, "6m0s", "150ms") or timestamps (Anthropic, RFC 3339, and HTTP dates of Retry-After).
+    """
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    match = DURATION_RE.fullmatch(value)
+    if match is not None and any(match.groups()):
+        hours, minutes, seconds, milliseconds = [float(group) if group else 0.0 for group in match.groups()]
+        return hours * 3600 + minutes * 60 + seconds + milliseconds / 1000
+    for parse in (lambda v: datetime.fromisoformat(v.replace("Z", "+00:00")), parsedate_to_datetime):
+        try:
+            reset_time = parse(value)
+        except (ValueError, TypeError):
+            continue
+        if reset_time.tzinfo is None:
+            reset_time = reset_time.replace(tzinfo=timezone.utc)
+        return max(0.0, (reset_time - datetime.now(timezone.utc)).total_seconds())
+    return None
+
+def get_retry_after(headers) -> Optional[float]:
+    """Seconds to wait before the next request according to the response headers, None if they do not say."""
+    if headers is None:
+        return None
+    if headers.get("retry-after-ms") is not None:
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    if headers.get("retry-after") is not None:
+        return parse_duration(headers["retry-after"])
+    return None
+
+def get_exhausted_reset(headers) -> Optional[float]:
+    """
+    Seconds until the exhausted request or token limit resets, from the rate limit headers of OpenAI
+    (x-ratelimit-remaining-requests, x-ratelimit-reset-requests, ...) or Anthropic (anthropic-ratelimit-*).
+    None if no limit is exhausted.
+    """
+    if headers is None:
+        return None
+    resets = []
+    for prefix in ("x-ratelimit", "anthropic-ratelimit"):
+        for kind in ("requests", "tokens", "input-tokens", "output-tokens"):
+            remaining = headers.get(f"{prefix}-remaining-{kind}") if prefix == "x-ratelimit" else headers.get(f"{prefix}-{kind}-remaining")
+            reset = headers.get(f"{prefix}-reset-{kind}") if prefix == "x-ratelimit" else headers.get(f"{prefix}-{kind}-reset")
+            if remaining is not None and reset is not None and remaining.strip() == "0":
+                seconds = parse_duration(reset)
+                if seconds is not None:
+                    resets.append(seconds)
+    return max(resets) if len(resets) > 0 else None
+
+def classify_error(e: Exception) -> tuple[str, Optional[float]]:
+    """
+    Classifies an exception of a provider request.
+
+    Returns:
+        tuple[str, Optional[float]]: The kind (RATE_LIMITED, RETRYABLE or FATAL) and the seconds to wait
+                                     before retrying if the response said so.
+    """
+    response = getattr(e, "response", None)
+    headers = getattr(response, "headers", None) if isinstance(getattr(response, "headers", None), (dict, httpx.Headers)) else None
+    retry_after = get_retry_after(headers)
+    status = getattr(e, "status_code", None)
+    if status is None and isinstance(getattr(e, "code", None), int): # google.genai.errors.APIError
+        status = e.code
+    if status is not None:
+        if status in RATE_LIMITED_STATUS_CODES:
+            return RATE_LIMITED, retry_after if retry_after is not None else get_exhausted_reset(headers)
+        if status in RETRYABLE_STATUS_CODES or status >= 500:
+            return RETRYABLE, retry_after
+        return FATAL, None
+    if isinstance(e, (openai.APIConnectionError, anthropic.APIConnectionError, httpx.TransportError, asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return RETRYABLE, None
+    # errors without a status (e.g. an unexpected response format) are retried like before
+    if "rate limit" in str(e).lower() or "429" in str(e):
+        return RATE_LIMITED, None
+    return RETRYABLE, None
+
+def get_backoff(attempt: int, base: float = 1.0, maximum: float = 60.0) -> float:
+    """Exponential backoff with full jitter: uniform in [0, min(maximum, base * 2**attempt)]."""
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
+
+class TokenBucket:
+    """A bucket of `per_minute` units that refills continuously. The level can go negative when usage is reported late."""
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.capacity = per_minute
+        self.level = per_minute
+        self.ts_last = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.ts_last) * self.per_minute / 60)
+        self.ts_last = now
+
+    def get_wait(self, amount: float) -> float:
+        """Seconds until `amount` units are available (amounts above the capacity wait for a full bucket)."""
+        self.refill()
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) * 60 / self.per_minute)
+
+    def consume(self, amount: float):
+        self.refill()
+        self.level -= amount
+
+class RateLimiter:
+    """
+    Adaptive limiter of the requests to one model of a provider (api and base URL), shared by all queries of a process:
+    token buckets on requests and tokens per minute, a pause of all requests when a response asks for it
+    (Retry-After, exhausted rate limit headers), and AIMD control of the number of requests in flight:
+    +1 per `increase_every` successes, halved on every rate limit error.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, min_concurrency: int = 1, increase_every: int = 1):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min(min_concurrency, max_concurrency)
+        self.concurrency = float(max_concurrency)
+        self.increase_every = increase_every
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.n_successes_since_decrease = 0
+        self.condition = None
+        self.counters = {"requests": 0, "successes": 0, RATE_LIMITED: 0, RETRYABLE: 0, FATAL: 0,
+                         "throttle_wait": 0.0, "concurrency_decreases": 0}
+
+    def get_condition(self) -> asyncio.Condition:
+        # created lazily, the limiter outlives the event loops of run_queries
+        loop = asyncio.get_running_loop()
+        if self.condition is None or self.condition_loop is not loop:
+            self.condition = asyncio.Condition()
+            self.condition_loop = loop
+            self.in_flight = 0
+        return self.condition
+
+    def get_wait(self, estimated_tokens: float) -> float:
+        wait = max(0.0, self.paused_until - time.monotonic())
+        if self.request_bucket is not None:
+            wait = max(wait, self.request_bucket.get_wait(1))
+        if self.token_bucket is not None:
+            wait = max(wait, self.token_bucket.get_wait(estimated_tokens))
+        return wait
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: float = 0):
+        """Waits until a request may be sent (concurrency, pause and both buckets), the request runs inside."""
+        condition = self.get_condition()
+        ts_start = time.monotonic()
+        async with condition:
+            while True:
+                await condition.wait_for(lambda: self.in_flight < int(self.concurrency))
+                wait = self.get_wait(estimated_tokens)
+                if wait <= 0:
+                    break
+                # the buckets refill without notification, so wait outside of the condition
+                condition.release()
+                try:
+                    await asyncio.sleep(wait)
+                finally:
+                    await condition.acquire()
+            self.in_flight += 1
+            if self.request_bucket is not None:
+                self.request_bucket.consume(1)
+            if self.token_bucket is not None:
+                self.token_bucket.consume(estimated_tokens)
+        self.counters["requests"] += 1
+        self.counters["throttle_wait"] += time.monotonic() - ts_start
+        try:
+            yield
+        finally:
+            async with condition:
+                self.in_flight -= 1
+                condition.notify_all()
+
+    def on_success(self, estimated_tokens: float = 0, used_tokens: float = 0, headers=None):
+        """Records a successful request: its actual token usage, the rate limit headers and an additive increase."""
+        self.counters["successes"] += 1
+        if self.token_bucket is not None:
+            self.token_bucket.consume(used_tokens - estimated_tokens)
+        self.pause(get_exhausted_reset(headers))
+        self.n_successes_since_decrease += 1
+        if self.n_successes_since_decrease >= self.increase_every:
+            self.n_successes_since_decrease = 0
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+
+    def on_error(self, kind: str, retry_after: Optional[float] = None):
+        """Records a failed request, rate limits halve the concurrency and pause all requests for retry_after."""
+        self.counters[kind] += 1
+        if kind == RATE_LIMITED:
+            self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+            self.n_successes_since_decrease = 0
+            self.counters["concurrency_decreases"] += 1
+        self.pause(retry_after)
+
+    def pause(self, seconds: Optional[float]):
+        if seconds is not None and seconds > 0:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def get_stats(self) -> dict:
+        return {**self.counters, "concurrency": int(self.concurrency), "max_concurrency": self.max_concurrency}
+
+_rate_limiters = {}
+
+def get_rate_limiter(api: str, base_url: Optional[str], model: str, max_concurrency: int, requests_per_minute: Optional[float] = None,
+                     tokens_per_minute: Optional[float] = None) -> RateLimiter:
+    """
+    The limiter of a model of a provider with the given limits, created on first use. Providers limit each model
+    separately, so models (and different limits) do not share the AIMD concurrency or the pauses of a limiter.
+    """
+    key = (api, base_url, model, max_concurrency, requests_per_minute, tokens_per_minute)
+    if key not in _rate_limiters:
+        _rate_limiters[key] = RateLimiter(max_concurrency, requests_per_minute, tokens_per_minute)
+    return _rate_limiters[key]
+
+def reset_rate_limiters():
+    _rate_limiters.clear()
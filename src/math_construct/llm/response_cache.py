@@ -0,0 +1,72 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Optional
+from loguru import logger
+
+CACHE_MODES = ("rw", "ro", "wo")
+
+def get_cache_key(request: dict[str, Any]) -> str:
+    """Hash of everything that determines a response: provider, model, messages, sampling parameters and sample index."""
+    return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode()).hexdigest()
+
+class ResponseCache:
+    """
+    On-disk cache of LLM responses (output and token usage), one gzipped JSON file per request, sharded into
+    directories by the first characters of the key. Entries are written atomically, so concurrent runs can
+    share a cache directory.
+
+    Modes: "rw" reads and writes, "ro" only replays cached responses (misses are sent to the provider but not
+    stored), "wo" only stores responses (e.g. to refresh a cache).
+    """
+
+    def __init__(self, cache_dir: str, mode: str = "rw"):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Cache mode {mode} not supported, use one of {CACHE_MODES}.")
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "saved_cost": 0.0}
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key[2:4], f"{key}.json.gz")
+
+    def get(self, key: str) -> Optional[dict]:
+        """The cached response of a key, None on a miss (or in write-only mode)."""
+        if self.mode == "wo":
+            return None
+        try:
+            with gzip.open(self.get_path(key), "rt") as f:
+                value = json.load(f)
+        except FileNotFoundError:
+            self.stats["misses"] += 1
+            return None
+        except (OSError, EOFError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring corrupt cache entry {self.get_path(key)}: {e}")
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return value
+
+    def put(self, key: str, value: dict):
+        if self.mode == "ro":
+            return
+        path = self.get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt") as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self.stats["writes"] += 1
+
+    def add_saved_cost(self, cost: float):
+        self.stats["saved_cost"] += cost
+
+    def get_stats(self) -> dict:
+        n_lookups = self.stats["hits"] + self.stats["misses"]
+        return {**self.stats, "hit_rate": self.stats["hits"] / n_lookups if n_lookups > 0 else None}
@@ -10,6 +10,7 @@ import numpy as np
 from tqdm import tqdm
 import ast
 import time, threading
+from math_construct.problems.transcript_index import TranscriptIndex
 
 class CodeSolver(CoTSolver):
     def __init__(self, 
@@ -336,12 +337,13 @@ class CodeSolver(CoTSolver):
                 "output_tokens": 0,
             } for _ in range(len(problems))
         ]
+        self.transcript_indexes = [TranscriptIndex() for _ in range(len(problems))]
         queries = self.solve_initial_round(problems)
         iterations = [
             {"code": 0, "feedback": 0} for _ in range(len(problems))
         ]
         parsed_responses = [None for _ in range(len(problems))]
-        checker = [problem.parse_and_check(q) for problem, q in zip(problems, queries)]
+        checker = self.check_transcripts(problems, queries)
         logger.info(f"Solved instances after initial round: {np.mean([c[1] for c in checker]):.5f}")
         for it in range(self.max_feedback_rounds + self.max_code_iterations):
             logger.info(f"Starting iteration {it}")    
@@ -353,7 +355,7 @@ class CodeSolver(CoTSolver):
                 for i, (cl, nl) in enumerate(zip(current_lengths, new_lengths)):
                     if nl > cl:
                         iterations[i]["code"] += 1
-                checker = [problem.parse_and_check(q) for problem, q in zip(problems, queries)]
+                checker = self.check_transcripts(problems, queries)
                 logger.info(f"Solved instances after code round: {np.mean([c[1] for c in checker]):.5f}")
             # do a feedback round
             queries, parsed_responses = self.solve_parse_feedback_round(problems, queries, 
@@ -363,7 +365,7 @@ class CodeSolver(CoTSolver):
                 if nl > cl:
                     iterations[i]["feedback"] += 1
             
-            checker = [problem.parse_and_check(q) for problem, q in zip(problems, queries)]
+            checker = self.check_transcripts(problems, queries)
             logger.info(f"Solved instances after feedback round: {np.mean([c[1] for c in checker]):.5f}")
         # log cost
         logger.info(f"Total cost for generating solutions: {self.cost}")
@@ -2,6 +2,8 @@ from .solver import Solver
 import logging
 from loguru import logger
 import numpy as np
+from math_construct.problems.batch_check import check_many
+from math_construct.problems.transcript_index import TranscriptIndex
 
 class CoTSolver(Solver):
     def __init__(self, 
@@ -41,6 +43,9 @@ class CoTSolver(Solver):
         self.error_string = error_string
         self.give_solution = give_solution
         self.stop_at_timeout = stop_at_timeout
+        # TranscriptIndex of each conversation of the current solve() call, so that the answers of earlier rounds
+        # are not scanned and parsed again in every round
+        self.transcript_indexes = None
 
     def build_query(self, problem):
         """
@@ -102,8 +107,18 @@ class CoTSolver(Solver):
     def is_valid_trace(self, query):
         return not any(m["role"] == "api_error" for m in query)
     
+    def get_transcript_indexes(self, problems):
+        """Returns the TranscriptIndex of each conversation of the current solve() call, or None if there are none for these problems."""
+        if self.transcript_indexes is None or len(self.transcript_indexes) != len(problems):
+            return None
+        return self.transcript_indexes
+
+    def check_transcripts(self, problems, queries):
+        """Parses and checks the conversations with check_many, keeping their transcript indexes."""
+        return check_many(zip(problems, queries), indexes=self.get_transcript_indexes(problems))
+
     def build_parse_feedback_query(self, problem, current_messages, 
-                                   current_parsed_response=None, iteration=None):
+                                   current_parsed_response=None, iteration=None, checker_result=None, index=None):
         """
         Builds and parses a feedback query for a given problem based on the current messages and iteration.
         Args:
@@ -111,6 +126,8 @@ class CoTSolver(Solver):
             current_messages (list): The list of current messages exchanged.
             current_parsed_response (optional): The current parsed response, if any. Defaults to None.
             iteration (optional): The current iteration information, if any. Defaults to None.
+            checker_result (optional): The result of problem.parse_and_check(current_messages) if already computed. Defaults to None.
+            index (TranscriptIndex, optional): The index of the conversation, extended with the new messages. Defaults to None.
         Returns:
             tuple: A tuple containing:
                 - new_messages (list or None): The updated list of messages with feedback appended, or None if no feedback is needed.
@@ -121,9 +138,11 @@ class CoTSolver(Solver):
             return None, current_parsed_response
         try:
             if self.check_feedback:
-                parsed_response, is_correct, error = problem.parse_and_check(current_messages)
+                if checker_result is None:
+                    checker_result = problem.parse_and_check(current_messages, index)
+                parsed_response, is_correct, error = checker_result
             else:
-                parsed_response = problem.parse(current_messages)
+                parsed_response = problem.parse(current_messages, index)
                 is_correct = True
                 error = None
         except Exception as e:
@@ -159,14 +178,29 @@ class CoTSolver(Solver):
         """
         if iterations is None:
             iterations = [None for _ in range(len(problems))]
+        checker_results = [None for _ in range(len(problems))]
+        all_indexes = self.get_transcript_indexes(problems)
+        if self.check_feedback:
+            # check all queries that can still get feedback in one batch
+            to_check = [i for i, (query, iteration) in enumerate(zip(queries, iterations)) 
+                        if (iteration is None or iteration["feedback"] < self.max_feedback_rounds) and self.is_valid_trace(query)]
+            indexes = [all_indexes[i] for i in to_check] if all_indexes is not None else None
+            for i, result in zip(to_check, check_many(((problems[i], queries[i]) for i in to_check), indexes=indexes)):
+                checker_results[i] = result
+            if indexes is not None:
+                for i, index in zip(to_check, indexes):
+                    all_indexes[i] = index
         queries_new = []
         parsed_responses_new = []
-        for problem, current_messages, parsed_response, iteration in zip(problems, queries, 
-                                                                         parsed_responses, iterations):
+        for i, (problem, current_messages, parsed_response, iteration, checker_result) in enumerate(zip(problems, queries, 
+                                                                                                        parsed_responses, iterations,
+                                                                                                        checker_results)):
             query, parsed_response = self.build_parse_feedback_query(problem, 
                                                                      current_messages,
                                                                      parsed_response, 
-                                                                     iteration)
+                                                                     iteration,
+                                                                     checker_result,
+                                                                     all_indexes[i] if all_indexes is not None else None)
             queries_new.append(query)
             parsed_responses_new.append(parsed_response)
         return queries_new, parsed_responses_new
@@ -246,7 +280,7 @@ class CoTSolver(Solver):
                 queries, parsed_responses = self.solve_parse_feedback_round(problems, 
                                                                             queries, 
                                                                             parsed_responses)
-                checker = [problem.parse_and_check(q) for problem, q in zip(problems, queries)]
+                checker = self.check_transcripts(problems, queries)
                 logger.info(f"Solved instances after feedback round: {np.mean([c[1] for c in checker]):.5f}")
         return queries
 
@@ -267,8 +301,9 @@ class CoTSolver(Solver):
             "input_tokens": 0,
             "output_tokens": 0,
         } for _ in range(len(problems))]
+        self.transcript_indexes = [TranscriptIndex() for _ in range(len(problems))]
         queries = self.solve_initial_round(problems)
-        checker = [problem.parse_and_check(q) for problem, q in zip(problems, queries)]
+        checker = self.check_transcripts(problems, queries)
         logger.info(f"Solved instances after feedback round: {np.mean([c[1] for c in checker]):.5f}")
         queries = self.solve_parse_feedback_rounds(problems, queries)
         # log cost
@@ -0,0 +1,93 @@
+import math
+import time
+from typing import Optional
+
+class StreamState:
+    """
+    A response being streamed: its text so far, one chunk per streamed delta (about one token each) and the
+    timings. Stop predicates keep their per-stream state in `predicate_data`, so one predicate can serve
+    concurrent streams.
+    """
+
+    def __init__(self):
+        self.ts_start = time.perf_counter()
+        self.ts_first_token = None
+        self.ts_end = None
+        self.parts = []
+        self.n_chunks = 0
+        self.n_bytes = 0
+        self.last_delta = ""
+        self.predicate_data = {}
+
+    def add(self, delta: str):
+        if not delta:
+            return
+        if self.ts_first_token is None:
+            self.ts_first_token = time.perf_counter()
+        self.parts.append(delta)
+        self.n_chunks += 1
+        self.n_bytes += len(delta.encode())
+        self.last_delta = delta
+
+    def finish(self):
+        self.ts_end = time.perf_counter()
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def get_ttft(self) -> Optional[float]:
+        """Seconds from sending the request to the first streamed token."""
+        return self.ts_first_token - self.ts_start if self.ts_first_token is not None else None
+
+    def get_tokens_per_second(self, n_tokens: int) -> Optional[float]:
+        """Decoding speed after the first token."""
+        if self.ts_first_token is None or self.ts_end is None or self.ts_end <= self.ts_first_token:
+            return None
+        return n_tokens / (self.ts_end - self.ts_first_token)
+
+    def estimate_output_tokens(self) -> int:
+        """Tokens generated so far, for streams stopped before the provider reported their usage."""
+        return max(self.n_chunks, math.ceil(self.n_bytes / 4))
+
+class StopPredicate:
+    """Decides after every streamed chunk whether to stop the generation."""
+
+    def __call__(self, state: StreamState) -> bool:
+        raise NotImplementedError
+
+    def get_data(self, state: StreamState, default: dict) -> dict:
+        return state.predicate_data.setdefault(id(self), default)
+
+class BoxedAnswerStop(StopPredicate):
+    """Stops once a balanced \\boxed{...} has been followed by `n_tokens` further chunks without another \\boxed{."""
+
+    BOXED = "\\boxed{"
+
+    def __init__(self, n_tokens: int = 50):
+        self.n_tokens = n_tokens
+
+    def __call__(self, state: StreamState) -> bool:
+        data = self.get_data(state, {"recent": "", "depth": 0, "closed_at": None})
+        for ch in state.last_delta:
+            if data["depth"] > 0:
+                if ch == "{":
+                    data["depth"] += 1
+                elif ch == "}":
+                    data["depth"] -= 1
+                    if data["depth"] == 0:
+                        data["closed_at"] = state.n_chunks
+            else:
+                data["recent"] = (data["recent"] + ch)[-len(self.BOXED):]
+                if data["recent"] == self.BOXED:
+                    data["depth"], data["closed_at"], data["recent"] = 1, None, ""
+        return data["closed_at"] is not None and state.n_chunks - data["closed_at"] >= self.n_tokens
+
+class ByteBudgetStop(StopPredicate):
+    """Stops once the output exceeds `max_bytes` bytes (UTF-8)."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+
+    def __call__(self, state: StreamState) -> bool:
+        return state.n_bytes > self.max_bytes
@@ -0,0 +1,104 @@
+import json
+import os
+from typing import Iterable, Optional
+from loguru import logger
+from math_construct.utils import get_percentile
+
+# Name of the telemetry file in a run directory
+TELEMETRY_FILE = "telemetry.jsonl"
+
+class RequestTelemetry:
+    """
+    Structured events of API request attempts, appended to a JSONL file as they happen (so a crashed run keeps
+    them). Each event has the provider, model, attempt number, start time, latency, queue wait (until a slot of
+    the rate limiter was free), backoff after the attempt, error kind and class, tokens and cost. Responses
+    replayed from the response cache are recorded with cached=True, without latency and at cost 0.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.events = []
+        self.file = None
+
+    def record(self, **event):
+        self.events.append(event)
+        if self.path is None:
+            return
+        if self.file is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.file = open(self.path, "a")
+        self.file.write(json.dumps(event) + "\n")
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+def load_events(path: str) -> list[dict]:
+    events = []
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                events.append(json.loads(line))
+    return events
+
+def summarize_events(events: Iterable[dict], key: str = "provider") -> dict[str, dict]:
+    """
+    Summary of request events per value of `key` (e.g. "provider" or "model"): number of attempts, retry rate,
+    errors per kind, p50/p95/p99 latency and queue wait of successful attempts, backoff time, tokens,
+    throughput (output tokens per second between the first start and the last end) and cost. Responses replayed
+    from the response cache only count in n_cached and cache_hit_rate, the other statistics are of the requests
+    that reached the provider.
+    """
+    groups = {}
+    for event in events:
+        groups.setdefault(event.get(key), []).append(event)
+    summaries = {}
+    for name, events_of_name in sorted(groups.items(), key=lambda item: str(item[0])):
+        group = [event for event in events_of_name if not event.get("cached", False)]
+        n_cached = len(events_of_name) - len(group)
+        successes = [event for event in group if event.get("error") is None]
+        latencies = [event["latency"] for event in successes if event.get("latency") is not None]
+        queue_waits = [event["queue_wait"] for event in group if event.get("queue_wait") is not None]
+        ts_start = min((event["ts_start"] for event in group), default=0)
+        ts_end = max((event["ts_start"] + (event.get("latency") or 0) for event in group), default=0)
+        output_tokens = sum(event.get("output_tokens", 0) for event in successes)
+        errors = {}
+        for event in group:
+            if event.get("error") is not None:
+                errors[event["error"]] = errors.get(event["error"], 0) + 1
+        summaries[str(name)] = {
+            "n_attempts": len(group),
+            "n_successes": len(successes),
+            "n_cached": n_cached,
+            "cache_hit_rate": n_cached / (n_cached + len(successes)) if n_cached + len(successes) > 0 else None,
+            "retry_rate": sum(event.get("attempt", 0) > 0 for event in group) / len(group) if len(group) > 0 else None,
+            "errors": errors,
+            "latency_p50": get_percentile(latencies, 50),
+            "latency_p95": get_percentile(latencies, 95),
+            "latency_p99": get_percentile(latencies, 99),
+            "queue_wait_p50": get_percentile(queue_waits, 50),
+            "queue_wait_p95": get_percentile(queue_waits, 95),
+            "backoff_total": sum(event.get("backoff", 0) for event in group),
+            "input_tokens": sum(event.get("input_tokens", 0) for event in successes),
+            "output_tokens": output_tokens,
+            "tokens_per_second": output_tokens / (ts_end - ts_start) if ts_end > ts_start else None,
+            "cost": sum(event.get("cost", 0) for event in successes),
+        }
+    return summaries
+
+def summarize_telemetry(path: str) -> dict:
+    """Summaries per provider and per model of a telemetry file."""
+    events = load_events(path)
+    return {"n_events": len(events), "providers": summarize_events(events, "provider"), "models": summarize_events(events, "model")}
+
+def log_summary(summary: dict):
+    for key in ("providers", "models"):
+        for name, stats in summary[key].items():
+            logger.info(f"{name}: {stats['n_successes']}/{stats['n_attempts']} attempts succeeded (retry rate {stats['retry_rate'] or 0:.1%}, "
+                        f"{stats['n_cached']} replayed from the cache, "
+                        f"errors {stats['errors']}), latency p50/p95/p99 {stats['latency_p50'] or 0:.2f}/{stats['latency_p95'] or 0:.2f}/"
+                        f"{stats['latency_p99'] or 0:.2f}s, queue wait p95 {stats['queue_wait_p95'] or 0:.2f}s, "
+                        f"{stats['tokens_per_second'] or 0:.1f} tokens/s, ${stats['cost']:.4f}")
@@ -1,11 +1,24 @@
+import os
 import re
+import time
 from fractions import Fraction
-from math_construct.utils import get_depth, latex2sympy_fixed
-from sympy import N, Integer
+from math_construct.utils import get_depth
+from math_construct.latex_eval import SIGNED_INT_RE, get_branch_timings, get_fast_value, get_latex_expression
 
-def parse_answer(s: str, primitive_type: type = None):
+# Parse answers with the original (quadratic) ParseList, to diff its output with FastParseList
+USE_LEGACY_PARSER = os.environ.get("MATH_CONSTRUCT_LEGACY_PARSER", "0") == "1"
+
+def parse_answer(s: str, primitive_type: type = None, legacy_parser: bool = None):
+    """
+    Parses the content of a \\boxed{} answer into nested lists of primitives.
+    legacy_parser selects the original ParseList instead of FastParseList (which gives the same result in one pass),
+    it defaults to the MATH_CONSTRUCT_LEGACY_PARSER environment variable and is meant for diffing the two.
+    """
+    if legacy_parser is None:
+        legacy_parser = USE_LEGACY_PARSER
     s = remove_outer_brackets(normalize_string(s))
-    output = ParseList.parse("(" + s + ")", primitive_type=primitive_type)
+    list_parser = ParseList if legacy_parser else FastParseList
+    output = list_parser.parse("(" + s + ")", primitive_type=primitive_type)
     if output is None:
         return None
     if len(output) == 1:
@@ -99,6 +112,8 @@ def remove_aligns(s: str) -> str:
 
 
 
+STRIP_BRACKET_RE = re.compile(r"\\{2,}\n?\(")
+
 def strip(s: str):
     s = s.strip()
     # be careful with this, it can also remove the "\" in "\begin" if just done with strip
@@ -109,9 +124,25 @@ def strip(s: str):
     while s.startswith("\\ "):
         s = s[2:]
     # if s starts with any thing of the form \\\ and then a bracket, or \\\n and then a bracket, remove it
-    while re.match(r"\\{2,}\n?\(", s):
+    while STRIP_BRACKET_RE.match(s):
         s = s[3:]
     return s
+
+def strip_bounds(s: str, start: int, end: int) -> tuple[int, int]:
+    """Same as strip(s[start:end]), but returns the bounds of the result in s instead of a copy."""
+    while start < end and s[start].isspace():
+        start += 1
+    while end > start and s[end - 1].isspace():
+        end -= 1
+    while s.startswith(r"\n", start, end):
+        start += 2
+    while end - start >= 2 and s.endswith(r"\n", start, end):
+        end -= 2
+    while s.startswith("\\ ", start, end):
+        start += 2
+    while STRIP_BRACKET_RE.match(s, start, end):
+        start = min(start + 3, end)
+    return start, end
 class ParseObject:
     @classmethod
     def is_at_start(cls, string):
@@ -139,6 +170,11 @@ class ParsePrimitive(ParseObject):
             if primitive_type == Fraction:
                 return Fraction(int(string), 1)
             return int(string)
+        # Signed integer, float() below gives the same result as long as it is exact
+        if SIGNED_INT_RE.fullmatch(string):
+            value = int(string)
+            if abs(value) <= 2 ** 53:
+                return Fraction(value, 1) if primitive_type == Fraction else value
         # Float
         try:
             float_string = float(string)
@@ -155,17 +191,16 @@ class ParsePrimitive(ParseObject):
             if "=" in string_no_eq:
                 # rfind is used to remove the last occurence of "="
                 string_no_eq = string_no_eq[string_no_eq.rfind("=")+1:]
-            float_val = float(N(latex2sympy_fixed(string_no_eq), 101))
-            if float_val.is_integer() or float("inf") == float_val or float("-inf") == float_val:
-                return int(N(latex2sympy_fixed(string_no_eq), 50001)) # important for large ints
-            elif primitive_type == Fraction:
-                # get numerator and denominator
-                sympy_expression = latex2sympy_fixed(string_no_eq)
-                numerator, denominator = sympy_expression.as_numer_denom()
-                if not isinstance(numerator, Integer) or not isinstance(denominator, Integer):
-                    raise ValueError(f"Expected a primitive fraction, but got '{string}'")
-                return Fraction(int(numerator), int(denominator))
-            return float_val
+            # simple fractions and integer arithmetic are evaluated exactly in Python, the rest with sympy,
+            # where each distinct token is parsed and evaluated only once per process
+            ts_start = time.perf_counter()
+            value = get_fast_value(string_no_eq, primitive_type)
+            get_branch_timings().add("fast" if value is not None else "fast_miss", time.perf_counter() - ts_start)
+            if value is None:
+                value = get_latex_expression(string_no_eq).get_value(primitive_type)
+            if value is None:
+                raise ValueError(f"Expected a primitive fraction, but got '{string}'")
+            return value
         except Exception as e:
             if "Expected a primitive fraction" in str(e):
                 raise e
@@ -189,8 +224,8 @@ class ParseFraction(ParseObject):
         if numerator is None or denominator is None:
             return False
         try:
-            float(N(latex2sympy_fixed(numerator), 5000))
-            float(N(latex2sympy_fixed(denominator), 5000))
+            get_latex_expression(numerator).to_float(5000)
+            get_latex_expression(denominator).to_float(5000)
         except:
             return False
         return True
@@ -345,7 +380,9 @@ class ParseMatrix(ParseObject):
         return re.match(r'\\begin{.*matrix}', string) or re.match(r"^\\begin{array}", string)
     
     @classmethod
-    def parse(cls, string, primitive_type):
+    def parse(cls, string, primitive_type, list_parser=None):
+        if list_parser is None:
+            list_parser = ParseList
         if "array" in string:
             match = re.search(r'\\begin{array}({[^}]*})*(.*?)\\end{array}', string, re.DOTALL)
             content = match.group(2).strip() if match else None
@@ -363,8 +400,187 @@ class ParseMatrix(ParseObject):
             row_parse = row.strip().strip(",")
             row_parse = "(" + row_parse + ")"
             parse_rows.append(row_parse)
-        rows = [ParseList.parse(row, delimiter=["&", r"\n", ","], primitive_type=primitive_type) for row in parse_rows]
+        if list_parser is ParseList:
+            rows = [list_parser.parse(row, delimiter=["&", r"\n", ","], primitive_type=primitive_type) for row in parse_rows]
+        else:
+            rows = [cls.parse_int_row(row[1:-1], primitive_type) for row in parse_rows]
+            rows = [row if row is not None else list_parser.parse(parse_row, delimiter=["&", r"\n", ","], primitive_type=primitive_type)
+                    for row, parse_row in zip(rows, parse_rows)]
         if all([len(row) == 1 for row in rows]):
             return [row[0] for row in rows]
         return rows
 
+    @classmethod
+    def parse_int_row(cls, row, primitive_type):
+        """
+        Parses a row of integer cells separated by & in one go, into the list of cells the list parser would return.
+        Returns None if any cell is not a plain integer, these rows go through the list parser.
+        """
+        if INT_ROW_RE.fullmatch(row) is None:
+            return None
+        cells = row.split("&")
+        if primitive_type == str:
+            return [cell.strip() for cell in cells]
+        values = [int(cell) for cell in cells]
+        # signed integers beyond 2**53 are parsed through float() by ParsePrimitive
+        if ("-" in row or "+" in row) and any(abs(value) > 2 ** 53 for value in values):
+            return None
+        if primitive_type == Fraction:
+            return [Fraction(value, 1) for value in values]
+        return values
+
+INT_ROW_RE = re.compile(r"[ \t]*[+-]?[0-9]+[ \t]*(?:&[ \t]*[+-]?[0-9]+[ \t]*)+", re.ASCII)
+MATRIX_START_RE = re.compile(r"\\begin{.*matrix}")
+ARRAY_START_RE = re.compile(r"\\begin{array}")
+BRACE_RE = re.compile(r"[{}]")
+COUNTED_SUBSTRINGS = ["(", ")", "{", "}", "\\begin{", "\\end{"]
+
+class _CandidateCounter:
+    """
+    Counts brackets, environments and top-level brace groups (as ParseFraction.is_finished does) in s[start:pos]
+    for a growing pos, so that checking all candidates of one element is linear in their length.
+    Candidates only differ from these ranges by stripped characters, which contain no braces nor environments.
+    """
+
+    def __init__(self, s: str, start: int):
+        self.s = s
+        self.start = start
+        self.pos = start
+        self.counts = dict.fromkeys(COUNTED_SUBSTRINGS, 0)
+        self.brackets = 0
+        self.groups = 0
+        self.has_started = False
+
+    def advance(self, pos: int):
+        for sub in COUNTED_SUBSTRINGS:
+            self.counts[sub] += self.s.count(sub, self.pos, pos)
+        for match in BRACE_RE.finditer(self.s, self.pos, pos):
+            self.brackets += 1 if match.group() == "{" else -1
+            self.has_started = True
+            if self.brackets == 0:
+                self.groups += 1
+                self.has_started = False
+        self.pos = pos
+
+    def count(self, sub: str, piece_start: int) -> int:
+        # leading characters removed by strip() can contain a "(" (see STRIP_BRACKET_RE)
+        return self.counts[sub] - self.s.count(sub, self.start, piece_start)
+
+class FastParseList(ParseList):
+    """
+    Single-pass version of ParseList.parse with the same result.
+
+    ParseList finds each element by re-joining a growing number of delimiter-separated parts of the remaining string
+    and re-checking the whole candidate, and re-splits the rest after every element, which is quadratic in the
+    number of elements. This parser makes the same decisions (same objects tried in the same order, the shortest
+    complete and finished candidate wins) but walks the delimiter positions of the string once, keeps running
+    counts of the candidates and only copies the elements that are parsed. Nested lists and matrix rows are parsed
+    recursively with it.
+    """
+
+    @classmethod
+    def is_object_at_start(cls, obj, s: str, start: int, end: int) -> bool:
+        if obj is ParseList:
+            return s.startswith("(", start, end)
+        if obj is ParseMatrix:
+            return MATRIX_START_RE.match(s, start, end) is not None or ARRAY_START_RE.match(s, start, end) is not None
+        if obj is ParseFraction:
+            if s.startswith(r"\frac{", start, end):
+                return True
+            # string.replace(" ", "").startswith(r"-\frac{") on the first characters only
+            prefix = []
+            i = start
+            while i < end and len(prefix) < len(r"-\frac{"):
+                if s[i] != " ":
+                    prefix.append(s[i])
+                i += 1
+            return "".join(prefix) == r"-\frac{"
+        return True
+
+    @classmethod
+    def is_object_candidate(cls, obj, s: str, start: int, end: int, counter: _CandidateCounter) -> tuple[bool, bool]:
+        """
+        Whether s[start:end] is complete and finished for obj, and whether a longer candidate could still be.
+        """
+        if obj is ParseList:
+            if counter.count("(", start) != counter.count(")", start):
+                return False, True
+            # string.strip().strip(",").endswith(")")
+            i = end
+            while i > start and s[i - 1].isspace():
+                i -= 1
+            while i > start and s[i - 1] == ",":
+                i -= 1
+            return i > start and s[i - 1] == ")", True
+        if obj is ParseMatrix:
+            return counter.count("{", start) == counter.count("}", start) and \
+                counter.count("\\end{", start) == counter.count("\\begin{", start), True
+        if obj is ParseFraction:
+            # the number of brace groups only grows with longer candidates, is_finished needs exactly two
+            if counter.groups > 2:
+                return False, False
+            if counter.groups != 2 or not s.endswith("}", start, end):
+                return False, True
+            piece = s[start:end]
+            return ParseFraction.is_complete(piece) and ParseFraction.is_finished(piece), True
+        return counter.count("{", start) == counter.count("}", start) and \
+            counter.count("(", start) == counter.count(")", start), True
+
+    @classmethod
+    def parse(cls, string, delimiter=[r"\n", ","], primitive_type=None, depth=0):
+        if isinstance(delimiter, str):
+            delimiter = [delimiter]
+        output = []
+        if not string.startswith("("):
+            return None
+        string = string.strip().strip(",")
+        if cls.never_zero_count(string[:-1]):
+            string = string[1:-1]
+        s = strip(string)
+        used_delim = delimiter[0]
+        for delim in delimiter:
+            if delim in s:
+                used_delim = delim
+                break
+        # the remaining string is s[start:end]
+        start, end = 0, len(s)
+        while start < end:
+            at_start, at_end = strip_bounds(s, start, end)
+            allowed_objects = [ParseList, ParseMatrix, ParseFraction, ParsePrimitive]
+            if depth > 50:
+                allowed_objects = [ParseMatrix, ParseFraction, ParsePrimitive]
+            found = None
+            for obj in allowed_objects:
+                if not cls.is_object_at_start(obj, s, at_start, at_end):
+                    continue
+                # candidates end before each delimiter of the remaining string, the last one at its end
+                counter = _CandidateCounter(s, start)
+                part_end = s.find(used_delim, start, end)
+                while True:
+                    counter.advance(part_end if part_end != -1 else end)
+                    piece_start, piece_end = strip_bounds(s, start, part_end if part_end != -1 else end)
+                    is_candidate, may_continue = cls.is_object_candidate(obj, s, piece_start, piece_end, counter)
+                    if is_candidate:
+                        found = (obj, piece_start, piece_end, part_end)
+                        break
+                    if part_end == -1 or not may_continue:
+                        break
+                    part_end = s.find(used_delim, part_end + len(used_delim), end)
+                if found is not None:
+                    break
+            if found is None:
+                if depth > 50:
+                    raise ValueError(f"Failed to parse '{s[start:end]}'")
+                return None
+            obj, piece_start, piece_end, part_end = found
+            piece = s[piece_start:piece_end]
+            if obj is ParseList:
+                output.append(cls.parse(piece, primitive_type=primitive_type, depth=depth+1))
+            elif obj is ParseMatrix:
+                output.append(ParseMatrix.parse(piece, primitive_type=primitive_type, list_parser=cls))
+            else:
+                output.append(obj.parse(piece, primitive_type=primitive_type))
+            if part_end == -1:
+                break
+            start, end = strip_bounds(s, part_end + len(used_delim), end)
+        return output
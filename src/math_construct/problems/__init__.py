@@ -1,53 +1,25 @@
-import glob
-import importlib
-import os
-import re
 from .problem import Problem
-import inspect
+from .registry import registry
 
-# Dictionary to store problem classes
-problem_classes = {}
-
-# Find all folders in the problems directory, don't include files or folders starting with _
-g = os.path.join(os.path.dirname(__file__), "*")
-problem_folders = glob.glob(g)
-problem_folders = [folder for folder in problem_folders if os.path.isdir(folder) and not folder.split('/')[-1].startswith('_')]
-
-for problem_folder in problem_folders:
-    folder_name = os.path.basename(problem_folder)
-    problem_files = glob.glob(os.path.join(problem_folder, "*.py"))
-    curr_problems = {}
-    for problem_file in problem_files:
-        module_name = os.path.basename(problem_file)[:-3]  # Remove .py extension
-        module = importlib.import_module(f".{module_name}", package=f"math_construct.problems.{folder_name}")
-        
-        # Find all Problem classes in the module
-        for attr_name in dir(module):
-            attr = getattr(module, attr_name)
-            if attr_name == "Problem" or not (inspect.isclass(attr) and issubclass(attr, Problem)):
-                continue
-            assert isinstance(attr, type)
-            curr_problems[attr.config.name] = attr
-    if len(curr_problems) > 0:
-        problem_classes[folder_name] = curr_problems
+# Problem modules are imported lazily, only once their class is requested
 
 def get_problem_class(problem_name: str):
-   problem_classes = get_all_problem_classes()
-   for problem_class in problem_classes:
-       if problem_class.config.name == problem_name:
-           return problem_class
-   return None
+    for entry in registry.get_sorted_entries():
+        if entry["name"] == problem_name:
+            return registry.load_class(entry)
+    return None
 
 # Returns all flattened problem classes
 def get_all_problem_classes(include_backups=False) -> list[type]:
-    groups_sorted = sorted(list(problem_classes.items()), key=lambda kv: kv[0].lower())
-    all_problem_classes = [] 
-    for group, problems in groups_sorted:
-        if group == "backups" and not include_backups:
-            continue
-        problems_sorted = sorted(list(problems.items()), key=lambda kv: kv[0].lower()) 
-        all_problem_classes += [problem[1] for problem in problems_sorted]
-    return all_problem_classes
+    return [registry.load_class(entry) for entry in registry.get_sorted_entries(include_backups)]
+
+# Returns the names of all problems without importing them
+def get_all_problem_names(include_backups=False) -> list[str]:
+    return [entry["name"] for entry in registry.get_sorted_entries(include_backups)]
+
+# Returns the problem classes whose name matches any of the regexes (and which have any of the tags, if given)
+def get_matching_problem_classes(regexes: list[str], tags: list[str] = None, include_backups=False) -> list[type]:
+    return [registry.load_class(entry) for entry in registry.match_entries(regexes, tags, include_backups)]
 
 group_info = {
     "backups": "Backup Problems",
@@ -72,11 +44,9 @@ group_info = {
 
 # Returns the problem classes per group 
 def get_problem_classes_per_group(include_backups=False) -> list[tuple[str, list[tuple[str, type]]]]:
-    groups_sorted = sorted(list(problem_classes.items()), key=lambda kv: kv[0].lower())
     all_problem_classes = [] 
-    for group, problems in groups_sorted:
-        if group == "backups" and not include_backups:
-            continue
-        problems_sorted = sorted(list(problems.items()), key=lambda kv: kv[0].lower()) 
-        all_problem_classes.append((group, problems_sorted))
-    return all_problem_classes
\ No newline at end of file
+    for entry in registry.get_sorted_entries(include_backups):
+        if len(all_problem_classes) == 0 or all_problem_classes[-1][0] != entry["group"]:
+            all_problem_classes.append((entry["group"], []))
+        all_problem_classes[-1][1].append((entry["name"], registry.load_class(entry)))
+    return all_problem_classes
@@ -59,7 +59,7 @@ class Problem_IMC_2022_6(Problem):
         parameters=["p"],
         source="IMC 2022 P6",
         original_parameters={"p": 461},
-        original_solution=get_solution(461),
+        original_solution=lambda: get_solution(461),
         problem_url="https://www.imc-math.org.uk/imc2022/imc2022day2solutions.pdf#page=2",
         solution_url="https://www.imc-math.org.uk/imc2022/imc2022day2solutions.pdf#page=2",
         tags=[Tag.COMBINATORICS, Tag.IS_SIMPLIFIED, Tag.FIND_ANY],
@@ -54,7 +54,7 @@ class Problem13(Problem):
         parameters=["n"],
         source="1990 USAMO Problem 3",
         original_parameters={"n": 233},
-        original_solution=get_solution(233),
+        original_solution=lambda: get_solution(233),
         problem_url="https://artofproblemsolving.com/wiki/index.php/1990_USAMO_Problems/Problem_3",
         solution_url="https://artofproblemsolving.com/wiki/index.php/1990_USAMO_Problems/Problem_3",
         tags=[Tag.COMBINATORICS, Tag.IS_GENERALIZED, Tag.IS_SIMPLIFIED, Tag.FIND_ANY]
@@ -24,7 +24,7 @@ class ProblemJBMO2006P14(Problem):
         parameters=['n'],
         source="2006 JBMO Shortlist 14",
         original_parameters={'n':60},
-        original_solution=get_solution(60),
+        original_solution=lambda: get_solution(60),
         problem_url="https://artofproblemsolving.com/community/c6h238634p1313580",
         solution_url="https://artofproblemsolving.com/community/c6h238634p1313580",
         tags=[Tag.ALGEBRA, Tag.FIND_ANY, Tag.IS_ORIGINAL]
@@ -20,7 +20,7 @@ class ProblemSMO2006_2_3AP4(Problem):
         parameters=["n"],
         source="Serbian MO 2006 R2 3 razred A kategorija P4 (simplified)",
         original_parameters={"n": 30},
-        original_solution=get_solution(30),
+        original_solution=lambda: get_solution(30),
         problem_url="https://imomath.com/srb/zadaci/bilten2006.pdf",
         solution_url="https://imomath.com/srb/zadaci/bilten2006.pdf",
         tags=[Tag.GEOMETRY, Tag.IS_SIMPLIFIED, Tag.IS_TRANSLATED, Tag.FIND_ANY]
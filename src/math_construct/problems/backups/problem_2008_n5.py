@@ -24,7 +24,7 @@ class ProblemBMO2008N5(Problem):
         parameters=["N", "p"],
         source="BMO 2008 Shortlist N5",
         original_parameters={"N":23, "p": 31},
-        original_solution=get_solution(23, 31),
+        original_solution=lambda: get_solution(23, 31),
         problem_url="https://artofproblemsolving.com/community/c1120589_2008_balkan_mo_shortlist",
         solution_url="https://artofproblemsolving.com/community/c1120589_2008_balkan_mo_shortlist",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_INF, Tag.IS_SIMPLIFIED]
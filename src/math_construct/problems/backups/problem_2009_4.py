@@ -37,7 +37,8 @@ class ProblemDutch20094(Problem):
         problem_url="https://wiskundeolympiade.nl/files/opgaven/finale/2009/opgaven.pdf",
         solution_url="https://wiskundeolympiade.nl/files/opgaven/finale/2009/uitwerkingen.pdf",
         original_parameters={"n": 8, "k": 5},
-        original_solution=get_solution(5),
+        original_solution=lambda: get_solution(5),
+        answer_format={"is_integer": True, "expected_length": "n", "is_unique": True, "is_matrix": True},
     )
     k: int
     n: int
@@ -50,7 +51,7 @@ class ProblemDutch20094(Problem):
         return PROBLEM_TEMPLATE.format(k=self.k, n=self.n)
         
     def check(self, a: list[list[int]]) -> bool:
-        check_format = self.check_format(a, is_integer=True, expected_length=self.n, is_unique=True, is_matrix=True)
+        check_format = self.check_format(a, **self.get_answer_format())
         if not check_format[0]:
             return check_format
         all_good_solutions = set()
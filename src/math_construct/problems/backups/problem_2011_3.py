@@ -28,7 +28,8 @@ class ProblemDutch20113(Problem):
             [3, 0, 3, 1, 0, 1],
             [3, 1, 1, 3, 1, 0]
         ],
-        tags=[Tag.IS_ORIGINAL, Tag.COMBINATORICS, Tag.FIND_ANY]
+        tags=[Tag.IS_ORIGINAL, Tag.COMBINATORICS, Tag.FIND_ANY],
+        answer_format={"is_integer": True, "expected_length": "n", "is_square_matrix": True, "min_val_inclusive": 0, "max_val_inclusive": 3},
     )
     n: int
 
@@ -40,7 +41,7 @@ class ProblemDutch20113(Problem):
 
     def check(self, a: list[list[int]]) -> bool:
         # check validity matrix
-        checker_format = self.check_format(a, is_integer=True, expected_length=self.n, is_square_matrix=True, min_val_inclusive=0, max_val_inclusive=3)
+        checker_format = self.check_format(a, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         for i in (range(self.n)):
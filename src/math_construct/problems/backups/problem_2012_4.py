@@ -55,7 +55,7 @@ class Problem_HMO_2012_4(Problem):
         parameters=["d"],
         source="HMO 2012 Memo Test Problem 4",
         original_parameters={"d": 1046},
-        original_solution=get_solution(1046),
+        original_solution=lambda: get_solution(1046),
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_TRANSLATED, Tag.IS_SIMPLIFIED],
         problem_url="https://natjecanja.math.hr/wp-content/uploads/2015/02/2012_izborno-rjesenja.pdf#page=20", # page 20
         solution_url="https://natjecanja.math.hr/wp-content/uploads/2015/02/2012_izborno-rjesenja.pdf#page=20", # page 20
@@ -22,7 +22,7 @@ class ProblemBMO2014N4(Problem):
         parameters=["N"],
         source="BMO 2014 Shortlist N4",
         original_parameters={"N": 25},
-        original_solution=get_solution(25),
+        original_solution=lambda: get_solution(25),
         problem_url="https://artofproblemsolving.com/community/c6h588119p3481502",
         solution_url="https://artofproblemsolving.com/community/c6h588119p3481502",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_INF, Tag.IS_SIMPLIFIED]
@@ -60,7 +60,7 @@ class Problem_HMO_2015_4(Problem):
         parameters=["n"],
         source="HMO 2015 4",
         original_parameters={"n": 712998},
-        original_solution=get_solution(712998),
+        original_solution=lambda: get_solution(712998),
         problem_url="https://natjecanja.math.hr/wp-content/uploads/2015/12/2015_HMO_rjesenja.pdf#page=14", # page 14
         solution_url="https://natjecanja.math.hr/wp-content/uploads/2015/12/2015_HMO_rjesenja.pdf#page=14", # page 14
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_SIMPLIFIED],
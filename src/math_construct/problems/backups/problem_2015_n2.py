@@ -26,7 +26,7 @@ class ProblemBMO2015N2(Problem):
         parameters=["N"],
         source="BMO 2015 Shortlist N2",
         original_parameters={"N": 20},
-        original_solution=get_solution(20),
+        original_solution=lambda: get_solution(20),
         problem_url="https://artofproblemsolving.com/community/c6h1889204p12883734",
         solution_url="https://artofproblemsolving.com/community/c6h1889204p12883734",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_INF, Tag.IS_SIMPLIFIED]
@@ -19,8 +19,9 @@ class ProblemKonhauser20166(Problem):
         problem_url="https://www.macalester.edu/mscs/wp-content/uploads/sites/591/2016/03/Konhauser2016.pdf#page=3",
         solution_url="https://www.macalester.edu/mscs/wp-content/uploads/sites/591/2016/03/Konhauser2016.pdf#page=10",
         original_parameters={"k": 10},
-        original_solution=get_solution(10),
-        tags=[Tag.IS_SIMPLIFIED, Tag.ALGEBRA, Tag.FIND_ANY] 
+        original_solution=lambda: get_solution(10),
+        tags=[Tag.IS_SIMPLIFIED, Tag.ALGEBRA, Tag.FIND_ANY],
+        answer_format={"expected_length": "2 * k", "min_val_exclusive": 0},
     )
     k: int
 
@@ -31,7 +32,7 @@ class ProblemKonhauser20166(Problem):
         return PROBLEM_TEMPLATE.format(k=self.k)
 
     def check(self, sol: list[int]) -> bool:
-        checker_format = self.check_format(sol, expected_length=2 * self.k, min_val_exclusive=0)
+        checker_format = self.check_format(sol, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         bs = []
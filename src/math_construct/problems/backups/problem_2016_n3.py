@@ -25,7 +25,7 @@ class ProblemBMO2016N3(Problem):
         parameters=["k"],
         source="BMO 2016 Shortlist N3",
         original_parameters={"k": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         problem_url="https://artofproblemsolving.com/community/c6h1885499p12843947",
         solution_url="https://artofproblemsolving.com/community/c6h1885499p12843947",
         tags=[Tag.ALGEBRA, Tag.FIND_INF, Tag.IS_SIMPLIFIED]
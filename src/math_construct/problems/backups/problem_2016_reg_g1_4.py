@@ -24,7 +24,7 @@ class ProblemSerbianRegional2016_G1_4(Problem):
         parameters=["N"],
         source="Serbian 2016 Regionals Grade 1 P4",
         original_parameters={"N": 12},
-        original_solution=get_solution(12),
+        original_solution=lambda: get_solution(12),
         problem_url="https://imomath.com/srb/zadaci/bilten2016.pdf",
         solution_url="https://imomath.com/srb/zadaci/bilten2016.pdf",
         tags=[Tag.COMBINATORICS, Tag.IS_GENERALIZED, Tag.IS_TRANSLATED, Tag.FIND_ANY]
@@ -23,8 +23,9 @@ class ProblemKonhauser20172(Problem):
         original_parameters={"n": 5},
         problem_url="https://www.macalester.edu/mscs/wp-content/uploads/sites/591/2018/04/KP2017.pdf",
         solution_url="https://www.macalester.edu/mscs/wp-content/uploads/sites/591/2018/04/KP2017.pdf#page=3",
-        original_solution=get_solution(5),
-        tags=[Tag.IS_SIMPLIFIED, Tag.ALGEBRA, Tag.FIND_MAX_MIN] 
+        original_solution=lambda: get_solution(5),
+        tags=[Tag.IS_SIMPLIFIED, Tag.ALGEBRA, Tag.FIND_MAX_MIN],
+        answer_format={"expected_length": "n", "is_square_matrix": True},
     )
     n: str
 
@@ -35,7 +36,7 @@ class ProblemKonhauser20172(Problem):
         return PROBLEM_TEMPLATE.format(n=self.n)
 
     def check(self, sol: list[list[int]]) -> bool:
-        checker_format = self.check_format(sol, expected_length=self.n, is_square_matrix=True)
+        checker_format = self.check_format(sol, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         count_elements = dict()
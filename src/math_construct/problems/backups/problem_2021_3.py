@@ -36,7 +36,7 @@ class ProblemDutch20213(Problem):
         problem_url="https://wiskundeolympiade.nl/phocadownload/opgaven/finale/2021/ProblemsKlas6.pdf",
         solution_url="https://wiskundeolympiade.nl/phocadownload/opgaven/finale/2021/Solutions.pdf",
         original_parameters={"n": 32},
-        original_solution=get_solution(32),
+        original_solution=lambda: get_solution(32),
         tags=[Tag.IS_SIMPLIFIED, Tag.FIND_ANY, Tag.COMBINATORICS] 
     )
     n: int
@@ -20,7 +20,7 @@ class ProblemKonhauser20216(Problem):
         solution_url="https://drive.google.com/file/d/1yC9Kn09fJY1pwT0Dn4fh-ywhwBv-lXD1/view", # page 5
         source="Konhauser Problemfest 2021 P6",
         original_parameters={"k": 20, "n": 21, "m": 2},
-        original_solution=get_solution(21, 20, 2),
+        original_solution=lambda: get_solution(21, 20, 2),
         tags=[Tag.IS_ORIGINAL, Tag.ALGEBRA, Tag.FIND_ANY, Tag.IS_GENERALIZED]
     )
     n: int
@@ -35,7 +35,7 @@ class ProblemJBMO2022N6(Problem):
         parameters=["n"],
         source="2022 JBMO Shortlist N6",
         original_parameters={"n":55},
-        original_solution=get_solution(55),
+        original_solution=lambda: get_solution(55),
         problem_url="https://artofproblemsolving.com/community/c6h3099045p28018832",
         solution_url="https://artofproblemsolving.com/community/c6h3099045p28018832",
         tags=[Tag.NUMBER_THEORY, Tag.IS_GENERALIZED, Tag.FIND_ANY]
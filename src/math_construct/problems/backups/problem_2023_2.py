@@ -29,7 +29,7 @@ class Problem_HMO_2023_2(Problem):
         parameters=["k"],
         source="HMO 2023 2",
         original_parameters={"k": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         problem_url="https://natjecanja.math.hr/wp-content/uploads/2024/01/2023_HMO-5.pdf#page=6",
         solution_url="https://natjecanja.math.hr/wp-content/uploads/2024/01/2023_HMO-5.pdf#page=6",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED],
@@ -20,7 +20,7 @@ class ProblemHMMTFeb2017TeamP7(Problem):
         parameters=["p"],
         source="HMMT February 2017 Team P7",
         original_parameters={"p": 17},
-        original_solution=get_solution(17),
+        original_solution=lambda: get_solution(17),
     )
     p: int
 
@@ -19,7 +19,7 @@ class ProblemIFYM_2013_P8_4_8(Problem):
         parameters=["n"],
         source="IFYM 2013 P8 Day 4",
         original_parameters={"n": 20},
-        original_solution=get_solution(20),
+        original_solution=lambda: get_solution(20),
         problem_url="https://klasirane.com/competitions/OLI/2-%D0%9E%D0%B1%D0%BB%D0%B0%D1%81%D1%82%D0%B5%D0%BD%20%D0%BA%D1%80%D1%8A%D0%B3",
         solution_url="https://klasirane.com/competitions/OLI/2-%D0%9E%D0%B1%D0%BB%D0%B0%D1%81%D1%82%D0%B5%D0%BD%20%D0%BA%D1%80%D1%8A%D0%B3",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_ORIGINAL]
@@ -27,7 +27,7 @@ class ProblemPolish53_R2P5(Problem):
         parameters=["k"],
         source="53rd Polish Olympiad R2 P5",
         original_parameters={"k": 523},
-        original_solution=get_solution(523),
+        original_solution=lambda: get_solution(523),
         problem_url="https://om.sem.edu.pl/previous_olympiads/#53@Zadania",
         solution_url="https://om.sem.edu.pl/previous_olympiads/#53@Zadania",
         tags=[Tag.NUMBER_THEORY, Tag.IS_SIMPLIFIED, Tag.FIND_ANY]
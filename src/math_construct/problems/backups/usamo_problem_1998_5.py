@@ -40,7 +40,7 @@ class USAMO_1998_5(Problem):
         parameters=["n"],
         source="1998 USAMO Problem 5",
         original_parameters={"n": 6},
-        original_solution=get_solution(6),
+        original_solution=lambda: get_solution(6),
         problem_url="https://artofproblemsolving.com/wiki/index.php/1998_USAMO_Problems/Problem_5",
         solution_url="https://artofproblemsolving.com/wiki/index.php/1998_USAMO_Problems/Problem_5",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY],
@@ -29,7 +29,7 @@ class Problem6(Problem):
         parameters=["k"],
         source="USAMTS 98/99 Round 2",
         original_parameters={"k": 70},
-        original_solution=get_solution(70),
+        original_solution=lambda: get_solution(70),
         problem_url="https://files.usamts.org/Problems_10_2.pdf",
         solution_url="https://files.usamts.org/Solutions_10_2.pdf",
         tags=[Tag.NUMBER_THEORY, Tag.IS_SIMPLIFIED, Tag.FIND_INF]
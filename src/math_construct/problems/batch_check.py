@@ -0,0 +1,89 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Union
+from loguru import logger
+from math_construct.problems.problem import Problem
+from math_construct.problems.checker_pool import get_checker_pool
+from math_construct.problems.verdict_cache import get_verdict_cache, is_cacheable
+from math_construct.problems.check_stats import get_check_stats
+from math_construct.problems.transcript_index import TranscriptIndex
+
+def _parse_for_check(problem: Problem, output_str: Union[list[dict[str]], str], index: TranscriptIndex) -> tuple:
+    # runs in a worker, the extended index (with the parse failures found) is sent back to the caller
+    answer, err = problem.parse_for_check(output_str, index)
+    return answer, err, index
+
+def _parse_and_check_one(problem: Problem, output_str: Union[list[dict[str]], str],
+                         index: Optional[TranscriptIndex] = None) -> tuple[tuple, float, Optional[TranscriptIndex]]:
+    check_stats = get_check_stats()
+    ts_start = time.perf_counter()
+    try:
+        # parsing is as expensive as checking, so it also runs in a worker
+        if index is None:
+            answer, err = get_checker_pool().run(problem.parse_for_check, output_str)
+        else:
+            answer, err, index = get_checker_pool().run(_parse_for_check, problem, output_str, index)
+    except Exception as e:
+        answer, err = None, f"Error parsing solution: {e}"
+        logger.warning(err)
+    parse_time = time.perf_counter() - ts_start
+    if err is not None:
+        if check_stats is not None:
+            check_stats.add(problem, parse_time, None, None)
+        return (None, False, err), parse_time, index
+    task_stats = {}
+    is_correct, details = problem.check_answer(answer, task_stats)
+    duration = time.perf_counter() - ts_start
+    if check_stats is not None:
+        check_stats.add(problem, parse_time, duration - parse_time, answer, **task_stats)
+    return (answer, is_correct, details), duration, index
+
+def check_many(pairs: Iterable[tuple[Problem, Union[list[dict[str]], str]]], n_workers: int = None,
+               return_durations: bool = False, use_cache: bool = True, indexes: Optional[list[TranscriptIndex]] = None):
+    """
+    Parses and checks many (problem, transcript) pairs in parallel on the shared checker pool.
+
+    Args:
+        pairs: (problem, output_str) pairs, where output_str is what problem.parse_and_check accepts.
+        n_workers (int, optional): Number of pairs processed at once. Defaults to the size of the checker pool.
+        return_durations (bool, optional): Whether to also return the wall time (parse + check) of each pair.
+        use_cache (bool, optional): Whether to look up and store verdicts in the verdict cache. Defaults to True.
+        indexes (list, optional): TranscriptIndex of each pair, kept by the caller over the rounds of a conversation.
+                                  Entries are replaced by the indexes extended in the workers. Defaults to None.
+    Returns:
+        list: (answer, is_correct, details) for each pair, in the original order, same as problem.parse_and_check.
+              If return_durations is set, a tuple (results, durations) is returned instead.
+    """
+    pairs = list(pairs)
+    outputs = [None] * len(pairs)
+    cache = get_verdict_cache() if use_cache else None
+    if cache is not None:
+        keys = [cache.get_key(problem, output_str) for problem, output_str in pairs]
+        cached = cache.get_many(keys)
+        for i, key in enumerate(keys):
+            if key in cached:
+                answer, is_correct, details, duration = cached[key]
+                outputs[i] = ((answer, is_correct, details), duration)
+    to_check = [i for i in range(len(pairs)) if outputs[i] is None]
+    logger.debug(f"Checking {len(to_check)} out of {len(pairs)} answers, the rest are cached")
+
+    if len(to_check) > 0:
+        if n_workers is None:
+            n_workers = get_checker_pool().max_workers
+        n_workers = max(1, min(n_workers, len(to_check)))
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            checked = list(executor.map(lambda i: _parse_and_check_one(*pairs[i], indexes[i] if indexes is not None else None), to_check))
+        for i, output in zip(to_check, checked):
+            outputs[i] = output[:2]
+            if indexes is not None:
+                indexes[i] = output[2]
+        if cache is not None:
+            cache.put_many([
+                (keys[i], pairs[i][0].config.name, (*output[0], output[1]))
+                for i, output in zip(to_check, checked) if is_cacheable(output[0][2])
+            ])
+
+    results = [output[0] for output in outputs]
+    if return_durations:
+        return results, [output[1] for output in outputs]
+    return results
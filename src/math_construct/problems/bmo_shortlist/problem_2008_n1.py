@@ -66,7 +66,7 @@ class ProblemBMO2008N1(Problem):
         parameters=["a"],
         source="BMO 2008 Shortlist N1",
         original_parameters={"a": 12},
-        original_solution=get_solution(12),
+        original_solution=lambda: get_solution(12),
         problem_url="https://artofproblemsolving.com/community/c6h2053042p14598681",
         solution_url="https://artofproblemsolving.com/community/c6h2053042p14598681",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_SIMPLIFIED]
@@ -23,7 +23,7 @@ class ProblemBMO2014C1(Problem):
         parameters=["N"],
         source="BMO 2014 Shortlist C1",
         original_parameters={"N": 56},
-        original_solution=get_solution(56),
+        original_solution=lambda: get_solution(56),
         problem_url="https://artofproblemsolving.com/community/c6h1889716p12889374",
         solution_url="https://artofproblemsolving.com/community/c6h1889716p12889374",
         tags=[Tag.COMBINATORICS, Tag.IS_SIMPLIFIED, Tag.FIND_ANY, Tag.IS_ORIGINAL]
@@ -58,7 +58,7 @@ class ProblemBMO2015N7(Problem):
         parameters=["N"],
         source="BMO 2015 Shortlist N7",
         original_parameters={"N": 5},
-        original_solution=get_solution(5),
+        original_solution=lambda: get_solution(5),
         problem_url="https://artofproblemsolving.com/community/c6h1889231p12884001",
         solution_url="https://artofproblemsolving.com/community/c6h1889231p12884001",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_INF, Tag.IS_GENERALIZED, Tag.IS_SIMPLIFIED]
@@ -27,7 +27,7 @@ class ProblemBMO2018C1(Problem):
         parameters=["N"],
         source="BMO 2018 Shortlist C1",
         original_parameters={"N": 11},
-        original_solution=get_solution(11),
+        original_solution=lambda: get_solution(11),
         problem_url="https://artofproblemsolving.com/community/c6h1840358p12360253",
         solution_url="https://artofproblemsolving.com/community/c6h1840358p12360253",
         tags=[Tag.COMBINATORICS, Tag.FIND_ANY, Tag.IS_ORIGINAL]
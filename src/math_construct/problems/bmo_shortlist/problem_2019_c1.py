@@ -60,7 +60,7 @@ class ProblemBMO2019C1(Problem):
         parameters=["N"],
         source="BMO 2019 Shortlist C1",
         original_parameters={"N": 100},
-        original_solution=get_solution(100),
+        original_solution=lambda: get_solution(100),
         problem_url="https://artofproblemsolving.com/community/c6h2334522p18764217",
         solution_url="https://artofproblemsolving.com/community/c6h2334522p18764217",
         tags=[Tag.COMBINATORICS, Tag.FIND_ANY, Tag.IS_SIMPLIFIED]
@@ -24,7 +24,7 @@ class ProblemBMO2019C2(Problem):
         parameters=["N"],
         source="BMO 2019 Shortlist C2",
         original_parameters={"N": 45},
-        original_solution=get_solution(45),
+        original_solution=lambda: get_solution(45),
         problem_url="https://artofproblemsolving.com/community/c6h1924920p13206326",
         solution_url="https://artofproblemsolving.com/community/c6h1924920p13206326",
         tags=[Tag.COMBINATORICS, Tag.FIND_ANY, Tag.IS_ORIGINAL]
@@ -24,7 +24,7 @@ class ProblemIFYM_2015_P7_4_8(Problem):
         parameters=["n"],
         source="IFYM 2015 P7 Day 4",
         original_parameters={"n": 10000001},
-        original_solution=get_solution(10000001),
+        original_solution=lambda: get_solution(10000001),
         problem_url="https://klasirane.com/competitions/IFYM/2-8-9%20%D0%BA%D0%BB%D0%B0%D1%81",
         solution_url="https://klasirane.com/competitions/IFYM/2-8-9%20%D0%BA%D0%BB%D0%B0%D1%81",
         tags=[Tag.ALGEBRA, Tag.FIND_ANY, Tag.IS_TRANSLATED, Tag.IS_ORIGINAL]
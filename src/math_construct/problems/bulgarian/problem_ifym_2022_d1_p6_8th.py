@@ -22,7 +22,7 @@ class ProblemIFYM_2022_P6_1_8(Problem):
         parameters=["N", "n"],
         source="IFYM 2022 P6 Day 1",
         original_parameters={"N": 20, "n": 343},
-        original_solution=get_solution(20, 343),
+        original_solution=lambda: get_solution(20, 343),
         problem_url="https://klasirane.com/competitions/IFYM/2-8-9%20%D0%BA%D0%BB%D0%B0%D1%81",
         solution_url="https://klasirane.com/competitions/IFYM/2-8-9%20%D0%BA%D0%BB%D0%B0%D1%81",
         tags=[Tag.FIND_ANY, Tag.NUMBER_THEORY, Tag.IS_GENERALIZED, Tag.IS_TRANSLATED]
@@ -35,7 +35,7 @@ class ProblemBulMO2021P8_4(Problem):
         parameters=["k"],
         source="Bulgarian MO II P8.4",
         original_parameters={"k": 30},
-        original_solution=get_solution(30),
+        original_solution=lambda: get_solution(30),
         problem_url="https://klasirane.com/competitions/OLI/2-%D0%9E%D0%B1%D0%BB%D0%B0%D1%81%D1%82%D0%B5%D0%BD%20%D0%BA%D1%80%D1%8A%D0%B3",
         solution_url="https://klasirane.com/competitions/OLI/2-%D0%9E%D0%B1%D0%BB%D0%B0%D1%81%D1%82%D0%B5%D0%BD%20%D0%BA%D1%80%D1%8A%D0%B3",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_ORIGINAL, Tag.IS_TRANSLATED]
@@ -51,7 +51,7 @@ class ProblemBulPMS20204P10_4(Problem):
         parameters=["N", "e"],
         source="Bulgarian Spring National Competition 2020 10th Grade P4",
         original_parameters={"N": 15, "e": 43},
-        original_solution=get_solution(15, 43),
+        original_solution=lambda: get_solution(15, 43),
         problem_url="https://klasirane.com/competitions/PMS/All",
         solution_url="https://klasirane.com/competitions/PMS/All",
         tags=[Tag.COMBINATORICS, Tag.FIND_ANY, Tag.IS_ORIGINAL, Tag.IS_TRANSLATED]
@@ -27,7 +27,7 @@ class ProblemBulPMS2008P8_3(Problem):
         parameters=["N"],
         source="Bulgarian Spring National Competition 2008 8th Grade P3",
         original_parameters={"N": 5},
-        original_solution=get_solution(5),
+        original_solution=lambda: get_solution(5),
         problem_url="https://klasirane.com/competitions/PMS/All",
         solution_url="https://klasirane.com/competitions/PMS/All",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_INF, Tag.IS_SIMPLIFIED, Tag.IS_TRANSLATED]
@@ -20,7 +20,7 @@ class ProblemBulPMS2021P10_3(Problem):
         parameters=["N"],
         source="Bulgarian Spring National Competition 2021 10th Grade P3",
         original_parameters={"N": 15},
-        original_solution=get_solution(15),
+        original_solution=lambda: get_solution(15),
         problem_url="https://klasirane.com/competitions/PMS/All",
         solution_url="https://klasirane.com/competitions/PMS/All",
         tags = [Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_ORIGINAL, Tag.IS_TRANSLATED]
@@ -25,7 +25,7 @@ class ProblemBulPMS2022P10_3(Problem):
         parameters=["N"],
         source="Bulgarian Spring National Competition 2022 10-12th Grade P3",
         original_parameters={"N": 20},
-        original_solution=get_solution(20),
+        original_solution=lambda: get_solution(20),
         problem_url="https://klasirane.com/competitions/PMS/All",
         solution_url="https://klasirane.com/competitions/PMS/All",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_INF, Tag.IS_SIMPLIFIED, Tag.IS_TRANSLATED]
@@ -34,7 +34,7 @@ class ProblemBxMO20111(Problem):
         problem_url="http://bxmo.org/problems/bxmo-problems-2011-zz.pdf",
         solution_url="http://bxmo.org/problems/bxmo-problems-2011-zz.pdf",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_INF, Tag.IS_ORIGINAL, Tag.IS_GENERALIZED], 
-        original_solution=get_solution(3, 1)
+        original_solution=lambda: get_solution(3, 1)
     )
     k: int
     k_squared: int
@@ -27,7 +27,7 @@ class ProblemBxMO20154(Problem):
         original_parameters={"n": 15}, # not the original size, complexity is the same though
         problem_url="http://bxmo.org/problems/bxmo-problems-2015-zz.pdf",
         solution_url="http://bxmo.org/problems/bxmo-problems-2015-zz.pdf",
-        original_solution=get_solution(15),
+        original_solution=lambda: get_solution(15),
         tags=[Tag.IS_SIMPLIFIED, Tag.FIND_MAX_MIN, Tag.NUMBER_THEORY] 
     )
     n: int
@@ -30,8 +30,9 @@ class ProblemBxMO20192(Problem):
         parameters=["k", "n"],
         source="BxMO 2019 P2",
         original_parameters={"n": 9}, # not the original size, to make it parseable, complexity is the same though
-        original_solution=get_solution(9),
-        tags=[Tag.IS_SIMPLIFIED, Tag.COMBINATORICS, Tag.FIND_MAX_MIN, Tag.IS_GENERALIZED] 
+        original_solution=lambda: get_solution(9),
+        tags=[Tag.IS_SIMPLIFIED, Tag.COMBINATORICS, Tag.FIND_MAX_MIN, Tag.IS_GENERALIZED],
+        answer_format={"is_integer": True, "expected_length": "n", "is_square_matrix": True, "min_val_inclusive": 0, "max_val_inclusive": 2},
     )
     n: int
     k: int
@@ -45,7 +46,7 @@ class ProblemBxMO20192(Problem):
         
     def check(self, a: list[list[int]]) -> bool:
         # check validity matrix
-        correct, message, tag = self.check_format(a, is_integer=True, expected_length=self.n, is_square_matrix=True, min_val_inclusive=0, max_val_inclusive=2)
+        correct, message, tag = self.check_format(a, **self.get_answer_format())
         if not correct:
             return correct, message, tag
         rooks, pawns = 0, 0
@@ -27,8 +27,9 @@ class ProblemBxMO20204(Problem):
         parameters=["n"],
         source="BxMO 2020 P4",
         original_parameters={"n": 60},
-        original_solution=get_solution(60),
-        tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_GENERALIZED, Tag.IS_SIMPLIFIED] 
+        original_solution=lambda: get_solution(60),
+        tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_GENERALIZED, Tag.IS_SIMPLIFIED],
+        answer_format={"is_integer": True, "min_val_inclusive": 1},
     )
     n: int
 
@@ -39,7 +40,7 @@ class ProblemBxMO20204(Problem):
         return PROBLEM_TEMPLATE.format(n=self.n)
         
     def check(self, a: int) -> bool:
-        check_format = self.check_format(a, is_integer=True, min_val_inclusive=1)
+        check_format = self.check_format(a, **self.get_answer_format())
         if not check_format[0]:
             return check_format
         divisors_number = divisors(a)
@@ -28,8 +28,9 @@ class ProblemBxMO20212(Problem):
         problem_url="http://bxmo.org/problems/bxmo-problems-2021-zz.pdf",
         solution_url="http://bxmo.org/problems/bxmo-problems-2021-zz.pdf",
         original_parameters={"n": 7, "threen_1": 10},
-        original_solution=get_solution(7),
-        tags=[Tag.IS_SIMPLIFIED, Tag.FIND_ANY, Tag.COMBINATORICS, Tag.IS_GENERALIZED]
+        original_solution=lambda: get_solution(7),
+        tags=[Tag.IS_SIMPLIFIED, Tag.FIND_ANY, Tag.COMBINATORICS, Tag.IS_GENERALIZED],
+        answer_format={"is_integer": True, "is_square_matrix": True, "min_val_inclusive": 0, "max_val_inclusive": 1},
     )
     threen_1: int
     n: int
@@ -43,7 +44,7 @@ class ProblemBxMO20212(Problem):
         
     def check(self, a: list[list[int]]) -> bool:
         # check matrix is correct
-        checker_format = self.check_format(a, is_integer=True, is_square_matrix=True, min_val_inclusive=0, max_val_inclusive=1)
+        checker_format = self.check_format(a, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         sum_pebbles = sum([sum(row) for row in a])
@@ -0,0 +1,130 @@
+import csv
+import json
+import os
+import threading
+from typing import Any, Optional
+import numpy as np
+
+# Upper edges (in seconds) of the buckets of the parse and check time histograms, the last bucket is unbounded
+TIME_BUCKETS = [0.001, 0.01, 0.1, 1, 10]
+
+def get_answer_size(answer: Any) -> int:
+    """Number of primitive values in a parsed answer, 0 if there is none."""
+    if answer is None:
+        return 0
+    size, stack = 0, [answer]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, (list, tuple, set)):
+            stack.extend(value)
+        else:
+            size += 1
+    return size
+
+def get_histogram(values: list[float]) -> dict[str, int]:
+    edges = [0] + TIME_BUCKETS + [float("inf")]
+    counts = np.histogram(values, bins=edges)[0] if len(values) > 0 else [0] * (len(edges) - 1)
+    return {f"<{hi}s" if hi != float("inf") else f">={lo}s": int(c) for lo, hi, c in zip(edges[:-1], edges[1:], counts)}
+
+class CheckStats:
+    """
+    Collects one record per parsed and checked answer (from Problem.parse_and_check and check_many):
+    parse and check wall time, peak RSS of the checker worker, whether the check timed out or was answered by the
+    answer_format precheck, and the answer size.
+    Records are aggregated per problem and written next to the outputs of a run.
+    """
+
+    def __init__(self):
+        self.records = []
+        self.lock = threading.Lock()
+
+    def add(self, problem, parse_time: float, check_time: Optional[float], answer: Any,
+            peak_rss_mb: Optional[float] = None, timed_out: bool = False, prechecked: bool = False):
+        record = {
+            "problem_name": problem.config.name,
+            "parse_time": parse_time,
+            "check_time": check_time,
+            "peak_rss_mb": peak_rss_mb,
+            "timed_out": timed_out,
+            "prechecked": prechecked,
+            "timeout": problem.config.timeout,
+            "answer_size": get_answer_size(answer),
+        }
+        with self.lock:
+            self.records.append(record)
+
+    def summarize(self) -> list[dict]:
+        """Per-problem aggregates, sorted by total check time (descending)."""
+        with self.lock:
+            records = list(self.records)
+        per_problem = {}
+        for record in records:
+            per_problem.setdefault(record["problem_name"], []).append(record)
+        summary = []
+        for problem_name, problem_records in per_problem.items():
+            parse_times = [r["parse_time"] for r in problem_records]
+            check_times = [r["check_time"] for r in problem_records if r["check_time"] is not None]
+            peak_rss = [r["peak_rss_mb"] for r in problem_records if r["peak_rss_mb"] is not None]
+            answer_sizes = [r["answer_size"] for r in problem_records]
+            timeout = problem_records[0]["timeout"]
+            entry = {
+                "problem_name": problem_name,
+                "n": len(problem_records),
+                "n_checked": len(check_times),
+                "n_timeouts": sum(r["timed_out"] for r in problem_records),
+                # answers rejected by the answer_format precheck, without a checker worker
+                "n_prechecked": sum(r["prechecked"] for r in problem_records),
+                "timeout": timeout,
+                "parse_time_total": sum(parse_times),
+                "parse_time_p50": float(np.percentile(parse_times, 50)),
+                "parse_time_max": max(parse_times),
+                "check_time_total": sum(check_times),
+                "check_time_p50": float(np.percentile(check_times, 50)) if check_times else None,
+                "check_time_p95": float(np.percentile(check_times, 95)) if check_times else None,
+                "check_time_max": max(check_times) if check_times else None,
+                # how close the slowest check came to config.timeout
+                "max_timeout_fraction": max(check_times) / timeout if check_times and timeout else None,
+                "peak_rss_mb_max": max(peak_rss) if peak_rss else None,
+                "answer_size_mean": sum(answer_sizes) / len(answer_sizes),
+                "answer_size_max": max(answer_sizes),
+            }
+            for bucket, count in get_histogram(parse_times).items():
+                entry[f"parse_hist_{bucket}"] = count
+            for bucket, count in get_histogram(check_times).items():
+                entry[f"check_hist_{bucket}"] = count
+            summary.append(entry)
+        return sorted(summary, key=lambda entry: entry["check_time_total"], reverse=True)
+
+    def write(self, out_dir: str, fmt: str = "jsonl", prefix: str = "checker_stats") -> list[str]:
+        """
+        Writes the raw records and the per-problem summary to out_dir as {prefix}.{fmt} and {prefix}_summary.{fmt}.
+        Returns the written paths.
+        """
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError(f"Unknown format {fmt}, expected jsonl or csv")
+        with self.lock:
+            records = list(self.records)
+        paths = []
+        for name, rows in [(prefix, records), (f"{prefix}_summary", self.summarize())]:
+            path = os.path.join(out_dir, f"{name}.{fmt}")
+            with open(path, "w", newline="") as f:
+                if fmt == "jsonl":
+                    for row in rows:
+                        f.write(json.dumps(row) + "\n")
+                elif len(rows) > 0:
+                    writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+                    writer.writeheader()
+                    writer.writerows(rows)
+            paths.append(path)
+        return paths
+
+_stats = None
+
+def get_check_stats() -> Optional[CheckStats]:
+    """Returns the active collector, None (the default) if parse/check instrumentation is disabled."""
+    return _stats
+
+def set_check_stats(stats: Optional[CheckStats]):
+    """Installs a collector for all subsequent parse_and_check and check_many calls, None disables it."""
+    global _stats
+    _stats = stats
@@ -0,0 +1,216 @@
+import platform
+import statistics
+import time
+from datetime import datetime
+from fractions import Fraction
+from typing import Any, Optional
+from loguru import logger
+from math_construct.problems.problem import Problem
+from math_construct.problems.checker_pool import get_checker_pool
+from math_construct.problems.check_stats import get_answer_size
+
+# Timings below this many seconds are dominated by noise and never reported as regressions
+DEFAULT_MIN_TIME = 0.001
+
+def time_check(problem: Problem, answer: Any, n_repeats: int) -> dict:
+    """Runs problem.check(answer) n_repeats times (in the calling process) and returns the timings and the verdict."""
+    times = []
+    is_correct, error = None, None
+    for _ in range(n_repeats):
+        ts_start = time.perf_counter()
+        try:
+            is_correct = problem.check_raw(answer)
+        except Exception as e:
+            # check_answer counts a checker exception as a wrong answer, so it is timed like one
+            is_correct, error = False, f"{type(e).__name__}: {e}"
+        times.append(time.perf_counter() - ts_start)
+    result = {"times": times, "is_correct": bool(is_correct)}
+    if error is not None:
+        result["check_error"] = error
+    return result
+
+def get_solution(problem: Problem) -> Any:
+    return problem.get_solution()
+
+def make_instance(problem_class: type[Problem], params: dict) -> tuple[Problem, Any]:
+    """Creates an instance and its solution, constructors of some problems already solve them."""
+    problem = problem_class(**params)
+    return problem, problem.get_solution()
+
+def get_bad_answer(solution: Any) -> Optional[Any]:
+    """
+    A wrong answer with the structure of the solution: the first element is repeated in place of the last one
+    (as in test_uniqueness), numbers are increased by one. Returns None if no such answer can be built.
+    """
+    if isinstance(solution, bool):
+        return not solution
+    if isinstance(solution, (int, Fraction)):
+        return solution + 1
+    if isinstance(solution, float):
+        return solution + 1.0
+    if isinstance(solution, (list, tuple)) and len(solution) > 1:
+        return type(solution)([solution[0]] + list(solution[:-1]))
+    if isinstance(solution, (list, tuple)) and len(solution) == 1:
+        bad_element = get_bad_answer(solution[0])
+        return None if bad_element is None else type(solution)([bad_element])
+    return None
+
+def get_scaled_parameters(problems: list[Problem], scale: float) -> Optional[dict]:
+    """
+    Parameters past the ranges used by generate(): the instance with the largest integer parameters is taken
+    and all of its integer parameters are multiplied by `scale`, which keeps the relations between them.
+    Returns None if the problem has no integer parameters.
+    """
+    def get_int_params(problem):
+        return {
+            param: getattr(problem, param) for param in problem.config.parameters
+            if isinstance(getattr(problem, param), int) and not isinstance(getattr(problem, param), bool)
+        }
+    largest = max(problems, key=lambda problem: sum(abs(v) for v in get_int_params(problem).values()))
+    int_params = get_int_params(largest)
+    if len(int_params) == 0:
+        return None
+    params = {param: getattr(largest, param) for param in largest.config.parameters}
+    for param, value in int_params.items():
+        params[param] = int(round(value * scale))
+    return params
+
+def _run_case(problem: Problem, answer: Any, n_repeats: int, timeout: float) -> dict:
+    """Times check() in a checker worker, so that a hanging checker only costs the timeout."""
+    case = {"answer_size": get_answer_size(answer)}
+    try:
+        result = get_checker_pool().run(time_check, problem, answer, n_repeats, timeout=timeout * n_repeats)
+    except Exception as e:
+        case["error"] = f"{type(e).__name__}: {e}"
+        return case
+    case["is_correct"] = result["is_correct"]
+    if "check_error" in result:
+        case["check_error"] = result["check_error"]
+    case["time_min"] = min(result["times"])
+    case["time_median"] = statistics.median(result["times"])
+    return case
+
+def benchmark_problem(problem_class: type[Problem], n_instances: int = 3, scale: float = 2,
+                      n_repeats: int = 3, timeout: float = None) -> dict:
+    """
+    Times the checker of one problem on the original solution, on the solutions of generated instances,
+    on the solution of a scaled-up instance and on a known-bad answer.
+
+    Args:
+        problem_class (type[Problem]): The problem to benchmark.
+        n_instances (int, optional): Number of generated instances (besides the original). Defaults to 3.
+        scale (float, optional): Factor applied to the integer parameters of the scaled-up instance. Defaults to 2.
+        n_repeats (int, optional): Number of timed check() calls per case. Defaults to 3.
+        timeout (float, optional): Timeout per check() call and per solution. Defaults to config.timeout.
+    Returns:
+        dict: Case name ("original", "generated_<i>", "scaled", "bad") -> {"params", "answer_size", "is_correct",
+              "time_min", "time_median"}, or {"params", "error"} / {"skipped"} if the case could not be run.
+    """
+    timeout = timeout if timeout is not None else problem_class.config.timeout
+    original = problem_class.get_original()
+    original_solution = problem_class.config.original_solution
+    instances = [("original", original, original_solution)]
+    if problem_class.has_variations() and n_instances > 0:
+        # generate_multiple is seeded, so the instances are the same in every benchmark run
+        generated = [p for p in problem_class.generate_multiple(n_instances + 1) if not p.is_original()]
+        instances += [(f"generated_{i}", problem, None) for i, problem in enumerate(generated[:n_instances])]
+
+    cases = {}
+    scaled_params = get_scaled_parameters([problem for _, problem, _ in instances], scale) if scale is not None else None
+    if scaled_params is not None:
+        # scaled-up instances can be expensive to create, so this runs in a worker with a timeout
+        try:
+            scaled, scaled_solution = get_checker_pool().run(make_instance, problem_class, scaled_params, timeout=timeout)
+        except Exception as e:
+            cases["scaled"] = {"params": scaled_params, "error": f"Could not create instance: {type(e).__name__}: {e}"}
+        else:
+            if scaled_solution is not None:
+                instances.append(("scaled", scaled, scaled_solution))
+            else:
+                cases["scaled"] = {"params": scaled_params, "skipped": "no solution"}
+    else:
+        cases["scaled"] = {"skipped": "no integer parameters"}
+
+    for case_name, problem, solution in instances:
+        params = problem.to_json()["param_values"]
+        if solution is None:
+            try:
+                solution = get_checker_pool().run(get_solution, problem, timeout=timeout)
+            except Exception as e:
+                cases[case_name] = {"params": params, "error": f"Could not get solution: {type(e).__name__}: {e}"}
+                continue
+            if solution is None:
+                cases[case_name] = {"params": params, "skipped": "no solution"}
+                continue
+        cases[case_name] = {"params": params, **_run_case(problem, solution, n_repeats, timeout)}
+
+    bad_answer = get_bad_answer(original_solution)
+    if bad_answer is not None:
+        cases["bad"] = {"params": original.to_json()["param_values"], **_run_case(original, bad_answer, n_repeats, timeout)}
+    else:
+        cases["bad"] = {"skipped": "no bad answer for this solution type"}
+    return cases
+
+def benchmark_checkers(problem_classes: list[type[Problem]], **kwargs) -> dict:
+    """Runs benchmark_problem (with kwargs) for each problem, returns the results in the baseline format."""
+    results = {}
+    for problem_class in problem_classes:
+        name = problem_class.config.name
+        ts_start = time.perf_counter()
+        try:
+            results[name] = benchmark_problem(problem_class, **kwargs)
+        except Exception as e:
+            logger.warning(f"Could not benchmark {name}: {e}")
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+        logger.info(f"Benchmarked {name} in {time.perf_counter() - ts_start:.2f}s")
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            **kwargs,
+        },
+        "problems": results,
+    }
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.2, min_time: float = DEFAULT_MIN_TIME) -> list[dict]:
+    """
+    Compares two benchmark results case by case.
+
+    Args:
+        baseline (dict): Results of benchmark_checkers, e.g. loaded from the saved baseline.
+        current (dict): Results of benchmark_checkers to compare.
+        threshold (float, optional): Relative slowdown of time_min above which a case is a regression. Defaults to 0.2.
+        min_time (float, optional): Cases faster than this (in both results) are never regressions. Defaults to 1ms.
+    Returns:
+        list[dict]: One entry per case present in both results with "problem_name", "case", "baseline", "current",
+                    "ratio" and "status" ("ok", "regression", "improvement", "verdict_changed" or "error"),
+                    sorted by ratio (descending).
+    """
+    comparison = []
+    for problem_name, current_cases in current["problems"].items():
+        baseline_cases = baseline["problems"].get(problem_name)
+        if baseline_cases is None:
+            continue
+        for case_name, current_case in current_cases.items():
+            baseline_case = baseline_cases.get(case_name) if isinstance(current_case, dict) else None
+            if not isinstance(baseline_case, dict) or "time_min" not in baseline_case:
+                continue
+            entry = {"problem_name": problem_name, "case": case_name, "baseline": baseline_case["time_min"],
+                     "current": current_case.get("time_min"), "ratio": None}
+            if entry["current"] is None:
+                entry["status"] = "error"
+            elif current_case.get("is_correct") != baseline_case.get("is_correct"):
+                entry["status"] = "verdict_changed"
+            else:
+                entry["ratio"] = entry["current"] / max(entry["baseline"], 1e-9)
+                if max(entry["current"], entry["baseline"]) < min_time:
+                    entry["status"] = "ok"
+                elif entry["ratio"] > 1 + threshold:
+                    entry["status"] = "regression"
+                elif entry["ratio"] < 1 / (1 + threshold):
+                    entry["status"] = "improvement"
+                else:
+                    entry["status"] = "ok"
+            comparison.append(entry)
+    return sorted(comparison, key=lambda entry: entry["ratio"] if entry["ratio"] is not None else float("inf"), reverse=True)
@@ -0,0 +1,237 @@
+import atexit
+import multiprocessing as mp
+import os
+import resource
+import sys
+import threading
+from loguru import logger
+
+# Workers are recycled after this many tasks or once their RSS exceeds this many MB
+DEFAULT_MAX_TASKS_PER_WORKER = 1000
+DEFAULT_MAX_RSS_MB = 2048
+
+class WorkerTimeoutError(TimeoutError):
+    pass
+
+class WorkerCrashedError(RuntimeError):
+    pass
+
+def get_default_num_workers() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+def get_rss_mb() -> float:
+    """Current resident set size of this process in MB (peak RSS if /proc is not available)."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 ** 2)
+    except (OSError, ValueError, IndexError):
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in KB on Linux
+        return max_rss / (1024 ** 2) if sys.platform == "darwin" else max_rss / 1024
+
+def reset_peak_rss() -> bool:
+    """Resets the peak RSS of this process (Linux only), so that get_peak_rss_mb measures what runs next."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def get_peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB since the last reset_peak_rss (since the start if not supported)."""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 ** 2) if sys.platform == "darwin" else max_rss / 1024
+
+def _worker_main(conn, max_tasks: int, max_rss_mb: float):
+    n_tasks = 0
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if task is None:
+            break
+        fn, args, kwargs = task
+        reset_peak_rss()
+        try:
+            payload = (True, fn(*args, **kwargs))
+        except BaseException as e:
+            payload = (False, e)
+        n_tasks += 1
+        rss_mb = get_rss_mb()
+        stats = {"rss_mb": rss_mb, "peak_rss_mb": get_peak_rss_mb()}
+        retire = n_tasks >= max_tasks or (max_rss_mb is not None and rss_mb > max_rss_mb)
+        try:
+            conn.send((payload, stats, retire))
+        except Exception as e:
+            # result or exception could not be pickled
+            conn.send(((False, RuntimeError(f"Could not send result from checker worker: {e}")), stats, retire))
+        if retire:
+            break
+    conn.close()
+
+class _Worker:
+    def __init__(self, ctx, max_tasks: int, max_rss_mb: float):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, max_tasks, max_rss_mb), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self, timeout: float = 5):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        self.kill()
+
+class CheckerPool:
+    """
+    Long-lived pool of worker processes used to run checkers with a timeout.
+
+    Each worker runs one task at a time. A worker that exceeds the timeout of its task
+    is killed and lazily replaced, and workers retire themselves after `max_tasks_per_worker`
+    tasks or once their RSS exceeds `max_rss_mb`. The pool is thread-safe: several threads
+    can run tasks concurrently, each of them occupying one worker.
+    """
+
+    def __init__(self, max_workers: int = None,
+                 max_tasks_per_worker: int = DEFAULT_MAX_TASKS_PER_WORKER,
+                 max_rss_mb: float = DEFAULT_MAX_RSS_MB):
+        self.max_workers = max_workers if max_workers is not None else get_default_num_workers()
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_rss_mb = max_rss_mb
+        # forkserver forks workers from a clean single-threaded server, which is safe when
+        # tasks are submitted from several threads
+        if "forkserver" in mp.get_all_start_methods():
+            self.ctx = mp.get_context("forkserver")
+            self.ctx.set_forkserver_preload(["math_construct.problems"])
+        else:
+            self.ctx = mp.get_context("spawn")
+        self.idle_workers = []
+        self.n_workers = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def _acquire(self) -> _Worker:
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise RuntimeError("Checker pool is shut down.")
+                if len(self.idle_workers) > 0:
+                    return self.idle_workers.pop()
+                if self.n_workers < self.max_workers:
+                    self.n_workers += 1
+                    break
+                self.condition.wait()
+        try:
+            return _Worker(self.ctx, self.max_tasks_per_worker, self.max_rss_mb)
+        except BaseException:
+            self._discard(None)
+            raise
+
+    def _release(self, worker: _Worker):
+        with self.condition:
+            if self.closed:
+                worker.stop()
+                self.n_workers -= 1
+            else:
+                self.idle_workers.append(worker)
+            self.condition.notify()
+
+    def _discard(self, worker: _Worker):
+        if worker is not None:
+            worker.kill()
+        with self.condition:
+            self.n_workers -= 1
+            self.condition.notify()
+
+    def run(self, fn, *args, timeout: float = None, **kwargs):
+        """
+        Runs fn(*args, **kwargs) in a worker process and returns its result.
+        Exceptions raised by fn are re-raised in the caller.
+
+        Raises:
+            WorkerTimeoutError: If the task did not finish within `timeout` seconds, the worker is killed.
+            WorkerCrashedError: If the worker died while running the task (e.g. out of memory).
+        """
+        return self.run_with_stats(fn, *args, timeout=timeout, **kwargs)[0]
+
+    def run_with_stats(self, fn, *args, timeout: float = None, **kwargs) -> tuple:
+        """
+        Same as run, but returns (result, stats) where stats holds the RSS of the worker after the task
+        and its peak RSS during the task ("rss_mb", "peak_rss_mb").
+        """
+        worker = self._acquire()
+        try:
+            worker.conn.send((fn, args, kwargs))
+        except BaseException:
+            # e.g. the task could not be pickled, nothing was sent so the worker is still usable
+            self._release(worker)
+            raise
+        try:
+            finished = worker.conn.poll(timeout)
+            if finished:
+                (success, result), stats, retire = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            self._discard(worker)
+            raise WorkerCrashedError(f"Checker worker died while running the task: {e}")
+        if not finished:
+            self._discard(worker)
+            raise WorkerTimeoutError(f"Task did not complete within {timeout} seconds.")
+        if retire:
+            logger.debug(f"Recycling checker worker (RSS {stats['rss_mb']:.1f} MB)")
+            worker.process.join(1)
+            self._discard(worker)
+        else:
+            self._release(worker)
+        if not success:
+            raise result
+        return result, stats
+
+    def shutdown(self):
+        with self.condition:
+            self.closed = True
+            idle_workers, self.idle_workers = self.idle_workers, []
+            self.n_workers -= len(idle_workers)
+            self.condition.notify_all()
+        for worker in idle_workers:
+            worker.stop()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_checker_pool(**kwargs) -> CheckerPool:
+    """Returns the process-wide checker pool, creating it with the given arguments on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.closed:
+            _pool = CheckerPool(**kwargs)
+        return _pool
+
+def shutdown_checker_pool():
+    """Stops all checker workers, safe to call multiple times."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+atexit.register(shutdown_checker_pool)
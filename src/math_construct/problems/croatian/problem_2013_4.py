@@ -35,7 +35,7 @@ class Problem_HMO_2013_4(Problem):
         parameters=["k"],
         source="HMO 2013 4",
         original_parameters={"k": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         problem_url="https://natjecanja.math.hr/wp-content/uploads/2015/02/2013_HMO_rjesenja.pdf#page=14", # page 14
         solution_url="https://natjecanja.math.hr/wp-content/uploads/2015/02/2013_HMO_rjesenja.pdf#page=14", # page 14
         tags=[Tag.NUMBER_THEORY, Tag.FIND_INF, Tag.IS_SIMPLIFIED],
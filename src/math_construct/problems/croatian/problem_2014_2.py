@@ -44,7 +44,7 @@ class Problem_HMO_2014_2(Problem):
         parameters=["M", "N"],
         source="HMO 2014 2",
         original_parameters={"M": 4, "N": 9},
-        original_solution=get_solution(4, 9),
+        original_solution=lambda: get_solution(4, 9),
         problem_url="https://natjecanja.math.hr/wp-content/uploads/2015/02/HMO2014_rjesenja.pdf#page=2", # page 2
         solution_url="https://natjecanja.math.hr/wp-content/uploads/2015/02/HMO2014_rjesenja.pdf#page=2", # page 2
         tags=[Tag.COMBINATORICS, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED],
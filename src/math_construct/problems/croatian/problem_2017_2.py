@@ -47,7 +47,7 @@ class Problem_HMO_2017_2(Problem):
         parameters=["n"],
         source="HMO 2017 2",
         original_parameters={"n": 20},
-        original_solution=get_solution(20),
+        original_solution=lambda: get_solution(20),
         problem_url="https://natjecanja.math.hr/wp-content/uploads/2015/02/HMO2017-rje.pdf#page=19", # page 19
         solution_url="https://natjecanja.math.hr/wp-content/uploads/2015/02/HMO2017-rje.pdf#page=19", # page 19
         tags=[Tag.COMBINATORICS, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED],
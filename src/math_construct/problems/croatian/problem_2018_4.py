@@ -28,7 +28,7 @@ class Problem_HMO_2018_4(Problem):
         parameters=["n"],
         source="HMO 2018 4",
         original_parameters={"n": 6},
-        original_solution=get_solution(6),
+        original_solution=lambda: get_solution(6),
         problem_url="https://natjecanja.math.hr/wp-content/uploads/2019/03/HMO2018-rje.pdf#page=16", # page 16
         solution_url="https://natjecanja.math.hr/wp-content/uploads/2019/03/HMO2018-rje.pdf#page=16", # page 16
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_SIMPLIFIED],
@@ -33,7 +33,7 @@ class Problem_HMO_2020_4(Problem):
         parameters=["n"],
         source="HMO 2020 4",
         original_parameters={"n": 8},
-        original_solution=get_solution(8),
+        original_solution=lambda: get_solution(8),
         problem_url="https://natjecanja.math.hr/wp-content/uploads/2021/01/HMO2020-rje.pdf#page=3", # page 3
         solution_url="https://natjecanja.math.hr/wp-content/uploads/2021/01/HMO2020-rje.pdf#page=3", # page 3
         tags=[Tag.NUMBER_THEORY, Tag.FIND_INF, Tag.IS_SIMPLIFIED],
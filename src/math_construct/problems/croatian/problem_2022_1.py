@@ -24,7 +24,7 @@ class Problem_HMO_2022_1(Problem):
         parameters=["n"],
         source="HMO 2022 1",
         original_parameters={"n": 20},
-        original_solution=get_solution(20),
+        original_solution=lambda: get_solution(20),
         problem_url="https://natjecanja.math.hr/wp-content/uploads/2023/05/2022_HMO.pdf#page=1", # page 1
         solution_url="https://natjecanja.math.hr/wp-content/uploads/2023/05/2022_HMO.pdf#page=1", # page 1
         tags=[Tag.NUMBER_THEORY, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED],
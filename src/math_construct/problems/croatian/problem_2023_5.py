@@ -52,7 +52,7 @@ class Problem_HMO_2023_5(Problem):
         parameters=["k", "l", "n"],
         source="HMO 2023 5",
         original_parameters={"k": 4, "l": 5, "n": 10},
-        original_solution=get_solution(4, 5, 10),
+        original_solution=lambda: get_solution(4, 5, 10),
         problem_url="https://natjecanja.math.hr/wp-content/uploads/2024/01/2023_HMO-5.pdf#page=21",
         solution_url="https://natjecanja.math.hr/wp-content/uploads/2024/01/2023_HMO-5.pdf#page=21",
         tags=[Tag.COMBINATORICS, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED],
@@ -32,8 +32,9 @@ class ProblemDutch20104(Problem):
         problem_url="https://wiskundeolympiade.nl/files/opgaven/finale/2010/opgaven_en.pdf",
         solution_url="https://wiskundeolympiade.nl/files/opgaven/finale/2010/uitwerkingen_en.pdf",
         original_parameters={"m": 1000, "k": 10},
-        original_solution=get_solution(1000, 10),
-        tags=[Tag.IS_GENERALIZED, Tag.NUMBER_THEORY, Tag.FIND_ALL]
+        original_solution=lambda: get_solution(1000, 10),
+        tags=[Tag.IS_GENERALIZED, Tag.NUMBER_THEORY, Tag.FIND_ALL],
+        answer_format={"expected_length": "k", "is_unique": True, "min_val_inclusive": 0, "max_val_inclusive": 1},
     )
     k: int
     m: int
@@ -49,7 +50,7 @@ class ProblemDutch20104(Problem):
         return abs(x - round(x)) < 1e-8
 
     def check(self, a: list[list[Fraction]]) -> bool:
-        checker_format = self.check_format(a, expected_length=self.k, is_unique=True, min_val_inclusive=0, max_val_inclusive=1)
+        checker_format = self.check_format(a, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         solutions = list(set([tuple(x) for x in a]))
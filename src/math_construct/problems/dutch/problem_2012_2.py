@@ -27,8 +27,9 @@ class ProblemDutch20122(Problem):
         problem_url="https://wiskundeolympiade.nl/files/opgaven/finale/2012/opgaven_en.pdf",
         solution_url="https://wiskundeolympiade.nl/files/opgaven/finale/2012/uitwerkingen_en.pdf",
         original_parameters={"n": 5},
-        original_solution=get_solution(5),
-        tags=[Tag.IS_ORIGINAL, Tag.COMBINATORICS, Tag.FIND_ANY, Tag.IS_GENERALIZED]
+        original_solution=lambda: get_solution(5),
+        tags=[Tag.IS_ORIGINAL, Tag.COMBINATORICS, Tag.FIND_ANY, Tag.IS_GENERALIZED],
+        answer_format={"is_integer": True, "expected_length": "n", "is_square_matrix": True, "min_val_inclusive": 1, "max_val_inclusive": "n"},
     )
     n: int
 
@@ -39,7 +40,7 @@ class ProblemDutch20122(Problem):
         return PROBLEM_TEMPLATE.format(n=self.n)
 
     def check(self, a: list[list[int]]) -> bool:
-        check_format = self.check_format(a, is_integer=True, expected_length=self.n, is_square_matrix=True, min_val_inclusive=1, max_val_inclusive=self.n)
+        check_format = self.check_format(a, **self.get_answer_format())
         if not check_format[0]:
             return check_format
         # check validity matrix
@@ -29,8 +29,9 @@ class ProblemDutch20181(Problem):
         problem_url="https://wiskundeolympiade.nl/phocadownload/opgaven/finale/2018/ProblemsKlas6.pdf",
         solution_url="https://wiskundeolympiade.nl/phocadownload/opgaven/finale/2018/Solutions.pdf",
         original_parameters={"n": 10, "k": 50},
-        original_solution=get_solution(10),
-        tags=[Tag.NUMBER_THEORY, Tag.FIND_ALL, Tag.IS_GENERALIZED, Tag.IS_ORIGINAL] 
+        original_solution=lambda: get_solution(10),
+        tags=[Tag.NUMBER_THEORY, Tag.FIND_ALL, Tag.IS_GENERALIZED, Tag.IS_ORIGINAL],
+        answer_format={"is_integer": True, "expected_length": "k", "is_unique": True},
     )
     n: int
     k: int
@@ -43,7 +44,7 @@ class ProblemDutch20181(Problem):
         return PROBLEM_TEMPLATE.format(n=self.n, k=self.k)
 
     def check(self, a: list[int]) -> bool:
-        checker_format = self.check_format(a, is_integer=True, expected_length=self.k, is_unique=True)
+        checker_format = self.check_format(a, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         all_solutions = get_solution(self.n)
@@ -27,7 +27,7 @@ class ProblemDutch20182(Problem):
         problem_url="https://wiskundeolympiade.nl/phocadownload/opgaven/finale/2018/ProblemsKlas6.pdf",
         solution_url="https://wiskundeolympiade.nl/phocadownload/opgaven/finale/2018/Solutions.pdf",
         original_parameters={"n": 15, "k": 4},
-        original_solution=get_solution(15),
+        original_solution=lambda: get_solution(15),
         tags=[Tag.IS_ORIGINAL, Tag.IS_GENERALIZED, Tag.FIND_ALL, Tag.NUMBER_THEORY] 
     )
     n: int
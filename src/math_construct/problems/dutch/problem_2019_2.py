@@ -31,7 +31,7 @@ class ProblemDutch20192(Problem):
         original_parameters={"k": 4, "n": 3},
         problem_url="https://wiskundeolympiade.nl/phocadownload/opgaven/finale/2019/ProblemsKlas6.pdf",
         solution_url="https://wiskundeolympiade.nl/phocadownload/opgaven/finale/2019/Solutions.pdf",
-        original_solution=get_solution(4),
+        original_solution=lambda: get_solution(4),
         tags=[Tag.IS_ORIGINAL, Tag.IS_GENERALIZED, Tag.COMBINATORICS, Tag.FIND_ALL]
     )
     k: int
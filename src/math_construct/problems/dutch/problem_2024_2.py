@@ -29,7 +29,7 @@ class ProblemDutch20242(Problem):
         problem_url="https://wiskundeolympiade.nl/phocadownload/opgaven/finale/2024/ProblemsKlas6.pdf",
         solution_url="https://wiskundeolympiade.nl/phocadownload/opgaven/finale/2024/Solutions.pdf",
         original_parameters={"m": 36},
-        original_solution=get_solution(36),
+        original_solution=lambda: get_solution(36),
         tags=[Tag.IS_SIMPLIFIED, Tag.COMBINATORICS, Tag.FIND_ANY] 
     )
     m: int
@@ -24,10 +24,11 @@ class ProblemEMC20161(Problem):
         parameters=["n"],
         source="EMC 2016 Juniors P1",
         original_parameters={"n": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         problem_url="https://emc.mnm.hr/wp-content/uploads/2016/12/EMC_2016_Seniors_ENG_Solutions.pdf",
         solution_url="https://emc.mnm.hr/wp-content/uploads/2016/12/EMC_2016_Seniors_ENG_Solutions.pdf",
-        tags=[Tag.IS_SIMPLIFIED, Tag.IS_GENERALIZED, Tag.NUMBER_THEORY, Tag.FIND_ANY] 
+        tags=[Tag.IS_SIMPLIFIED, Tag.IS_GENERALIZED, Tag.NUMBER_THEORY, Tag.FIND_ANY],
+        answer_format={"is_integer": True, "expected_length": "n", "min_val_inclusive": 1},
     )
     n: int
 
@@ -38,7 +39,7 @@ class ProblemEMC20161(Problem):
         return PROBLEM_TEMPLATE.format(n=self.n, nminusone=self.n-1, nminustwo=self.n-2)
 
     def check(self, x: list[int]) -> bool:
-        checker_format = self.check_format(x, is_integer=True, expected_length=self.n, min_val_inclusive=1)
+        checker_format = self.check_format(x, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         for i in range(self.n):
@@ -42,10 +42,11 @@ class ProblemEMC20163(Problem):
         parameters=["n"],
         source="EMC 2016 Juniors P3",
         original_parameters={"n": 20},
-        original_solution=get_solution(20),
+        original_solution=lambda: get_solution(20),
         problem_url="https://emc.mnm.hr/wp-content/uploads/2016/12/EMC_2016_Juniors_ENG_Solutions.pdf",
         solution_url="https://emc.mnm.hr/wp-content/uploads/2016/12/EMC_2016_Juniors_ENG_Solutions.pdf",
-        tags=[Tag.IS_SIMPLIFIED, Tag.NUMBER_THEORY, Tag.FIND_ANY] 
+        tags=[Tag.IS_SIMPLIFIED, Tag.NUMBER_THEORY, Tag.FIND_ANY],
+        answer_format={"expected_length": "n", "is_unique": True},
     )
     n: int
 
@@ -56,7 +57,7 @@ class ProblemEMC20163(Problem):
         return PROBLEM_TEMPLATE.format(n=self.n)
 
     def check(self, x: list[Fraction]) -> bool:
-        checker_format = self.check_format(x, expected_length=self.n, is_unique=True)
+        checker_format = self.check_format(x, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         sum_of_squares = sum(f*f for f in x)
@@ -23,10 +23,11 @@ class ProblemEMC20211(Problem):
         parameters=["n"],
         source="EMC 2021 Seniors P1",
         original_parameters={"n": 20},
-        original_solution=get_solution(20),
+        original_solution=lambda: get_solution(20),
         problem_url="https://emc.mnm.hr/wp-content/uploads/2021/12/EMC_2021_Seniors_ENG_Solutions-1.pdf",
         solution_url="https://emc.mnm.hr/wp-content/uploads/2021/12/EMC_2021_Seniors_ENG_Solutions-1.pdf",
-        tags=[Tag.IS_GENERALIZED, Tag.GEOMETRY, Tag.FIND_ANY] 
+        tags=[Tag.IS_GENERALIZED, Tag.GEOMETRY, Tag.FIND_ANY],
+        answer_format={"expected_length": "n"},
     )
     n: int
 
@@ -37,7 +38,7 @@ class ProblemEMC20211(Problem):
         return PROBLEM_TEMPLATE.format(n=self.n, d=self.n - 3)
 
     def check(self, x: list[list[float]]) -> bool:
-        checker_format = self.check_format(x, expected_length=self.n)
+        checker_format = self.check_format(x, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         
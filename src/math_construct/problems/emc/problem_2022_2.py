@@ -27,10 +27,11 @@ class ProblemEMC20222(Problem):
         parameters=["n"],
         source="EMC 2022 Seniors P2",
         original_parameters={"n": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         problem_url="https://emc.mnm.hr/wp-content/uploads/2022/12/EMC_2022_Seniors_ENG_Solutions.pdf",
         solution_url="https://emc.mnm.hr/wp-content/uploads/2022/12/EMC_2022_Seniors_ENG_Solutions.pdf",
-        tags=[Tag.IS_SIMPLIFIED, Tag.NUMBER_THEORY, Tag.FIND_INF] 
+        tags=[Tag.IS_SIMPLIFIED, Tag.NUMBER_THEORY, Tag.FIND_INF],
+        answer_format={"expected_length": "n", "is_unique": True, "is_integer": True},
     )
     n: int
 
@@ -41,7 +42,7 @@ class ProblemEMC20222(Problem):
         return PROBLEM_TEMPLATE.format(n=self.n)
 
     def check(self, x: list[list[int]]) -> bool:
-        checker_format = self.check_format(x, expected_length=self.n, is_unique=True, is_integer=True)
+        checker_format = self.check_format(x, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         for seq in x:
@@ -32,10 +32,11 @@ class ProblemEMC20232(Problem):
         parameters=["n"],
         source="EMC 2023 Juniors P2",
         original_parameters={"n": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         problem_url="https://emc.mnm.hr/wp-content/uploads/2023/12/EMC_2023_Juniors_ENG_Solutions.pdf",
         solution_url="https://emc.mnm.hr/wp-content/uploads/2023/12/EMC_2023_Juniors_ENG_Solutions.pdf",
-        tags=[Tag.IS_SIMPLIFIED, Tag.GEOMETRY, Tag.FIND_ANY] 
+        tags=[Tag.IS_SIMPLIFIED, Tag.GEOMETRY, Tag.FIND_ANY],
+        answer_format={"is_matrix": True, "expected_length": "n"},
     )
     n: int
 
@@ -46,7 +47,7 @@ class ProblemEMC20232(Problem):
         return PROBLEM_TEMPLATE.format(n=self.n)
 
     def check(self, x: list[list[int]]) -> bool:
-        checker_format = self.check_format(x, is_matrix=True, expected_length=self.n)
+        checker_format = self.check_format(x, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
 
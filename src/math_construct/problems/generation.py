@@ -0,0 +1,56 @@
+import multiprocessing as mp
+import random
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Optional
+import numpy as np
+from math_construct.problems.problem import Problem
+
+@contextmanager
+def seeded_global_rngs(seed: int):
+    """
+    Seeds the global random and np.random generators, which the generate() methods of the problems draw from, and
+    restores their previous state afterwards, so that the caller's random state is left as it was.
+    """
+    random_state, np_random_state = random.getstate(), np.random.get_state()
+    random.seed(seed)
+    np.random.seed(seed)
+    try:
+        yield
+    finally:
+        random.setstate(random_state)
+        np.random.set_state(np_random_state)
+
+def _generate_variations(problem_class: type[Problem], n_variations: int, n_try_variations: Optional[int]) -> list[Problem]:
+    # Seeded per problem so that the variations do not depend on the order (or process) they are generated in
+    with seeded_global_rngs(zlib.crc32(problem_class.config.name.encode())):
+        if n_try_variations is None:
+            return problem_class.generate_multiple(n_variations)
+        return problem_class.generate_multiple_explicit(n_try_variations)
+
+def generate_variations(problem_classes: list[type[Problem]], n_variations: int, n_try_variations: Optional[int] = None,
+                        n_workers: int = 1) -> list[list[Problem]]:
+    """
+    Generates the variations of several problems, optionally in parallel worker processes.
+
+    Args:
+        problem_classes (list[type[Problem]]): The problems to generate variations for.
+        n_variations (int): Number of variations per problem, passed to generate_multiple.
+        n_try_variations (int, optional): If set, generate_multiple_explicit(n_try_variations) is used instead,
+                                          the variations are then meant to be filtered afterwards.
+        n_workers (int, optional): Number of worker processes. Defaults to 1, which generates in this process.
+    Returns:
+        list[list[Problem]]: The variations of each problem, in the order of problem_classes. The result is the same
+                             for any number of workers.
+    """
+    if n_workers <= 1 or len(problem_classes) <= 1:
+        return [_generate_variations(problem_class, n_variations, n_try_variations) for problem_class in problem_classes]
+    ctx = mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+    n_workers = min(n_workers, len(problem_classes))
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=ctx) as executor:
+        futures = [
+            executor.submit(_generate_variations, problem_class, n_variations, n_try_variations)
+            for problem_class in problem_classes
+        ]
+        return [future.result() for future in futures]
@@ -23,7 +23,7 @@ class Problem_IMC_2012_2(Problem):
         parameters=["n"],
         source="IMC 2012 P2",
         original_parameters={"n": 7},
-        original_solution=get_solution(7),
+        original_solution=lambda: get_solution(7),
         problem_url="https://www.imc-math.org.uk/imc2012/IMC2012-day1-questions.pdf",
         solution_url="https://www.imc-math.org.uk/imc2012/IMC2012-day1-solutions.pdf",
         tags=[Tag.ALGEBRA, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED],
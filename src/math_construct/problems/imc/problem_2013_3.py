@@ -60,7 +60,7 @@ class Problem_IMC_2013_3(Problem):
         parameters=["n"],
         source="IMC 2013 P3",
         original_parameters={"n": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         problem_url="https://www.imc-math.org.uk/imc2013/IMC2013-day1-solutions.pdf",
         solution_url="https://www.imc-math.org.uk/imc2013/IMC2013-day1-solutions.pdf",
         tags=[Tag.COMBINATORICS, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED],
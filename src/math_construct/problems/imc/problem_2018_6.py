@@ -23,7 +23,7 @@ class Problem_IMC_2018_6(Problem):
         parameters=["n", "k"],
         source="IMC 2018 P6",
         original_parameters={"n": 6, "k": 10},
-        original_solution=get_solution(6, 10),
+        original_solution=lambda: get_solution(6, 10),
         problem_url="https://www.imc-math.org.uk/imc2018/imc2018-day2-solutions.pdf#page=1",
         solution_url="https://www.imc-math.org.uk/imc2018/imc2018-day2-solutions.pdf#page=1",
         tags=[Tag.ALGEBRA, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED],
@@ -40,7 +40,7 @@ class Problem_IMC_2019_9(Problem):
         parameters=["n"],
         source="IMC 2019 P9",
         original_parameters={"n": 4},
-        original_solution=get_solution(4),
+        original_solution=lambda: get_solution(4),
         problem_url="https://www.imc-math.org.uk/imc2019/imc2019-day2-solutions.pdf#page=2",
         solution_url="https://www.imc-math.org.uk/imc2019/imc2019-day2-solutions.pdf#page=2",
         tags=[Tag.ALGEBRA, Tag.IS_SIMPLIFIED, Tag.FIND_ANY],
@@ -26,7 +26,7 @@ class Problem2000C4(Problem):
         parameters=["n", "k"],
         source="IMO 2000 Shortlist C4",
         original_parameters={"n": 10, "k": 5},
-        original_solution=get_solution(10, 5),
+        original_solution=lambda: get_solution(10, 5),
         tags=[Tag.COMBINATORICS, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED],
         problem_url="https://prase.cz/kalva/short/soln/sh00c4.html",
         solution_url="https://prase.cz/kalva/short/soln/sh00c4.html",
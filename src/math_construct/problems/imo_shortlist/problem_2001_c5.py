@@ -23,7 +23,7 @@ class Problem17(Problem):
         parameters=["k"],
         source="IMO 2001 Shortlist C5",
         original_parameters={"k": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         tags=[Tag.COMBINATORICS, Tag.IS_SIMPLIFIED, Tag.FIND_ALL], 
         problem_url="https://olympiads.win.tue.nl/imo/imo2001/imo2001-shortlist.pdf#page=31",
         solution_url="https://olympiads.win.tue.nl/imo/imo2001/imo2001-shortlist.pdf#page=31",
@@ -29,7 +29,7 @@ class Problem18(Problem):
         parameters=["n"],
         source="IMO 2001 Shortlist C6",
         original_parameters={"n": 4},
-        original_solution=get_solution(4),
+        original_solution=lambda: get_solution(4),
         tags=[Tag.COMBINATORICS, Tag.IS_SIMPLIFIED, Tag.FIND_ANY],
         problem_url="https://olympiads.win.tue.nl/imo/imo2001/imo2001-shortlist.pdf#page=33",
         solution_url="https://olympiads.win.tue.nl/imo/imo2001/imo2001-shortlist.pdf#page=33",
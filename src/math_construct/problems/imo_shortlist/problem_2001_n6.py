@@ -36,7 +36,7 @@ class Problem20(Problem):
         parameters=["p", "n"],
         source="IMO 2001 Shortlist N6",
         original_parameters={"p": 100, "n": 25000},
-        original_solution=get_solution(100, 25000),
+        original_solution=lambda: get_solution(100, 25000),
         tags=[Tag.NUMBER_THEORY, Tag.IS_ORIGINAL, Tag.FIND_ANY, Tag.IS_GENERALIZED],
         problem_url="https://olympiads.win.tue.nl/imo/imo2001/imo2001-shortlist.pdf#page=70",
         solution_url="https://olympiads.win.tue.nl/imo/imo2001/imo2001-shortlist.pdf#page=70",
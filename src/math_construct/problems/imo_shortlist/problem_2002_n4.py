@@ -25,7 +25,7 @@ class Problem19(Problem):
         parameters=["k"],
         source="IMO 2002 Shortlist N4",
         original_parameters={"k": 15},
-        original_solution=get_solution(15),
+        original_solution=lambda: get_solution(15),
         tags=[Tag.NUMBER_THEORY, Tag.FIND_INF, Tag.IS_SIMPLIFIED],
         problem_url="https://anhngq.wordpress.com/wp-content/uploads/2010/07/imo-2002-shortlist.pdf#page=6",
         solution_url="https://anhngq.wordpress.com/wp-content/uploads/2010/07/imo-2002-shortlist.pdf#page=6",
@@ -23,7 +23,7 @@ class Problem2003N2(Problem):
         parameters=["k"],
         source="IMO 2003 Shortlist N2",
         original_parameters={"k": 15},
-        original_solution=get_solution(15),
+        original_solution=lambda: get_solution(15),
         problem_url="https://anhngq.wordpress.com/wp-content/uploads/2010/07/imo-2003-shortlist.pdf#page=60",
         solution_url="https://anhngq.wordpress.com/wp-content/uploads/2010/07/imo-2003-shortlist.pdf#page=60",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ALL, Tag.IS_SIMPLIFIED]
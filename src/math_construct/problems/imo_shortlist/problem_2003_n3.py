@@ -27,7 +27,7 @@ class Problem2003N3(Problem):
         problem_url="https://anhngq.wordpress.com/wp-content/uploads/2010/07/imo-2003-shortlist.pdf#page=62",
         solution_url="https://anhngq.wordpress.com/wp-content/uploads/2010/07/imo-2003-shortlist.pdf#page=62",
         original_parameters={"k": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ALL, Tag.IS_SIMPLIFIED] 
     )
     k: int
@@ -31,7 +31,7 @@ class Problem2005C8(Problem):
         parameters=["n"],
         source="IMO 2005 Shortlist C8",
         original_parameters={"n": 15},
-        original_solution=get_solution(15),
+        original_solution=lambda: get_solution(15),
         problem_url="https://www.imomath.com/imocomp/sl05_0707.pdf#page=5",
         solution_url="https://www.imomath.com/imocomp/sl05_0707.pdf#page=13",
         tags=[Tag.COMBINATORICS, Tag.FIND_ALL, Tag.IS_SIMPLIFIED] 
@@ -35,7 +35,7 @@ class Problem2006C5(Problem):
         parameters=["n", "k"],
         source="IMO 2006 Shortlist C5",
         original_parameters={"n": 24, "k": 5},
-        original_solution=get_solution(24, 5),
+        original_solution=lambda: get_solution(24, 5),
         problem_url="https://www.imo-official.org/problems/IMO2006SL.pdf#page=28",
         solution_url="https://www.imo-official.org/problems/IMO2006SL.pdf#page=28",
         tags=[Tag.COMBINATORICS, Tag.FIND_ALL, Tag.IS_SIMPLIFIED] 
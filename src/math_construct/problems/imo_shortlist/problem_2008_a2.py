@@ -29,7 +29,7 @@ class Problem2008A2(Problem):
         parameters=["n"],
         source="IMO 2008 Shortlist A2",
         original_parameters={"n": 20},
-        original_solution=get_solution(20),
+        original_solution=lambda: get_solution(20),
         problem_url="https://www.imo-official.org/problems/IMO2008SL.pdf#page=10",
         solution_url="https://www.imo-official.org/problems/IMO2008SL.pdf#page=10",
         tags=[Tag.ALGEBRA, Tag.FIND_INF, Tag.IS_SIMPLIFIED] 
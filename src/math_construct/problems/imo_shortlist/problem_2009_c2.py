@@ -36,7 +36,7 @@ class Problem2009C2(Problem):
         parameters=["n", "N"],
         source="IMO 2009 Shortlist C2",
         original_parameters={"n": 30, "N": 21},
-        original_solution=get_solution(30, 21),
+        original_solution=lambda: get_solution(30, 21),
         problem_url="https://www.imo-official.org/problems/IMO2009SL.pdf#page=29",
         solution_url="https://www.imo-official.org/problems/IMO2009SL.pdf#page=29",
         tags=[Tag.COMBINATORICS, Tag.FIND_INF, Tag.IS_SIMPLIFIED]
@@ -32,7 +32,7 @@ class Problem2010N1(Problem):
         problem_url="https://www.imo-official.org/problems/IMO2010SL.pdf#page=65",
         solution_url="https://www.imo-official.org/problems/IMO2010SL.pdf#page=65",
         original_parameters={"k": 42},
-        original_solution=get_solution(42),
+        original_solution=lambda: get_solution(42),
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_ORIGINAL]
     )
     k: int
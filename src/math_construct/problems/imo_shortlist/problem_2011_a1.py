@@ -30,7 +30,7 @@ class Problem2011A1(Problem):
         parameters=["n"],
         source="IMO 2011 Shortlist A1",
         original_parameters={"n": 21},
-        original_solution=get_solution(21),
+        original_solution=lambda: get_solution(21),
         problem_url="https://www.imo-official.org/problems/IMO2011SL.pdf#page=13",
         solution_url="https://www.imo-official.org/problems/IMO2011SL.pdf#page=13",
         tags=[Tag.ALGEBRA, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED]
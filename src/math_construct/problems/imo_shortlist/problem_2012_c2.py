@@ -36,7 +36,7 @@ class Problem2012C2(Problem):
         parameters=["n", "m"],
         source="IMO 2012 Shortlist C2",
         original_parameters={"n": 70, "m": 27},
-        original_solution=get_solution(70, 27),
+        original_solution=lambda: get_solution(70, 27),
         problem_url="https://www.imo-official.org/problems/IMO2012SL.pdf#page=20",
         solution_url="https://www.imo-official.org/problems/IMO2012SL.pdf#page=20",
         tags=[Tag.COMBINATORICS, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED]
@@ -45,7 +45,7 @@ class Problem2014C3(Problem):
         parameters=["n", "k"],
         source="IMO 2014 Shortlist C3",
         original_parameters={"n": 22, "k": 5},
-        original_solution=get_solution(22, 5),
+        original_solution=lambda: get_solution(22, 5),
         problem_url="https://www.imo-official.org/problems/IMO2014SL.pdf#page=31",
         solution_url="https://www.imo-official.org/problems/IMO2014SL.pdf#page=31",
         tags=[Tag.COMBINATORICS, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED]
@@ -28,7 +28,7 @@ class Problem2014N2(Problem):
         parameters=["n"],
         source="IMO 2014 Shortlist N2",
         original_parameters={"n": 25},
-        original_solution=get_solution(25),
+        original_solution=lambda: get_solution(25),
         problem_url="https://www.imo-official.org/problems/IMO2014SL.pdf#page=72",
         solution_url="https://www.imo-official.org/problems/IMO2014SL.pdf#page=72",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ALL, Tag.IS_SIMPLIFIED] 
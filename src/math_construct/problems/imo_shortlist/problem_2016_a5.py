@@ -26,7 +26,7 @@ class Problem2016A5(Problem):
         parameters=["n"],
         source="IMO 2016 Shortlist A5",
         original_parameters={"n": 10 ** 19},
-        original_solution=get_solution(10 ** 19),
+        original_solution=lambda: get_solution(10 ** 19),
         tags=[Tag.ALGEBRA, Tag.IS_SIMPLIFIED, Tag.FIND_ANY],
         problem_url="https://www.imo-official.org/problems/IMO2016SL.pdf#page=22",
         solution_url="https://www.imo-official.org/problems/IMO2016SL.pdf#page=22",
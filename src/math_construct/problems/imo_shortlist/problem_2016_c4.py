@@ -26,7 +26,7 @@ class Problem2016C4(Problem):
         parameters=["n"],
         source="IMO 2016 Shortlist C4",
         original_parameters={"n": 9},
-        original_solution=get_solution(9),
+        original_solution=lambda: get_solution(9),
         problem_url="https://www.imo-official.org/problems/IMO2016SL.pdf#page=37",
         solution_url="https://www.imo-official.org/problems/IMO2016SL.pdf#page=37",
         tags=[Tag.COMBINATORICS, Tag.IS_SIMPLIFIED, Tag.FIND_ANY],
@@ -20,7 +20,7 @@ class Problem2017N3(Problem):
         parameters=["n"],
         source="IMO 2017 Shortlist N3",
         original_parameters={"n": 30},
-        original_solution=get_solution(30),
+        original_solution=lambda: get_solution(30),
         problem_url="https://www.imo-official.org/problems/IMO2017SL.pdf#page=79",
         solution_url="https://www.imo-official.org/problems/IMO2017SL.pdf#page=79",
         tags=[Tag.NUMBER_THEORY, Tag.IS_SIMPLIFIED, Tag.FIND_ANY],
@@ -35,7 +35,7 @@ class Problem2017N6(Problem):
         parameters=["n"],
         source="IMO 2017 Shortlist N6",
         original_parameters={"n": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         problem_url="https://www.imo-official.org/problems/IMO2017SL.pdf#page=84",
         solution_url="https://www.imo-official.org/problems/IMO2017SL.pdf#page=84",
         tags=[Tag.NUMBER_THEORY, Tag.IS_SIMPLIFIED, Tag.FIND_INF]
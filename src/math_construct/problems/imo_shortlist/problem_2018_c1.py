@@ -24,7 +24,7 @@ class Problem_IMOShortlist2018C1(Problem):
         parameters=["n"],
         source="IMO Shortlist 2018 C1",
         original_parameters={"n": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         problem_url="https://www.imo-official.org/problems/IMO2018SL.pdf#page=26",
         solution_url="https://www.imo-official.org/problems/IMO2018SL.pdf#page=26",
         tags=[Tag.COMBINATORICS, Tag.IS_SIMPLIFIED, Tag.FIND_ANY]
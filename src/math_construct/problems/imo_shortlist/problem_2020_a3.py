@@ -20,7 +20,7 @@ class Problem23(Problem):
         parameters=[],
         source="IMO Shortlist 2020 A3",
         original_parameters={},
-        original_solution=get_solution(),
+        original_solution=lambda: get_solution(),
         problem_url="https://www.imo-official.org/problems/IMO2020SL.pdf#page=20",
         solution_url="https://www.imo-official.org/problems/IMO2020SL.pdf#page=20",
         tags=[Tag.ALGEBRA, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED]
@@ -47,7 +47,7 @@ class Problem_IMOShortlist2020_N1(Problem):
         parameters=["k"],
         source="IMO Shortlist 2020 N1",
         original_parameters={"k": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         problem_url="https://www.imo-official.org/problems/IMO2020SL.pdf#page=72",
         solution_url="https://www.imo-official.org/problems/IMO2020SL.pdf#page=72",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_SIMPLIFIED]
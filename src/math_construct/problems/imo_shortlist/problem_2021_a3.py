@@ -29,7 +29,7 @@ class Problem2021A3(Problem):
         parameters=["n"],
         source="IMO Shortlist 2021 A3",
         original_parameters={"n": 30},
-        original_solution=get_solution(30),
+        original_solution=lambda: get_solution(30),
         problem_url="https://www.imo-official.org/problems/IMO2021SL.pdf#page=16",
         solution_url="https://www.imo-official.org/problems/IMO2021SL.pdf#page=16",
         tags=[Tag.NUMBER_THEORY, Tag.IS_SIMPLIFIED, Tag.FIND_MAX_MIN],
@@ -30,7 +30,7 @@ class Problem22(Problem):
         parameters=["n"],
         source="IMO Shortlist 2022 A5",
         original_parameters={"n": 4},
-        original_solution=get_solution(4),
+        original_solution=lambda: get_solution(4),
         problem_url="https://www.imo-official.org/problems/IMO2022SL.pdf#page=18",
         solution_url="https://www.imo-official.org/problems/IMO2022SL.pdf#page=18",
         tags=[Tag.ALGEBRA, Tag.IS_SIMPLIFIED, Tag.FIND_ALL] 
@@ -23,7 +23,7 @@ class Problem2022C1(Problem):
         parameters=["n", "C"],
         source="IMO Shortlist 2022 C1",
         original_parameters={"n": 62, "C": 16},
-        original_solution=get_solution(62, 16),
+        original_solution=lambda: get_solution(62, 16),
         problem_url="https://www.imo-official.org/problems/IMO2022SL.pdf#page=26",
         solution_url="https://www.imo-official.org/problems/IMO2022SL.pdf#page=26",
         tags=[Tag.COMBINATORICS, Tag.IS_SIMPLIFIED, Tag.FIND_MAX_MIN],
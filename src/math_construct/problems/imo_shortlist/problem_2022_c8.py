@@ -74,7 +74,7 @@ class Problem2022C8(Problem):
         solution_url="https://artofproblemsolving.com/community/c6h2883218p25635163",
         source="IMO Shortlist 2022 C8",
         original_parameters={"n": 19},
-        original_solution=get_solution(19),
+        original_solution=lambda: get_solution(19),
         tags=[Tag.COMBINATORICS, Tag.IS_SIMPLIFIED, Tag.FIND_MAX_MIN],
     )
     n: int
@@ -34,7 +34,7 @@ class Problem2023A5(Problem):
         parameters=["n", "k"],
         source="IMO Shortlist 2023 A5",
         original_parameters={"n": 59, "k": 16},
-        original_solution=get_solution(59, 16),
+        original_solution=lambda: get_solution(59, 16),
         tags=[Tag.ALGEBRA, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED],
         problem_url="https://www.imo-official.org/problems/IMO2023SL.pdf#page=23",
         solution_url="https://www.imo-official.org/problems/IMO2023SL.pdf#page=23",
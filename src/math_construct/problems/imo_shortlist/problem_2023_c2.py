@@ -22,7 +22,7 @@ class Problem2023C2(Problem):
         parameters=["k"],
         source="IMO Shortlist 2023 C2",
         original_parameters={"k": 5},
-        original_solution=get_solution(5),
+        original_solution=lambda: get_solution(5),
         tags=[Tag.COMBINATORICS, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED],
         problem_url="https://www.imo-official.org/problems/IMO2023SL.pdf#page=38",
         solution_url="https://www.imo-official.org/problems/IMO2023SL.pdf#page=38",
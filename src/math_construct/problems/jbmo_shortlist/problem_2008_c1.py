@@ -21,7 +21,7 @@ class ProblemJBMO2008C1(Problem):
         parameters=["N"],
         source="2008 JBMO Shortlist C1",
         original_parameters={"N": 5},
-        original_solution=get_solution(5),
+        original_solution=lambda: get_solution(5),
         problem_url="https://artofproblemsolving.com/community/c6h1528878p9182667",
         solution_url="https://artofproblemsolving.com/community/c6h1528878p9182667",
         tags=[Tag.COMBINATORICS, Tag.IS_GENERALIZED, Tag.FIND_MAX_MIN]
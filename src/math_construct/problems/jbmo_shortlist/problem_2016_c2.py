@@ -19,7 +19,7 @@ class ProblemJBMO2016C2(Problem):
         parameters=[],
         source="2016 JBMO Shortlist C2",
         original_parameters={},
-        original_solution=get_solution(),
+        original_solution=lambda: get_solution(),
         problem_url="https://artofproblemsolving.com/community/c6h1528629p9180554",
         solution_url="https://artofproblemsolving.com/community/c6h1528629p9180554",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_MAX_MIN, Tag.IS_ORIGINAL]
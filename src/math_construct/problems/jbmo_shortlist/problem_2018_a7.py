@@ -27,7 +27,7 @@ class ProblemJBMO2018A7(Problem):
         parameters=['N'],
         source="2018 JBMO Shortlist A7",
         original_parameters={'N':2018},
-        original_solution=get_solution(2018),
+        original_solution=lambda: get_solution(2018),
         problem_url="https://artofproblemsolving.com/community/c6h1873162p12715048",
         solution_url="https://artofproblemsolving.com/community/c6h1873162p12715048",
         tags=[Tag.ALGEBRA, Tag.FIND_ANY, Tag.IS_ORIGINAL]
@@ -37,7 +37,7 @@ class ProblemJBMO2018N4(Problem):
         parameters=["N"],
         source="JBMO 2018 Shortlist N4",
         original_parameters={"N": 7},
-        original_solution=get_solution(7),
+        original_solution=lambda: get_solution(7),
         problem_url="https://artofproblemsolving.com/community/c6h1870447p12685788",
         solution_url="https://artofproblemsolving.com/community/c6h1870447p12685788",
         tags=[Tag.FIND_INF, Tag.IS_SIMPLIFIED, Tag.NUMBER_THEORY]
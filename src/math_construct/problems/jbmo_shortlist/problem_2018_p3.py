@@ -18,7 +18,7 @@ class ProblemJBMO2018A3(Problem):
         parameters=['n'],
         source="2018 JBMO Shortlist A4",
         original_parameters={'n':120},
-        original_solution=get_solution(120),
+        original_solution=lambda: get_solution(120),
         problem_url="https://artofproblemsolving.com/community/c6h1879852p12786500",
         solution_url="https://artofproblemsolving.com/community/c6h1879852p12786500",
         tags=[Tag.ALGEBRA, Tag.FIND_ANY, Tag.IS_GENERALIZED]
@@ -26,7 +26,7 @@ class ProblemJBMO2019C4(Problem):
         parameters=["N"],
         source="2019 JBMO Shortlist C4",
         original_parameters={"N": 50},
-        original_solution=get_solution(50),
+        original_solution=lambda: get_solution(50),
         problem_url="https://artofproblemsolving.com/community/c6h2268005p17622004",
         solution_url="https://artofproblemsolving.com/community/c6h2268005p17622004",
         tags=[Tag.COMBINATORICS, Tag.IS_GENERALIZED, Tag.FIND_MAX_MIN]
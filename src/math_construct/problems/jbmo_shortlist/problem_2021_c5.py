@@ -20,7 +20,7 @@ class ProblemJBMO2021C5(Problem):
         parameters=["a", "b", "N"],
         source="2021 JBMO Shortlist C6",
         original_parameters={"N": 15, "a":11, "b":7},
-        original_solution=get_solution(15, 11, 7),
+        original_solution=lambda: get_solution(15, 11, 7),
         problem_url="https://artofproblemsolving.com/community/c6h2876425p25559146",
         solution_url="https://artofproblemsolving.com/community/c6h2876425p25559146",
         tags=[Tag.COMBINATORICS, Tag.IS_GENERALIZED, Tag.FIND_ANY]
@@ -46,7 +46,7 @@ class ProblemJBMO2023C1(Problem):
         parameters=["N", "M"],
         source="2023 JBMO Shortlist C1",
         original_parameters={"N": 17, "M": 9},
-        original_solution=get_solution(9),
+        original_solution=lambda: get_solution(9),
         problem_url="https://artofproblemsolving.com/community/c6h3347813p31039678",
         solution_url="https://artofproblemsolving.com/community/c6h3347813p31039678",
         tags=[Tag.COMBINATORICS, Tag.FIND_ANY, Tag.IS_GENERALIZED]
@@ -30,7 +30,7 @@ class ProblemJBMO2023C5(Problem):
         parameters=["N"],
         source="2023 JBMO Shortlist C5",
         original_parameters={"N": 25},
-        original_solution=get_solution(25),
+        original_solution=lambda: get_solution(25),
         problem_url="https://artofproblemsolving.com/community/c6h3347819p31039710",
         solution_url="https://artofproblemsolving.com/community/c6h3347819p31039710",
         tags=[Tag.ALGEBRA, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED]
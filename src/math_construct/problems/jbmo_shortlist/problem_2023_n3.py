@@ -18,7 +18,7 @@ class ProblemJBMO2023N5(Problem):
         parameters=[],
         source="2023 JBMO Shortlist N5",
         original_parameters={},
-        original_solution=get_solution(),
+        original_solution=lambda: get_solution(),
         problem_url="https://artofproblemsolving.com/community/c6h3347830p31039822",
         solution_url="https://artofproblemsolving.com/community/c6h3347830p31039822",
         tags=[Tag.IS_ORIGINAL, Tag.NUMBER_THEORY, Tag.FIND_ANY]
@@ -32,8 +32,9 @@ class ProblemKonhauser20131(Problem):
         parameters=["a", "b"],
         source="Konhauser Problemfest 2015 P1",
         original_parameters={"a": 4, "b": 3},
-        original_solution=get_solution(4, 3),
-        tags=[Tag.GEOMETRY, Tag.IS_ORIGINAL, Tag.IS_GENERALIZED, Tag.FIND_ANY]
+        original_solution=lambda: get_solution(4, 3),
+        tags=[Tag.GEOMETRY, Tag.IS_ORIGINAL, Tag.IS_GENERALIZED, Tag.FIND_ANY],
+        answer_format={"is_square_matrix": True, "expected_length": 2},
     )
     a: int
     b: int
@@ -69,7 +70,7 @@ class ProblemKonhauser20131(Problem):
         return math.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
 
     def check(self, sol: list[list[float]]) -> bool:
-        checker_format = self.check_format(sol, is_square_matrix=True, expected_length=2)
+        checker_format = self.check_format(sol, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         A = (self.a, 0)
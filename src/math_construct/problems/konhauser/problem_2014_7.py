@@ -20,8 +20,9 @@ class ProblemKonhauser20147(Problem):
         original_parameters={"a": 3, "b": 3, "c": 2, "d": 9, "e": 6, "f": 19},
         problem_url="https://www.macalester.edu/mscs/wp-content/uploads/sites/591/2015/01/KP2014.pdf#page=2",
         solution_url="https://www.macalester.edu/mscs/wp-content/uploads/sites/591/2015/01/KP2014.pdf#page=7",
-        original_solution=get_solution(3, 3, 2),
-        tags=[Tag.IS_SIMPLIFIED, Tag.FIND_ALL, Tag.ALGEBRA, Tag.IS_ORIGINAL, Tag.IS_GENERALIZED]
+        original_solution=lambda: get_solution(3, 3, 2),
+        tags=[Tag.IS_SIMPLIFIED, Tag.FIND_ALL, Tag.ALGEBRA, Tag.IS_ORIGINAL, Tag.IS_GENERALIZED],
+        answer_format={"expected_length": 2},
     )
     a: int
     b: int
@@ -44,7 +45,7 @@ class ProblemKonhauser20147(Problem):
         )
 
     def check(self, sol: list[float]) -> bool:
-        checker_format = self.check_format(sol, expected_length=2)
+        checker_format = self.check_format(sol, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         x, y = sol
@@ -26,8 +26,9 @@ class ProblemKonhauser20152(Problem):
         parameters=["k", "n", "m", "l"],
         source="Konhauser Problemfest 2015 P2",
         original_parameters={"k": 3, "n": 7, "m": 5, "l": 25},
-        original_solution=get_solution(25),
-        tags=[Tag.ALGEBRA, Tag.FIND_ALL, Tag.IS_ORIGINAL, Tag.IS_GENERALIZED]
+        original_solution=lambda: get_solution(25),
+        tags=[Tag.ALGEBRA, Tag.FIND_ALL, Tag.IS_ORIGINAL, Tag.IS_GENERALIZED],
+        answer_format={"expected_length": 2, "is_unique": True},
     )
     k: int
     n: int
@@ -44,7 +45,7 @@ class ProblemKonhauser20152(Problem):
         return PROBLEM_TEMPLATE.format(k=self.k, n=self.n, m=self.m, l=self.l)
 
     def check(self, sol: list[float]) -> bool:
-        checker_format = self.check_format(sol, expected_length=2, is_unique=True)
+        checker_format = self.check_format(sol, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         for f_n in sol:
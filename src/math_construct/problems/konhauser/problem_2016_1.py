@@ -46,7 +46,7 @@ class ProblemKonhauser20161(Problem):
         problem_url="https://www.macalester.edu/mscs/wp-content/uploads/sites/591/2016/03/Konhauser2016.pdf#page=1",
         solution_url="https://www.macalester.edu/mscs/wp-content/uploads/sites/591/2016/03/Konhauser2016.pdf#page=6",
         original_parameters={"time": "1", "number": 6},
-        original_solution=get_solution(6),
+        original_solution=lambda: get_solution(6),
         tags=[Tag.COMBINATORICS, Tag.FIND_ANY, Tag.IS_ORIGINAL, Tag.IS_GENERALIZED]
     )
     time: str
@@ -47,8 +47,9 @@ class ProblemKonhauser20163(Problem):
         parameters=["n", "m"],
         source="Konhauser Problemfest 2016 P3",
         original_parameters={"n": 7, "m": 7},
-        original_solution=get_solution(7, 7),
-        tags=[Tag.IS_ORIGINAL, Tag.IS_GENERALIZED, Tag.FIND_ANY, Tag.COMBINATORICS]
+        original_solution=lambda: get_solution(7, 7),
+        tags=[Tag.IS_ORIGINAL, Tag.IS_GENERALIZED, Tag.FIND_ANY, Tag.COMBINATORICS],
+        answer_format={"expected_length": 2, "is_integer": True},
     )
     n: int
     m: int
@@ -61,7 +62,7 @@ class ProblemKonhauser20163(Problem):
         return PROBLEM_TEMPLATE.format(n=self.n, m=self.m, colors=self.m + 2)
 
     def check(self, sol: list[list[list[int]]]) -> bool:
-        checker_format = self.check_format(sol, expected_length=2, is_integer=True)
+        checker_format = self.check_format(sol, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         checker_format = self.check_format(sol[0], is_matrix=True, expected_length=self.m)
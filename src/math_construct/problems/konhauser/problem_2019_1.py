@@ -47,8 +47,9 @@ class ProblemKonhauser20191(Problem):
         original_parameters={"permutation": "1,2,3,4,5,6,7,8,9,10,11,12,13"},
         problem_url="https://www.macalester.edu/mscs/wp-content/uploads/sites/591/2019/02/KP-2019-.pdf#page=1",
         solution_url="https://www.macalester.edu/mscs/wp-content/uploads/sites/591/2019/02/KP-2019-.pdf#page=4",
-        original_solution=get_solution("1,2,3,4,5,6,7,8,9,10,11,12,13"),
-        tags=[Tag.COMBINATORICS, Tag.FIND_ANY, Tag.IS_ORIGINAL, Tag.IS_GENERALIZED]
+        original_solution=lambda: get_solution("1,2,3,4,5,6,7,8,9,10,11,12,13"),
+        tags=[Tag.COMBINATORICS, Tag.FIND_ANY, Tag.IS_ORIGINAL, Tag.IS_GENERALIZED],
+        answer_format={"expected_length": 13, "is_integer": True, "min_val_inclusive": 1, "max_val_inclusive": 13},
     )
     permutation: str
 
@@ -77,8 +78,7 @@ class ProblemKonhauser20191(Problem):
         return PROBLEM_TEMPLATE.format(a=a, b=b, c=c, d=d, e=e, table=self.get_table_latex(assignments))
 
     def check(self, sol: list[list[int]]) -> bool:
-        check_format = self.check_format(sol, expected_length=13, is_integer=True, min_val_inclusive=1, 
-                                         max_val_inclusive=13)
+        check_format = self.check_format(sol, **self.get_answer_format())
         if not check_format[0]:
             return check_format
         assignments, perm = self.get_init_table()
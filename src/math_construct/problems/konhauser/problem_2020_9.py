@@ -29,8 +29,9 @@ class ProblemKonhauser20209(Problem):
         problem_url="https://www.macalester.edu/mscs/wp-content/uploads/sites/591/2020/05/Konhauser2020problems.pdf#page=2",
         solution_url="https://www.macalester.edu/mscs/wp-content/uploads/sites/591/2020/05/Konhauser2020problems.pdf#page=7",
         original_parameters={"p1": 2, "p2": 3, "p3": 5, "p4": 101},
-        original_solution=get_solution(2, 3, 5, 101),
-        tags=[Tag.IS_SIMPLIFIED, Tag.ALGEBRA, Tag.FIND_ANY, Tag.IS_ORIGINAL, Tag.IS_GENERALIZED] 
+        original_solution=lambda: get_solution(2, 3, 5, 101),
+        tags=[Tag.IS_SIMPLIFIED, Tag.ALGEBRA, Tag.FIND_ANY, Tag.IS_ORIGINAL, Tag.IS_GENERALIZED],
+        answer_format={"expected_length": 7, "is_integer": True, "min_val_exclusive": 0},
     )
     p1: int
     p2: int
@@ -56,7 +57,7 @@ class ProblemKonhauser20209(Problem):
         return PROBLEM_TEMPLATE.format(abc=abc, bcd=bcd, cde=cde, def_=def_, efa=efa)
 
     def check(self, sol: list[int]) -> bool:
-        checker_format = self.check_format(sol, expected_length=7, is_integer=True, min_val_exclusive=0)
+        checker_format = self.check_format(sol, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         if len(set(sol[1:])) != 6:
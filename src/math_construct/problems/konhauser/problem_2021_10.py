@@ -40,8 +40,9 @@ class ProblemKonhauser202110(Problem):
         solution_url="https://drive.google.com/file/d/1yC9Kn09fJY1pwT0Dn4fh-ywhwBv-lXD1/view", # page 9
         source="Konhauser Problemfest 2021 P10",
         original_parameters={"k": 10, "l": 10, "m": 5},
-        original_solution=get_solution(10, 10, 5),
-        tags=[Tag.IS_ORIGINAL, Tag.ALGEBRA, Tag.FIND_MAX_MIN, Tag.IS_GENERALIZED]
+        original_solution=lambda: get_solution(10, 10, 5),
+        tags=[Tag.IS_ORIGINAL, Tag.ALGEBRA, Tag.FIND_MAX_MIN, Tag.IS_GENERALIZED],
+        answer_format={"expected_length": "m", "min_val_exclusive": 0, "is_integer": True, "is_unique": True},
     )
     l: int
     k: int
@@ -60,7 +61,7 @@ class ProblemKonhauser202110(Problem):
         return stmt
 
     def check(self, a: list[int]) -> bool:
-        checker_format = self.check_format(a, expected_length=self.m, min_val_exclusive=0, is_integer=True, is_unique=True)
+        checker_format = self.check_format(a, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         for n in a:
@@ -38,7 +38,7 @@ class ProblemKonhauser20233(Problem):
         original_parameters={"k": 14, "n": 10},
         problem_url="https://drive.google.com/file/d/1K6Sf1EUpUkj64cowt5m-RNdnQMc_iNBd/view", #page 2,
         solution_url="https://drive.google.com/file/d/1K6Sf1EUpUkj64cowt5m-RNdnQMc_iNBd/view", # page 5
-        original_solution=get_solution(10, 14),
+        original_solution=lambda: get_solution(10, 14),
         tags=[Tag.IS_ORIGINAL, Tag.COMBINATORICS, Tag.FIND_ALL, Tag.IS_GENERALIZED, Tag.IS_SIMPLIFIED]
     )
     n: int
@@ -47,7 +47,7 @@ class ProblemBaltic2005P19(Problem):
         parameters=["N", "M"],
         source="Baltic Way 2005 Extralist 05.19",
         original_parameters={"N": 10, "M": 15},
-        original_solution=get_solution(10, 15),
+        original_solution=lambda: get_solution(10, 15),
         problem_url="https://www.balticway07.dk/data/ekstra/bw02-06-online-a5.pdf",
         solution_url="https://www.balticway07.dk/data/ekstra/bw02-06-online-a5.pdf",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_GENERALIZED]
@@ -23,7 +23,7 @@ class ProblemNZNT(Problem):
         parameters=["n"],
         source="New Zealand Squad Assignment Number Theory P3 (simplified)",
         original_parameters={"n": 8},
-        original_solution=get_solution(8),
+        original_solution=lambda: get_solution(8),
         problem_url="https://www.studocu.com/en-us/document/california-institute-of-technology/topics-in-number-theory/2011-squad-nt-solns-nt-stuff/114245476",
         solution_url="https://www.studocu.com/en-us/document/california-institute-of-technology/topics-in-number-theory/2011-squad-nt-solns-nt-stuff/114245476",
         tags=[Tag.NUMBER_THEORY, Tag.IS_SIMPLIFIED, Tag.FIND_INF]
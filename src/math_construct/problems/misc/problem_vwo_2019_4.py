@@ -28,8 +28,9 @@ class ProblemVWO20194(Problem):
         source="Vlaamse Wiskunde Olympiade Finals 2019-2020",
         problem_url="https://www.vwo.be/vwo/wp-content/uploads/2020/09/onlinefinaleVWO.pdf",
         original_parameters={"n": 25, "k": 25},
-        original_solution=get_solution(25),
-        tags=[Tag.IS_SIMPLIFIED, Tag.IS_TRANSLATED, Tag.COMBINATORICS, Tag.FIND_ANY]
+        original_solution=lambda: get_solution(25),
+        tags=[Tag.IS_SIMPLIFIED, Tag.IS_TRANSLATED, Tag.COMBINATORICS, Tag.FIND_ANY],
+        answer_format={"is_integer": True, "expected_length": "n", "is_unique": True, "min_val_inclusive": 1, "max_val_inclusive": "n"},
     )
     n: int
     k: int
@@ -42,7 +43,7 @@ class ProblemVWO20194(Problem):
         return PROBLEM_TEMPLATE.format(n=self.n, k=self.k)
 
     def check(self, a: list[int]) -> bool:
-        checker_format = self.check_format(a, is_integer=True, expected_length=self.n, is_unique=True, min_val_inclusive=1, max_val_inclusive=self.n)
+        checker_format = self.check_format(a, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         visited = [False] * self.n
@@ -0,0 +1,194 @@
+import glob
+import hashlib
+import json
+import os
+import platform
+import time
+from datetime import datetime
+from fractions import Fraction
+from typing import Any, Iterator, Optional
+from loguru import logger
+from math_construct.latex_eval import get_latex_expression
+from math_construct.parsing import parse_answer, match_list_depth
+from math_construct.problems import get_all_problem_names, get_problem_class
+from math_construct.problems.transcript_index import BoxedMessage
+from math_construct.utils import get_percentile
+
+# Length of the answer (and output) prefixes kept in the results, the golden file stores hashes of full outputs
+PREVIEW_LENGTH = 200
+
+def format_answer(solution: Any, top_level: bool = True) -> str:
+    """Writes a solution as a boxed answer would: "1, 2" at the top level, "(1, 2), (3, 4)" for nested lists."""
+    if isinstance(solution, (list, tuple, set)):
+        content = ", ".join(format_answer(element, False) for element in solution)
+        return content if top_level else f"({content})"
+    if isinstance(solution, Fraction):
+        sign = "-" if solution < 0 else ""
+        return f"{sign}\\frac{{{abs(solution.numerator)}}}{{{solution.denominator}}}"
+    return str(solution)
+
+def iter_run_answers(run_dir: str) -> Iterator[dict]:
+    """Yields the \\boxed{} payloads of the assistant messages (and code outputs) in a run directory <run>/<model>/<problem>.json."""
+    for path in sorted(glob.glob(os.path.join(run_dir, "*", "*.json"))):
+        problem_name = os.path.basename(path)[:-len(".json")]
+        try:
+            with open(path, "r") as f:
+                instances = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load {path}: {e}")
+            continue
+        if not isinstance(instances, list):
+            continue
+        for instance in instances:
+            response = instance.get("response") if isinstance(instance, dict) else None
+            if isinstance(response, str):
+                response = [response]
+            for message in response or []:
+                if isinstance(message, dict):
+                    if message.get("role") != "assistant" and "```" not in (message.get("content") or ""):
+                        continue
+                    message = message.get("content")
+                if not isinstance(message, str):
+                    continue
+                for answer in BoxedMessage(message).get_boxed_contents():
+                    yield {"source": path, "problem_name": problem_name, "answer": answer}
+
+def iter_data_answers(path: str) -> Iterator[dict]:
+    """
+    Yields the \\boxed{} payloads of all strings in a JSON data file and the original solutions it contains
+    (written with format_answer), together with the name of the problem they belong to.
+    """
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except Exception as e:
+        logger.warning(f"Could not load {path}: {e}")
+        return
+
+    def walk(obj, problem_name):
+        if isinstance(obj, dict):
+            if isinstance(obj.get("config"), dict) and "name" in obj["config"]:
+                problem_name = obj["config"]["name"]
+            elif isinstance(obj.get("problem_name"), str):
+                problem_name = obj["problem_name"]
+            for key, value in obj.items():
+                if key == "original_solution" and value is not None and not isinstance(value, str):
+                    yield {"source": f"{path}:solution", "problem_name": problem_name, "answer": format_answer(value)}
+                else:
+                    yield from walk(value, problem_name)
+        elif isinstance(obj, list):
+            for value in obj:
+                yield from walk(value, problem_name)
+        elif isinstance(obj, str) and r"\boxed{" in obj and problem_name is not None:
+            for answer in BoxedMessage(obj).get_boxed_contents():
+                yield {"source": path, "problem_name": problem_name, "answer": answer}
+    yield from walk(data, None)
+
+def get_answer_key(problem_name: str, answer: str) -> str:
+    return hashlib.sha1(f"{problem_name}\0{answer}".encode()).hexdigest()
+
+def collect_answers(run_dirs: list[str], data_files: list[str]) -> list[dict]:
+    """
+    Collects the (deduplicated) answers of the given runs and data files, with the primitive type and depth
+    the parser uses for their problem. Answers of unknown problems are skipped.
+    """
+    known_problems = set(get_all_problem_names())
+    answers, seen, n_unknown = [], set(), 0
+    sources = [iter_run_answers(run_dir) for run_dir in run_dirs] + [iter_data_answers(path) for path in data_files]
+    for source in sources:
+        for entry in source:
+            key = get_answer_key(entry["problem_name"], entry["answer"])
+            if key in seen:
+                continue
+            seen.add(key)
+            if entry["problem_name"] not in known_problems:
+                n_unknown += 1
+                continue
+            primitive_type, depth = get_problem_class(entry["problem_name"]).get_solution_info()
+            answers.append({**entry, "key": key, "primitive_type": primitive_type, "depth": depth})
+    if n_unknown > 0:
+        logger.warning(f"Skipped {n_unknown} answers of unknown problems")
+    return answers
+
+def parse_and_match(answer: str, primitive_type: type, depth: Optional[int]) -> tuple[Optional[str], Optional[str]]:
+    """Parses an answer like Problem.parse does, returns (repr of the output, None) or (None, error)."""
+    try:
+        res = parse_answer(answer, primitive_type)
+        if res is None:
+            return None, "Parser returned None"
+        return repr(match_list_depth(res, depth, primitive_type)), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def benchmark_parser(answers: list[dict], n_repeats: int = 1, n_slowest: int = 10) -> dict:
+    """
+    Times parse_answer and match_list_depth on every answer. The LaTeX cache is cleared before each repeat,
+    so that every repeat measures a cold pass over the answers as in a fresh analysis.
+
+    Args:
+        answers (list[dict]): Answers from collect_answers.
+        n_repeats (int, optional): Number of timed passes, the minimum time per answer is reported. Defaults to 1.
+        n_slowest (int, optional): Number of slowest answers to report. Defaults to 10.
+    Returns:
+        dict: {"meta", "summary" (n_answers, n_errors, time_total, answers_per_second, mb_per_second,
+              p50/p90/p99/max latency), "slowest", "outputs" (answer key -> {"problem_name", "output_hash", "error"})}
+    """
+    times = [float("inf")] * len(answers)
+    outputs = {}
+    # the first LaTeX parse of a process loads sympy's parser, which is not part of any answer's time
+    parse_and_match("x", None, None)
+    for _ in range(n_repeats):
+        get_latex_expression.cache_clear()
+        for i, entry in enumerate(answers):
+            ts_start = time.perf_counter()
+            output, error = parse_and_match(entry["answer"], entry["primitive_type"], entry["depth"])
+            times[i] = min(times[i], time.perf_counter() - ts_start)
+            outputs[entry["key"]] = {
+                "problem_name": entry["problem_name"],
+                "output_hash": hashlib.sha1(output.encode()).hexdigest() if output is not None else None,
+                "error": error,
+                "output": output[:PREVIEW_LENGTH] if output is not None else None,
+            }
+
+    time_total = sum(times)
+    n_bytes = sum(len(entry["answer"].encode()) for entry in answers)
+    slowest = sorted(range(len(answers)), key=lambda i: times[i], reverse=True)[:n_slowest]
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "n_repeats": n_repeats,
+        },
+        "summary": {
+            "n_answers": len(answers),
+            "n_errors": sum(output["error"] is not None for output in outputs.values()),
+            "time_total": time_total,
+            "answers_per_second": len(answers) / time_total if time_total > 0 else None,
+            "mb_per_second": n_bytes / 1e6 / time_total if time_total > 0 else None,
+            "time_p50": get_percentile(times, 50),
+            "time_p90": get_percentile(times, 90),
+            "time_p99": get_percentile(times, 99),
+            "time_max": max(times, default=None),
+        },
+        "slowest": [
+            {"problem_name": answers[i]["problem_name"], "source": answers[i]["source"], "time": times[i],
+             "answer_length": len(answers[i]["answer"]), "answer": answers[i]["answer"][:PREVIEW_LENGTH]}
+            for i in slowest
+        ],
+        "outputs": outputs,
+    }
+
+def compare_outputs(golden: dict, current: dict) -> list[dict]:
+    """
+    Compares the outputs of two benchmark results (e.g. a stored golden file and a new run).
+    Returns one entry per answer present in both whose output or error changed.
+    """
+    changed = []
+    for key, output in current["outputs"].items():
+        expected = golden["outputs"].get(key)
+        if expected is None:
+            continue
+        if (expected["output_hash"], expected["error"]) != (output["output_hash"], output["error"]):
+            changed.append({"key": key, "problem_name": output["problem_name"], "expected": expected, "current": output})
+    return changed
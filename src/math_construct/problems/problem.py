@@ -1,16 +1,28 @@
+import importlib
 import inspect
 from pydantic.dataclasses import dataclass
 from pydantic import BaseModel, Field
 from typing import Any, Optional, Self, Union
-from math_construct.utils import get_problem_name, get_depth
+from math_construct.utils import get_problem_name, get_depth, get_rectangular_structure
 from math_construct.parsing import parse_answer, match_list_depth
+from math_construct.problems.checker_pool import get_checker_pool, WorkerTimeoutError
+from math_construct.problems.solution_cache import get_solution_cache
+from math_construct.problems.check_stats import get_check_stats
+from math_construct.problems.transcript_index import BoxedMessage, TranscriptIndex, get_boxed_message
 from fractions import Fraction
 import random
 import numpy as np
 import time
 from loguru import logger
 from enum import Enum
-import concurrent.futures
+import sys
+
+# Problems and answers use integers with many thousands of digits, this has to hold in every process that
+# checks them, also in checker workers that only import a few problem modules
+sys.set_int_max_str_digits(1000000)
+
+# Functions available in the expressions of ProblemConfig.answer_format
+ANSWER_FORMAT_BUILTINS = {"len": len, "min": min, "max": max, "abs": abs}
 
 class Tag(str, Enum):
     # Categories
@@ -43,6 +55,9 @@ class Tag(str, Enum):
     # is translated: whether the problem is a translation of a problem from another language
     IS_TRANSLATED = "Is Translated"
 
+# check_format only converts solutions with at least this many primitive values to numpy arrays
+VECTORIZED_CHECK_MIN_SIZE = 64
+
 class CheckerTag(str, Enum):
     # length: incorrect number of objects (outermost list size)
     INCORRECT_LENGTH = "Incorrect number of objects"
@@ -92,6 +107,65 @@ class ProblemConfig:
 
     tags: list[Tag] = Field(default_factory=list)
 
+    # Keyword arguments of Problem.check_format that every correct answer satisfies, e.g. {"expected_length": "n",
+    # "is_integer": True}. String values are Python expressions in the parameters of the instance. Answers that do
+    # not satisfy them are rejected in-process (precheck_answer), without sending them to a checker worker
+    answer_format: Optional[dict[str, Any]] = None
+
+    def __post_init__(self):
+        # original_solution can be given as a function (e.g. lambda: get_solution(10)), it is then only
+        # computed (or loaded from the solution cache) on first access
+        if callable(self.original_solution):
+            self.__dict__["solution_fn"] = self.original_solution
+            del self.__dict__["original_solution"]
+
+    def __getattr__(self, name):
+        if name == "original_solution" and self.is_solution_deferred():
+            found, solution = False, None
+            cache = get_solution_cache()
+            if cache is not None:
+                found, solution = cache.get_solution(self.name, self.get_source_file())
+            if not found:
+                solution = self.get_solution_fn()()
+            self.__dict__["original_solution"] = solution
+            return solution
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    # Returns the config fields, with the original solution computed
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.__dataclass_fields__}
+
+    def __getstate__(self):
+        # a solution that was not computed yet stays deferred, the function (usually a lambda) is pickled by
+        # reference to its module and looked up again in the unpickling process when needed
+        state = {field: self.__dict__[field] for field in self.__dataclass_fields__ if field in self.__dict__}
+        if "original_solution" not in state:
+            state["solution_module"] = self.get_solution_fn().__module__
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def is_solution_deferred(self) -> bool:
+        return "solution_fn" in self.__dict__ or "solution_module" in self.__dict__
+
+    # Returns the function computing the original solution, from the config of the problem module if unpickled
+    def get_solution_fn(self):
+        if "solution_fn" not in self.__dict__:
+            module = importlib.import_module(self.__dict__["solution_module"])
+            for value in vars(module).values():
+                config = getattr(value, "config", None)
+                if isinstance(config, ProblemConfig) and config.name == self.name and "solution_fn" in config.__dict__:
+                    self.__dict__["solution_fn"] = config.__dict__["solution_fn"]
+                    break
+            else:
+                raise AttributeError(f"No deferred solution of {self.name} in {self.__dict__['solution_module']}")
+        return self.__dict__["solution_fn"]
+
+    # Returns the file of the problem module, whose hash keys the solution cache
+    def get_source_file(self) -> str:
+        return inspect.getsourcefile(self.get_solution_fn())
+
 class Problem:
     config: ProblemConfig
     solution: Optional[Any] = None
@@ -191,6 +265,14 @@ class Problem:
         if expected_length is not None:
             if len(solution) != expected_length:
                 return False, f"Expected {expected_length} elements, got {len(solution)}", CheckerTag.INCORRECT_LENGTH
+
+        vectorized_result = Problem.check_format_vectorized(solution, expected_size_all_axes=expected_size_all_axes,
+                                                            is_integer=is_integer, is_float=is_float, is_unique=is_unique,
+                                                            is_matrix=is_matrix, is_square_matrix=is_square_matrix,
+                                                            min_val_inclusive=min_val_inclusive, max_val_inclusive=max_val_inclusive,
+                                                            min_val_exclusive=min_val_exclusive, max_val_exclusive=max_val_exclusive)
+        if vectorized_result is not None:
+            return vectorized_result
         
         is_correct, message, tag = Problem.check_recursive(solution, is_float=is_float, is_integer=is_integer, 
                                                         min_val_exclusive=min_val_exclusive, min_val_inclusive=min_val_inclusive,
@@ -227,34 +309,171 @@ class Problem:
                 return False, f"Matrix is not square", CheckerTag.INCORRECT_FORMAT
         return True, "OK", CheckerTag.CORRECT
         
-    def check_with_timeout(self, answer):
+    @staticmethod
+    def check_format_vectorized(solution, 
+                                expected_size_all_axes : list[int] = None,
+                                is_integer : bool = False, 
+                                is_float : bool = False, 
+                                is_unique : bool = False, 
+                                is_matrix : bool = False, 
+                                is_square_matrix : bool = False, 
+                                min_val_inclusive : float = None, 
+                                max_val_inclusive : float = None,
+                                min_val_exclusive : float = None,
+                                max_val_exclusive : float = None, 
+        ):
         """
-        Runs the check function with a timeout.
+        Numpy version of check_format (without expected_length) for large rectangular solutions of ints or of floats.
+        Returns the same result as check_format, or None if the solution is not supported and has to be checked in Python.
         """
-        with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(self.check, answer)
-            try:
-                result = future.result(timeout=self.config.timeout)
-                return result
-            except concurrent.futures.TimeoutError:
-                future.cancel()
-                raise TimeoutError(f"check() did not complete within {self.config.timeout} seconds.")
-
-    # Always returns answer, is_correct, details
-    def parse_and_check(self, output_str: Union[list[dict[str]], str]) -> tuple[str, bool, str]:
+        structure = get_rectangular_structure(solution)
+        if structure is None:
+            return None
+        shape, container_types, values, value_types = structure
+        if len(values) < VECTORIZED_CHECK_MIN_SIZE:
+            return None
+        is_int_array = value_types <= {int, bool}
+        if not is_int_array and value_types != {float}:
+            return None
+        bounds = [b for b in (min_val_inclusive, max_val_inclusive, min_val_exclusive, max_val_exclusive) if b is not None]
+        if any(type(b) not in (int, float) or (type(b) == int and abs(b) > 2**53) for b in bounds):
+            return None
+        # set(solution) fails on tuples that contain lists, leave that error to the Python path
+        if is_unique and len(shape) > 1 and container_types[1] == tuple and list in container_types[2:]:
+            return None
+
+        try:
+            array = np.array(values)
+        except OverflowError:
+            return None
+        if array.dtype.kind not in ("b", "i" if is_int_array else "f"):
+            return None
+        # comparing to float bounds converts ints to floats, which is only exact up to 2**53
+        if is_int_array and any(type(b) == float for b in bounds) and np.abs(array).max() > 2**53:
+            return None
+        if is_unique and not is_int_array and np.isnan(array).any():
+            return None
+
+        # check_recursive: the first failing value determines the message
+        failed = np.zeros(len(values), dtype=bool)
+        if is_integer and not is_int_array:
+            failed[:] = True
+        if min_val_inclusive is not None:
+            failed |= array < min_val_inclusive
+        if max_val_inclusive is not None:
+            failed |= array > max_val_inclusive
+        if min_val_exclusive is not None:
+            failed |= array <= min_val_exclusive
+        if max_val_exclusive is not None:
+            failed |= array >= max_val_exclusive
+        if failed.any():
+            return Problem.check_singular(values[int(np.argmax(failed))], is_integer=is_integer, is_float=is_float, 
+                                          min_val_exclusive=min_val_exclusive, min_val_inclusive=min_val_inclusive,
+                                          max_val_exclusive=max_val_exclusive, max_val_inclusive=max_val_inclusive)
+
+        if expected_size_all_axes is not None:
+            for axis, expected_size in enumerate(expected_size_all_axes):
+                if axis == len(shape):
+                    return False, f"Expected a list or tuple, got {values[0]}", CheckerTag.INCORRECT_FORMAT
+                if expected_size is not None and shape[axis] != expected_size:
+                    return False, f"Expected size {expected_size}, got {shape[axis]}", CheckerTag.INCORRECT_FORMAT
+
+        if is_unique:
+            rows = array.reshape(shape[0], -1)
+            if len(np.unique(rows, axis=0)) != shape[0]:
+                return False, f"List contains duplicate elements", CheckerTag.INCORRECT_FORMAT
+        if is_matrix or is_square_matrix:
+            if len(shape) < 2:
+                return False, f"Expected a matrix, got {solution}", CheckerTag.INCORRECT_FORMAT
+        if is_square_matrix:
+            if shape[1] != shape[0]:
+                return False, f"Matrix is not square", CheckerTag.INCORRECT_FORMAT
+        return True, "OK", CheckerTag.CORRECT
+
+    def get_answer_format(self) -> dict[str, Any]:
+        """Keyword arguments of check_format declared in config.answer_format, with the expressions evaluated for this instance."""
+        if self.config.answer_format is None:
+            return {}
+        params = {param: getattr(self, param) for param in self.config.parameters}
+        return {
+            key: eval(value, {"__builtins__": ANSWER_FORMAT_BUILTINS}, params) if isinstance(value, str) else value
+            for key, value in self.config.answer_format.items()
+        }
+
+    def precheck_answer(self, answer) -> Optional[tuple[bool, str, CheckerTag]]:
+        """
+        Checks the answer against config.answer_format in this process.
+        Returns the result of check_format if the answer fails it, None if it passes or no format is declared.
+        """
+        if self.config.answer_format is None:
+            return None
+        try:
+            result = self.check_format(answer, **self.get_answer_format())
+        except Exception as e:
+            # e.g. len() of an answer that is no list, the checker decides on those
+            logger.debug(f"Could not precheck the answer of {self.config.name}: {e}")
+            return None
+        return result if not result[0] else None
+
+    def check_with_timeout(self, answer, task_stats: Optional[dict] = None):
+        """
+        Runs the check function with a timeout in a worker of the shared checker pool.
+        If task_stats is given, it is updated with the peak RSS of the worker ("peak_rss_mb") and whether the check timed out ("timed_out").
+        """
+        pool = get_checker_pool()
+        try:
+            result, stats = pool.run_with_stats(self.check, answer, timeout=self.config.timeout)
+        except WorkerTimeoutError:
+            if task_stats is not None:
+                task_stats["timed_out"] = True
+            raise TimeoutError(f"check() did not complete within {self.config.timeout} seconds.")
+        if task_stats is not None:
+            task_stats["peak_rss_mb"] = stats["peak_rss_mb"]
+        return result
+
+    # Always returns answer, is_correct, details. index is the TranscriptIndex of the conversation, if one is kept
+    def parse_and_check(self, output_str: Union[list[dict[str]], str], index: Optional[TranscriptIndex] = None) -> tuple[str, bool, str]:
+        check_stats = get_check_stats()
+        ts_start = time.perf_counter()
+        answer, err = self.parse_for_check(output_str, index)
+        parse_time = time.perf_counter() - ts_start
+        if err is not None:
+            if check_stats is not None:
+                check_stats.add(self, parse_time, None, None)
+            return None, False, err
+        task_stats = {}
+        ts_start = time.perf_counter()
+        is_correct, details = self.check_answer(answer, task_stats)
+        if check_stats is not None:
+            check_stats.add(self, parse_time, time.perf_counter() - ts_start, answer, **task_stats)
+        return answer, is_correct, details
+
+    # Returns answer, error (None if parsing succeeded)
+    def parse_for_check(self, output_str: Union[list[dict[str]], str], index: Optional[TranscriptIndex] = None) -> tuple[Any, Optional[str]]:
         self.warn_small_length(output_str)
         try:
             logger.trace(f"Parsing solution: {output_str}")
-            answer = self.parse(output_str)
+            answer = self.parse(output_str, index)
             logger.trace(f"Parsed solution: {answer}")
         except Exception as e:
             err = f"Error parsing solution: {e}"
             logger.warning(err)
-            return None, False, err
+            return None, err
         if answer is None:
-            return None, False, "Parser returned None"
+            return None, "Parser returned None"
+        return answer, None
+
+    # Returns is_correct, details for an already parsed answer, task_stats is passed to check_with_timeout
+    def check_answer(self, answer, task_stats: Optional[dict] = None) -> tuple[bool, str]:
+        precheck_result = self.precheck_answer(answer)
+        if precheck_result is not None:
+            # answers with the wrong shape are rejected without a checker worker
+            if task_stats is not None:
+                task_stats["prechecked"] = True
+            _, details, error_tag = precheck_result
+            return False, f"{error_tag}: {details}"
         try:
-            checker_result = self.check_with_timeout(answer)
+            checker_result = self.check_with_timeout(answer, task_stats)
             if type(checker_result) == tuple and len(checker_result) == 3:
                 is_correct, details, error_tag = checker_result
             elif type(checker_result) == bool:
@@ -268,38 +487,36 @@ class Problem:
                 error_tag = CheckerTag.UNKNOWN
             else:
                 raise TypeError(f"Unexpected checker return value: {checker_result}")
-            return answer, is_correct,  f"{error_tag}: {details}"
+            return is_correct,  f"{error_tag}: {details}"
         except Exception as e:
             err = f"Error checking solution: {e}"
             logger.warning(err)
-            return answer, False, err 
+            return False, err 
 
     # below should be private vvv
     @classmethod
-    def parse_list(cls, output: list[dict[str]]):
+    def parse_list(cls, output: list[dict[str]], index: Optional[TranscriptIndex] = None):
+        """
+        Parses the answer from the last candidate message (assistant message or code output) that has one.
+        An index that was built for an earlier round of the same transcript can be passed in, it is extended
+        with the new messages.
+        """
+        index = index.extend(output) if index is not None else TranscriptIndex(output)
         parsed_response = None
         caught_error = None
-        for i, s in enumerate(output[::-1]):
-            if isinstance(s, str):
-                try:
-                    parsed_response = cls.parse(s)
-                except Exception as e:
-                    if r"Final solution needs to be encased in \boxed{}." in str(e) and caught_error is not None:
-                        continue
-                    caught_error = e
-                if parsed_response is not None:
-                    caught_error = None
-                    break
-            elif s["role"] == "assistant" or "```" in s["content"]: # code output or assistant message
-                try:
-                    parsed_response = cls.parse(s["content"])
-                except Exception as e:
-                    if r"Final solution needs to be encased in \boxed{}." in str(e) and caught_error is not None:
-                        continue
-                    caught_error = e
-                if parsed_response is not None:
-                    caught_error = None
-                    break
+        for _, message in index.iter_candidates():
+            try:
+                if isinstance(message, BoxedMessage):
+                    parsed_response = cls.parse_boxed_message(message)
+                else:
+                    parsed_response = cls.parse(message)
+            except Exception as e:
+                if r"Final solution needs to be encased in \boxed{}." in str(e) and caught_error is not None:
+                    continue
+                caught_error = e
+            if parsed_response is not None:
+                caught_error = None
+                break
         if caught_error is not None:
             raise caught_error
         return parsed_response
@@ -317,15 +534,45 @@ class Problem:
             logger.warning(f"Model did not give output. This might indicate that something went wrong (except for o1).")
 
     @classmethod
-    def parse(cls, output_str: Union[list[dict[str]], str]):
+    def parse(cls, output_str: Union[list[dict[str]], str], index: Optional[TranscriptIndex] = None):
         if isinstance(output_str, list):
-            return cls.parse_list(output_str)
+            return cls.parse_list(output_str, index)
         if len(output_str) == 0: # reasoning model didn't finish -> don't allow it to restart from scratch by throwing an error (costs a lot)
             return None
-        match = cls.extract_last_boxed_content(output_str)
+        return cls.parse_boxed_message(get_boxed_message(output_str))
+
+    @classmethod
+    def parse_boxed_message(cls, message: BoxedMessage):
+        """
+        Parses the last \\boxed{} of a message. Parsing a message is deterministic, so failures are
+        remembered on the (cached) message and not retried when later rounds of a transcript parse it again.
+        """
+        if cls in message.parse_failures:
+            if message.parse_failures[cls] is None:
+                return None
+            error_type, error_message = message.parse_failures[cls]
+            try:
+                error = error_type(error_message)
+            except Exception: # exception types that take other arguments
+                error = Exception(error_message)
+            raise error
+        try:
+            res = cls._parse_boxed_message(message)
+        except Exception as e:
+            message.parse_failures[cls] = (type(e), str(e))
+            raise
+        if res is None:
+            message.parse_failures[cls] = None
+        return res
+
+    @classmethod
+    def _parse_boxed_message(cls, message: BoxedMessage):
+        if message.is_empty:
+            return None
+        match = message.get_last_boxed_content()
         if match is None:
             raise Exception(r"No \boxed content found in solution. Final solution needs to be encased in \boxed{}.")
-        primitive_type, depth = cls.get_primitive_type(), get_depth(cls.config.original_solution)
+        primitive_type, depth = cls.get_solution_info()
         res = parse_answer(match, primitive_type)
         if res is None:
             raise Exception(f"Could not parse the solution from extracted boxed answer: {match}.")
@@ -342,29 +589,34 @@ class Problem:
         Return the content of the last \boxed{...} found in 'text'.
         Returns None if no matching pair is found.
         """
-        start_index = text.rfind(r'\boxed{')
-        if start_index == -1:
-            # "\boxed{" not found at all
-            return None
-        brace_start_index = start_index + len(r'\boxed{')
-        open_braces = 1
-        i = brace_start_index
-
-        while i < len(text) and open_braces > 0:
-            if text[i] == '{':
-                open_braces += 1
-            elif text[i] == '}':
-                open_braces -= 1
-            i += 1
-        if open_braces != 0:
-            return None
-        return text[brace_start_index : i - 1]
+        return get_boxed_message(text).get_last_boxed_content()
+
+    @classmethod
+    def get_solution_info(cls) -> tuple[type, Optional[int]]:
+        """
+        Primitive type and depth of the original solution, as used by parse.
+        For deferred solutions these are read from the solution cache if possible, so that the solution
+        does not have to be computed.
+        """
+        config = cls.config
+        if "solution_info" not in config.__dict__:
+            cache = get_solution_cache() if config.is_solution_deferred() else None
+            info = None
+            if cache is not None:
+                info = cache.get_info(config.name, config.get_source_file())
+            if info is None:
+                solution = config.original_solution
+                primitive_type = cls.get_primitive_type(solution) if solution is not None else type(None)
+                info = (primitive_type, get_depth(solution))
+                if cache is not None:
+                    cache.put(config.name, config.get_source_file(), info, solution)
+            config.__dict__["solution_info"] = info
+        return config.__dict__["solution_info"]
 
-    
     @classmethod
     def get_primitive_type(cls, solution = None):
         if solution is None:
-            solution = cls.config.original_solution
+            return cls.get_solution_info()[0]
         if isinstance(solution, (list, tuple, set)):
             all_types = [cls.get_primitive_type(sol) for sol in solution]
             if any([t is None for t in all_types]):
@@ -441,23 +693,52 @@ class Problem:
             problems.append(cls.get_original())
         if n_problems == 1:
             return problems
+        seen = {problem.get_param_key() for problem in problems}
         for j in range(n_tries):
             problem = cls.generate_with_seed(seed_start + j)
-            if all(problem != p for p in problems):
+            key = problem.get_param_key()
+            if key not in seen:
+                seen.add(key)
                 problems.append(problem)
 
             if len(problems) == n_problems:
                 break
         return problems
-    
+
+    @staticmethod
+    def get_canonical_value(value):
+        """Hashable canonical form of a parameter value, lists and tuples (e.g. after a json roundtrip) are equal."""
+        if isinstance(value, (list, tuple)):
+            return tuple(Problem.get_canonical_value(v) for v in value)
+        if isinstance(value, np.ndarray):
+            return Problem.get_canonical_value(value.tolist())
+        if isinstance(value, dict):
+            return tuple(sorted((k, Problem.get_canonical_value(v)) for k, v in value.items()))
+        if isinstance(value, set):
+            return frozenset(Problem.get_canonical_value(v) for v in value)
+        return value
+
+    def get_param_key(self) -> tuple:
+        """Hashable key identifying the problem instance: its problem, parameter values and revision."""
+        param_values = tuple(
+            (param, self.get_canonical_value(getattr(self, param)))
+            for param in self.config.parameters
+        )
+        revised_statement = self.revised_statement if hasattr(self, "revised_statement") else None
+        revised_formatting = self.revised_formatting if hasattr(self, "revised_formatting") else None
+        return (self.config.name, param_values, revised_statement, revised_formatting)
+
     def __eq__(self, other):
         if not isinstance(other, Problem):
             return False
-        return self.to_json() == other.to_json()
+        return self.get_param_key() == other.get_param_key()
 
     def __ne__(self, value):
         return not self.__eq__(value)
 
+    def __hash__(self):
+        return hash(self.get_param_key())
+
     @classmethod
     def generate_instances(cls, n: int) -> list["Problem"]:
         """Generate n unique instances of the problem"""
@@ -467,13 +748,9 @@ class Problem:
             new_problem = None
             for _ in range(100):
                 candidate_problem = cls.generate()
-                param_values = {
-                    param: getattr(candidate_problem, param)
-                    for param in candidate_problem.config.parameters
-                }
-                hash_param_values = hash(frozenset(param_values.items()))
-                if hash_param_values not in found_param_values:
-                    found_param_values.add(hash_param_values)
+                key = candidate_problem.get_param_key()
+                if key not in found_param_values:
+                    found_param_values.add(key)
                     new_problem = candidate_problem
                     break
             if new_problem is None:
@@ -501,7 +778,7 @@ class Problem:
             param: getattr(self, param)
             for param in self.config.parameters
         }
-        dict_config = self.remove_fractions_from_json(self.config.__dict__)
+        dict_config = self.remove_fractions_from_json(self.config.to_dict())
         revised_statement = self.revised_statement if hasattr(self, "revised_statement") else None
         revised_formatting = self.revised_formatting if hasattr(self, "revised_formatting") else None
         return {
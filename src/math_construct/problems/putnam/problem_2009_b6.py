@@ -31,7 +31,7 @@ class Problem_Putnam2009B6(Problem):
         parameters=["m", "n"],
         source="Putnam 2009 B6",
         original_parameters={"m": 10, "n": 7},
-        original_solution=get_solution(10, 7),
+        original_solution=lambda: get_solution(10, 7),
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY],
         problem_url="https://kskedlaya.org/putnam-archive/2009.pdf",
         solution_url="https://kskedlaya.org/putnam-archive/2009s.pdf",
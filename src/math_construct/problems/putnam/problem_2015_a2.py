@@ -31,7 +31,7 @@ class Problem_Putnam2015A2(Problem):
         parameters=["n"],
         source="Putnam 2015 A2",
         original_parameters={"n": 2015},
-        original_solution=get_solution(2015),
+        original_solution=lambda: get_solution(2015),
         tags=[Tag.NUMBER_THEORY, Tag.IS_ORIGINAL, Tag.FIND_ANY, Tag.IS_GENERALIZED],
         problem_url="https://kskedlaya.org/putnam-archive/2015.pdf",
         solution_url="https://kskedlaya.org/putnam-archive/2015s.pdf",
@@ -29,7 +29,7 @@ class Problem_Putnam2022B4(Problem):
         parameters=["n"],
         source="Putnam 2022 B4",
         original_parameters={"n": 21},
-        original_solution=get_solution(21),
+        original_solution=lambda: get_solution(21),
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_SIMPLIFIED],
         problem_url="https://kskedlaya.org/putnam-archive/2022.pdf",
         solution_url="https://kskedlaya.org/putnam-archive/2022s.pdf",
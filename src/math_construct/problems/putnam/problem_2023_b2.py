@@ -30,7 +30,7 @@ class Problem_Putnam2023B2(Problem):
         parameters=["m"],
         source="Putnam 2023 B2",
         original_parameters={"m": 1},
-        original_solution=get_solution(1),
+        original_solution=lambda: get_solution(1),
         tags=[Tag.NUMBER_THEORY, Tag.FIND_MAX_MIN, Tag.IS_GENERALIZED],
         problem_url="https://kskedlaya.org/putnam-archive/2023.pdf",
         solution_url="https://kskedlaya.org/putnam-archive/2023s.pdf",
@@ -0,0 +1,132 @@
+import glob
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import re
+import threading
+from loguru import logger
+
+PROBLEMS_DIR = os.path.dirname(__file__)
+MANIFEST_PATH = os.path.join(PROBLEMS_DIR, "manifest.json")
+
+def get_problem_files() -> list[str]:
+    """All problem modules as paths relative to the problems directory, e.g. 'usamo/problem_2005_1.py'."""
+    # Find all folders in the problems directory, don't include files or folders starting with _
+    problem_folders = glob.glob(os.path.join(PROBLEMS_DIR, "*"))
+    problem_folders = [folder for folder in problem_folders if os.path.isdir(folder) and not os.path.basename(folder).startswith('_')]
+    problem_files = []
+    for problem_folder in problem_folders:
+        for problem_file in glob.glob(os.path.join(problem_folder, "*.py")):
+            problem_files.append(os.path.relpath(problem_file, PROBLEMS_DIR).replace(os.sep, "/"))
+    return sorted(problem_files)
+
+def get_source_hash(problem_file: str) -> str:
+    with open(os.path.join(PROBLEMS_DIR, problem_file), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def get_module_name(problem_file: str) -> str:
+    return "math_construct.problems." + problem_file[:-3].replace("/", ".")
+
+def get_module_problem_classes(module) -> list[type]:
+    from math_construct.problems.problem import Problem
+    problem_classes = []
+    for attr_name in dir(module):
+        attr = getattr(module, attr_name)
+        if attr_name == "Problem" or not (inspect.isclass(attr) and issubclass(attr, Problem)):
+            continue
+        problem_classes.append(attr)
+    return problem_classes
+
+def build_manifest() -> list[dict]:
+    """Imports all problem modules and collects the metadata needed to select problems without importing them."""
+    manifest = []
+    for problem_file in get_problem_files():
+        module = importlib.import_module(get_module_name(problem_file))
+        for problem_class in get_module_problem_classes(module):
+            manifest.append({
+                "name": problem_class.config.name,
+                "group": problem_file.split("/")[0],
+                "file": problem_file,
+                "module": module.__name__,
+                "class_name": problem_class.__name__,
+                "tags": [tag.value for tag in problem_class.config.tags],
+                "parameters": problem_class.config.parameters,
+                "source": problem_class.config.source,
+                "source_hash": get_source_hash(problem_file),
+            })
+    return manifest
+
+def write_manifest(path: str = MANIFEST_PATH) -> list[dict]:
+    manifest = build_manifest()
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+def get_stale_files(manifest: list[dict]) -> list[str]:
+    """Problem files that were added, removed or changed since the manifest was built."""
+    manifest_hashes = {entry["file"]: entry["source_hash"] for entry in manifest}
+    problem_files = get_problem_files()
+    stale_files = [f for f in manifest_hashes if f not in problem_files]
+    for problem_file in problem_files:
+        if manifest_hashes.get(problem_file) != get_source_hash(problem_file):
+            stale_files.append(problem_file)
+    return stale_files
+
+class ProblemRegistry:
+    """
+    Index of all problems that only imports a problem module once its class is requested.
+
+    The index is read from the prebuilt manifest (see scripts/build_manifest.py). If the manifest is missing
+    or stale, it is rebuilt in memory, which imports all problem modules.
+    """
+
+    def __init__(self, manifest_path: str = MANIFEST_PATH):
+        self.manifest_path = manifest_path
+        self.entries = None
+        self.classes = {}
+        self.lock = threading.RLock()
+
+    def get_entries(self) -> list[dict]:
+        with self.lock:
+            if self.entries is None:
+                self.entries = self.load_entries()
+            return self.entries
+
+    def load_entries(self) -> list[dict]:
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r") as f:
+                manifest = json.load(f)
+            stale_files = get_stale_files(manifest)
+            if len(stale_files) == 0:
+                return manifest
+            logger.warning(f"Problem manifest is stale ({', '.join(stale_files[:5])}{'...' if len(stale_files) > 5 else ''}), "
+                           "rebuild it with `python src/scripts/build_manifest.py`")
+        else:
+            logger.warning(f"Problem manifest {self.manifest_path} not found, importing all problems")
+        return build_manifest()
+
+    def load_class(self, entry: dict) -> type:
+        with self.lock:
+            if entry["name"] not in self.classes:
+                module = importlib.import_module(entry["module"])
+                self.classes[entry["name"]] = getattr(module, entry["class_name"])
+            return self.classes[entry["name"]]
+
+    def get_sorted_entries(self, include_backups: bool = False) -> list[dict]:
+        entries = [entry for entry in self.get_entries() if include_backups or entry["group"] != "backups"]
+        return sorted(entries, key=lambda entry: (entry["group"].lower(), entry["name"].lower()))
+
+    def match_entries(self, regexes: list[str], tags: list[str] = None, include_backups: bool = False) -> list[dict]:
+        """Entries whose name matches any of the regexes and, if tags are given, have any of the tags."""
+        matched = []
+        for entry in self.get_sorted_entries(include_backups):
+            if not any(re.search(regex, entry["name"]) for regex in regexes):
+                continue
+            if tags and not any(tag in entry["tags"] for tag in tags):
+                continue
+            matched.append(entry)
+        return matched
+
+registry = ProblemRegistry()
@@ -29,7 +29,7 @@ class ProblemSMO2013_4(Problem):
         problem_url="https://imomath.com/srb/zadaci/2013_smo.pdf#page=2",
         solution_url="https://imomath.com/srb/zadaci/2013_smo_resenja.pdf#page=5",
         original_parameters={"n": 16},
-        original_solution=get_solution(16),
+        original_solution=lambda: get_solution(16),
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ALL, Tag.IS_SIMPLIFIED, Tag.IS_TRANSLATED]
     )
     n: int 
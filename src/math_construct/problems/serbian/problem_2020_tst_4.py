@@ -29,7 +29,7 @@ class ProblemSerbianTst2020_4(Problem):
         problem_url="https://imomath.com/srb/zadaci/2020_bmo-izborno.pdf",
         solution_url="https://imomath.com/srb/zadaci/2020_bmo-izborno_resenja.pdf#page=3",
         original_parameters={"m": 8}, # reduced from source due to large output size
-        original_solution=get_solution(8),
+        original_solution=lambda: get_solution(8),
         tags=[Tag.NUMBER_THEORY, Tag.FIND_INF, Tag.IS_SIMPLIFIED, Tag.IS_TRANSLATED]
     )
     m: int 
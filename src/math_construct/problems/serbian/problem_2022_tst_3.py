@@ -43,7 +43,7 @@ class ProblemSerbianTst2022_3(Problem):
         problem_url="https://dms.rs/wp-content/uploads/2022/05/ZADACI_IZBORNO_IMO_2022.pdf",
         solution_url="https://dms.rs/wp-content/uploads/2022/05/RESENJA_IZBORNO_IMO_2022.pdf",
         original_parameters={"m": 6}, # reduced from source due to large output size
-        original_solution=get_solution(6),
+        original_solution=lambda: get_solution(6),
         tags=[Tag.NUMBER_THEORY, Tag.FIND_INF, Tag.IS_SIMPLIFIED, Tag.IS_TRANSLATED]
     )
     m: int 
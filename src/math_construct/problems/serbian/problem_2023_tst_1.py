@@ -38,7 +38,7 @@ class ProblemSerbianTst2023_1(Problem):
         problem_url="https://dms.rs/wp-content/uploads/2023/06/IZBORNO_FORMULACIJE_SVE_2023.pdf",
         solution_url="https://dms.rs/wp-content/uploads/2023/06/RESENJA_IZBORNO_SVE_2023.pdf",
         original_parameters={"n": 28, "maxe": 322}, # reduced from source due to large output size
-        original_solution=get_solution(28, 322),
+        original_solution=lambda: get_solution(28, 322),
         tags=[Tag.COMBINATORICS, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED, Tag.IS_TRANSLATED]
     )
     n: int 
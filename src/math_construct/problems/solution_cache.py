@@ -0,0 +1,98 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from typing import Any, Optional
+from loguru import logger
+from math_construct.problems.verdict_cache import DEFAULT_CACHE_DIR, get_shared_code_hash, hash_file
+
+class SolutionCache:
+    """
+    Disk cache of the original solutions of problems, together with their primitive type and depth.
+
+    Each problem is stored in its own file, tagged with the hash of the source of its module and of the shared
+    parsing/checking code (as in the verdict cache). An entry whose hash does not match the current code is
+    treated as missing and overwritten on the next store.
+    The primitive type and depth are stored ahead of the solution, so they can be read without
+    unpickling the (possibly large) solution itself.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.source_hashes = {}
+        self.shared_code_hash = get_shared_code_hash()
+        self.lock = threading.Lock()
+
+    def get_source_hash(self, source_file: str) -> str:
+        with self.lock:
+            if source_file not in self.source_hashes:
+                self.source_hashes[source_file] = hashlib.sha256((self.shared_code_hash + hash_file(source_file)).encode()).hexdigest()
+            return self.source_hashes[source_file]
+
+    def get_path(self, problem_name: str) -> str:
+        return os.path.join(self.cache_dir, f"{problem_name}.pkl")
+
+    def _load(self, problem_name: str, source_file: str, with_solution: bool) -> Optional[tuple]:
+        path = self.get_path(problem_name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                source_hash, primitive_type, depth = pickle.load(f)
+                if source_hash != self.get_source_hash(source_file):
+                    return None
+                solution = pickle.load(f) if with_solution else None
+        except Exception as e:
+            logger.warning(f"Could not load cached solution of {problem_name}: {e}")
+            return None
+        return primitive_type, depth, solution
+
+    # Returns (primitive_type, depth) or None if not cached
+    def get_info(self, problem_name: str, source_file: str) -> Optional[tuple[type, Optional[int]]]:
+        entry = self._load(problem_name, source_file, with_solution=False)
+        return None if entry is None else entry[:2]
+
+    # Returns (found, solution)
+    def get_solution(self, problem_name: str, source_file: str) -> tuple[bool, Any]:
+        entry = self._load(problem_name, source_file, with_solution=True)
+        return (False, None) if entry is None else (True, entry[2])
+
+    def put(self, problem_name: str, source_file: str, info: tuple[type, Optional[int]], solution: Any):
+        header = (self.get_source_hash(source_file), *info)
+        tmp_path = None
+        try:
+            # written to a temporary file first, several processes may store the same problem at once
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(header, f)
+                pickle.dump(solution, f)
+            os.replace(tmp_path, self.get_path(problem_name))
+        except Exception as e:
+            logger.warning(f"Could not cache solution of {problem_name}: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+_cache = None
+_cache_disabled = os.environ.get("MATH_CONSTRUCT_SOLUTION_CACHE", "1") == "0"
+_cache_lock = threading.Lock()
+
+def get_solution_cache() -> Optional[SolutionCache]:
+    """
+    Returns the process-wide solution cache, or None if caching is disabled.
+    The cache lives in $MATH_CONSTRUCT_CACHE_DIR/solutions (default ~/.cache/math_construct), set MATH_CONSTRUCT_SOLUTION_CACHE=0 to disable it.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None and not _cache_disabled:
+            cache_dir = os.environ.get("MATH_CONSTRUCT_CACHE_DIR", DEFAULT_CACHE_DIR)
+            _cache = SolutionCache(os.path.join(cache_dir, "solutions"))
+        return _cache
+
+def set_solution_cache(cache: Optional[SolutionCache]):
+    """Replaces the process-wide solution cache, None disables caching."""
+    global _cache, _cache_disabled
+    with _cache_lock:
+        _cache = cache
+        _cache_disabled = cache is None
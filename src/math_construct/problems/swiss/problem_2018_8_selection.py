@@ -19,8 +19,9 @@ class ProblemSwissSelection20188(Problem):
         solution_url="https://mathematical.olympiad.ch/fileadmin/user_upload/Archiv/Intranet/Olympiads/Mathematics/deploy/exams/2018/Selection/MasterSolution/selectionSolution2018.pdf#page=12",
         source="Swiss Math Olympiad IMO Selection 2020",
         original_parameters={"k": 15},
-        original_solution=get_solution(15),
-        tags=[Tag.IS_SIMPLIFIED, Tag.FIND_ALL, Tag.COMBINATORICS] 
+        original_solution=lambda: get_solution(15),
+        tags=[Tag.IS_SIMPLIFIED, Tag.FIND_ALL, Tag.COMBINATORICS],
+        answer_format={"is_integer": True, "expected_length": "k - 1", "is_unique": True, "min_val_exclusive": 1, "max_val_exclusive": "2 ** k"},
     )
     k: int
 
@@ -38,8 +39,7 @@ class ProblemSwissSelection20188(Problem):
         return 1 if (n & i) == i else 0
         
     def check(self, a: list[int]) -> bool:
-        checker = self.check_format(a, is_integer=True, expected_length=self.k - 1, is_unique=True,
-                                    min_val_exclusive=1, max_val_exclusive=2 ** self.k)
+        checker = self.check_format(a, **self.get_answer_format())
         if not checker[0]:
             return checker
         
@@ -23,8 +23,9 @@ class ProblemSwiss20193(Problem):
         problem_url="https://mathematical.olympiad.ch/fileadmin/user_upload/Archiv/Intranet/Olympiads/Mathematics/deploy/exams/2019/FinalRound/MasterSolution/finalRoundSolution2019.pdf#page=5",
         solution_url="https://mathematical.olympiad.ch/fileadmin/user_upload/Archiv/Intranet/Olympiads/Mathematics/deploy/exams/2019/FinalRound/MasterSolution/finalRoundSolution2019.pdf#page=5",
         original_parameters={"k": 4, "m": 10},
-        original_solution=get_solution(4, 10),
-        tags=[Tag.IS_SIMPLIFIED, Tag.ALGEBRA, Tag.FIND_ALL, Tag.IS_GENERALIZED] 
+        original_solution=lambda: get_solution(4, 10),
+        tags=[Tag.IS_SIMPLIFIED, Tag.ALGEBRA, Tag.FIND_ALL, Tag.IS_GENERALIZED],
+        answer_format={"expected_length": "m", "is_unique": True},
     )
     k: int
     m: int
@@ -37,7 +38,7 @@ class ProblemSwiss20193(Problem):
         return PROBLEM_TEMPLATE.format(k=self.k, m=self.m)
         
     def check(self, a: list[list[int]]) -> bool:
-        checker = self.check_format(a, expected_length=self.m, is_unique=True)
+        checker = self.check_format(a, **self.get_answer_format())
         if not checker[0]:
             return checker
         for i, seq in enumerate(a):
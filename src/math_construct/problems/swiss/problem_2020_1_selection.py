@@ -25,8 +25,9 @@ class ProblemSwissSelection20201(Problem):
         solution_url="https://mathematical.olympiad.ch/fileadmin/user_upload/Archiv/Intranet/Olympiads/Mathematics/deploy/exams/2020/Selection/MasterSolution/selectionSolution2020.pdf#page=1",
         source="Swiss Math Olympiad IMO Selection 2020",
         original_parameters={"n": 6},
-        original_solution=get_solution(6),
-        tags=[Tag.IS_SIMPLIFIED, Tag.FIND_ANY, Tag.COMBINATORICS] 
+        original_solution=lambda: get_solution(6),
+        tags=[Tag.IS_SIMPLIFIED, Tag.FIND_ANY, Tag.COMBINATORICS],
+        answer_format={"is_integer": True, "is_matrix": True, "expected_size_all_axes": [None, 2]},
     )
     n: int
 
@@ -37,8 +38,7 @@ class ProblemSwissSelection20201(Problem):
         return PROBLEM_TEMPLATE.format(n=self.n)
         
     def check(self, a: list[int]) -> bool:
-        checker = self.check_format(a, is_integer=True, is_matrix=True, 
-                                    expected_size_all_axes=[None, 2])
+        checker = self.check_format(a, **self.get_answer_format())
         if not checker[0]:
             return checker
         if any(x < 0 or x >= self.n for y in a for x in y):
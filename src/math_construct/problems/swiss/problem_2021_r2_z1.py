@@ -19,7 +19,7 @@ class ProblemSwiss2021R2Z1(Problem):
         parameters=["n"],
         source="Swiss MO 2021 Round 2 Z1",
         original_parameters={"n": 25},
-        original_solution=get_solution(25),
+        original_solution=lambda: get_solution(25),
         problem_url="https://mathematical.olympiad.ch/fileadmin/user_upload/Archiv/Intranet/Olympiads/Mathematics/deploy/exams/2021/SecondRound/MasterSolution/secondRoundSolution2021.pdf",
         solution_url="https://mathematical.olympiad.ch/fileadmin/user_upload/Archiv/Intranet/Olympiads/Mathematics/deploy/exams/2021/SecondRound/MasterSolution/secondRoundSolution2021.pdf",
         tags=[Tag.NUMBER_THEORY, Tag.IS_SIMPLIFIED, Tag.IS_TRANSLATED, Tag.FIND_ANY]
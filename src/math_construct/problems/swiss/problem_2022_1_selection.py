@@ -32,8 +32,9 @@ class ProblemSwissSelection20221(Problem):
         parameters=["n"],
         source="Swiss Math Olympiad IMO Selection 2022",
         original_parameters={"n": 16},
-        original_solution=get_solution(16),
-        tags=[Tag.IS_SIMPLIFIED, Tag.FIND_ANY, Tag.NUMBER_THEORY] 
+        original_solution=lambda: get_solution(16),
+        tags=[Tag.IS_SIMPLIFIED, Tag.FIND_ANY, Tag.NUMBER_THEORY],
+        answer_format={"min_val_inclusive": 0, "max_val_inclusive": 1, "is_integer": True},
     )
     n: int
 
@@ -44,8 +45,7 @@ class ProblemSwissSelection20221(Problem):
         return PROBLEM_TEMPLATE.format(n=self.n)
         
     def check(self, a: list[int]) -> bool:
-        checker_format = self.check_format(a, min_val_inclusive=0, max_val_inclusive=1,
-                                           is_integer=True)
+        checker_format = self.check_format(a, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         for base in range(2, 100):
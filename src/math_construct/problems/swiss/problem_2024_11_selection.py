@@ -54,8 +54,9 @@ class ProblemSwissSelection202411(Problem):
         solution_url="https://mathematical.olympiad.ch/fileadmin/user_upload/Archiv/Intranet/Olympiads/Mathematics/deploy/exams/2024/Selection/MasterSolution/selectionSolution2024.pdf#page=32",
         source="Swiss Math Olympiad IMO Selection 2024",
         original_parameters={"m": 4, "n": 4, "max_moves": 16},
-        original_solution=get_solution(4, 4),
-        tags=[Tag.IS_SIMPLIFIED, Tag.IS_ORIGINAL, Tag.FIND_MAX_MIN, Tag.COMBINATORICS]  
+        original_solution=lambda: get_solution(4, 4),
+        tags=[Tag.IS_SIMPLIFIED, Tag.IS_ORIGINAL, Tag.FIND_MAX_MIN, Tag.COMBINATORICS],
+        answer_format={"expected_length": "max_moves", "is_integer": True, "is_matrix": True, "min_val_inclusive": 0, "max_val_inclusive": "max(m - 1, n - 1)"},
     )
     m: int
     n: int
@@ -85,9 +86,7 @@ class ProblemSwissSelection202411(Problem):
 
         
     def check(self, a: list[list[list[int]]]) -> bool:
-        checker_format = self.check_format(a, expected_length=self.max_moves, is_integer=True,
-                                           is_matrix=True, min_val_inclusive=0, 
-                                           max_val_inclusive=max(self.m - 1, self.n - 1))
+        checker_format = self.check_format(a, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         current_board = [
@@ -21,7 +21,8 @@ class ProblemSwiss20243(Problem):
         solution_url="https://mathematical.olympiad.ch/fileadmin/user_upload/Archiv/Intranet/Olympiads/Mathematics/deploy/exams/2024/FinalRound/MasterSolution/finalRoundSolution2024.pdf#page=7",
         original_parameters={"min_val": 24, "k": 5},
         original_solution=[math.sqrt(6), math.sqrt(3), math.sqrt(2), 1],
-        tags=[Tag.IS_ORIGINAL, Tag.ALGEBRA, Tag.FIND_ANY, Tag.IS_GENERALIZED]
+        tags=[Tag.IS_ORIGINAL, Tag.ALGEBRA, Tag.FIND_ANY, Tag.IS_GENERALIZED],
+        answer_format={"expected_length": 4, "min_val_exclusive": 0},
     )
     k: int
     min_val: int
@@ -34,7 +35,7 @@ class ProblemSwiss20243(Problem):
         return PROBLEM_TEMPLATE.format(k=self.k, min_val=self.min_val)
         
     def check(self, a: list[float]) -> bool:
-        checker_format = self.check_format(a, expected_length=4, min_val_exclusive=0)
+        checker_format = self.check_format(a, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         a, b, c, d = a
@@ -25,8 +25,9 @@ class ProblemSwissSelection20245(Problem):
         problem_url="https://mathematical.olympiad.ch/fileadmin/user_upload/Archiv/Intranet/Olympiads/Mathematics/deploy/exams/2024/Selection/MasterSolution/selectionSolution2024.pdf#page=13",
         solution_url="https://mathematical.olympiad.ch/fileadmin/user_upload/Archiv/Intranet/Olympiads/Mathematics/deploy/exams/2024/Selection/MasterSolution/selectionSolution2024.pdf#page=13",
         original_parameters={"n": 10},
-        original_solution=get_solution(10),
-        tags=[Tag.IS_SIMPLIFIED, Tag.ALGEBRA, Tag.FIND_ANY] 
+        original_solution=lambda: get_solution(10),
+        tags=[Tag.IS_SIMPLIFIED, Tag.ALGEBRA, Tag.FIND_ANY],
+        answer_format={"is_integer": True, "is_matrix": True, "min_val_exclusive": 0, "expected_size_all_axes": "[2, n]"},
     )
     n: int
 
@@ -37,8 +38,7 @@ class ProblemSwissSelection20245(Problem):
         return PROBLEM_TEMPLATE.format(n=self.n)
         
     def check(self, a: list[list[int]]) -> bool:
-        checker_format = self.check_format(a, is_integer=True, is_matrix=True,
-                                           min_val_exclusive=0, expected_size_all_axes=[2, self.n])
+        checker_format = self.check_format(a, **self.get_answer_format())
         if not checker_format[0]:
             return checker_format
         products = []
@@ -20,7 +20,7 @@ class Problem21(Problem):
         parameters=["n"],
         source="Tournament of Towns 2005",
         original_parameters={"n": 15},
-        original_solution=get_solution(15),
+        original_solution=lambda: get_solution(15),
         problem_url="https://www.math.toronto.edu/oz/turgor/archives/TT2005F_SAsolutions.pdf#page=1",
         solution_url="https://www.math.toronto.edu/oz/turgor/archives/TT2005F_SAsolutions.pdf#page=2",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_SIMPLIFIED],
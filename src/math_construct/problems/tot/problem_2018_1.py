@@ -24,7 +24,7 @@ class Problem16(Problem):
         parameters=["n"],
         source="Tournament of Towns Spring 2018",
         original_parameters={"n": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         problem_url="https://www.maths.usyd.edu.au/u/dzmitry/TT_problems/TT2018JASolutions.pdf#page=1",
         solution_url="https://www.maths.usyd.edu.au/u/dzmitry/TT_problems/TT2018JASolutions.pdf#page=4",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_GENERALIZED],
@@ -0,0 +1,110 @@
+import hashlib
+import re
+from functools import lru_cache
+from typing import Iterator, Optional, Union
+
+# Number of distinct messages whose \boxed{} positions (and parse failures) are kept per process
+BOXED_MESSAGE_CACHE_SIZE = 1 << 12
+
+BOXED_TOKEN_RE = re.compile(r"\\boxed\{|[{}]")
+
+class BoxedMessage:
+    """
+    Contents of every balanced \\boxed{...} in one message, found in a single scan over its braces.
+    Only the contents are kept, not the message, so that the pickled index does not grow with the messages.
+    Instances are shared through the LRU cache of get_boxed_message, so that a message that stays in a
+    transcript over several solver rounds is only scanned once.
+    """
+
+    def __init__(self, text: str):
+        self.is_empty = len(text) == 0
+        # problem class -> (exception type, message) of parsing this message as that problem, None if there was no
+        # answer. Exceptions themselves are not kept, they hold on to their traceback and frames
+        self.parse_failures = {}
+        spans = [] # (start, end) of the content of every balanced \boxed{...}
+        last_start = None # start of the content of the last \boxed{, balanced or not
+        open_braces = [] # content start for \boxed{, None for other braces
+        for match in BOXED_TOKEN_RE.finditer(text):
+            token = match.group()
+            if token == "}":
+                # braces before a \boxed{ never close it, so unmatched ones are skipped
+                if len(open_braces) > 0:
+                    start = open_braces.pop()
+                    if start is not None:
+                        spans.append((start, match.start()))
+            elif token == "{":
+                open_braces.append(None)
+            else:
+                open_braces.append(match.end())
+                last_start = match.end()
+        spans.sort()
+        self.contents = [text[start:end] for start, end in spans] # ordered by start
+        self.last_closed = len(spans) > 0 and spans[-1][0] == last_start
+
+    def get_boxed_contents(self) -> list[str]:
+        """Contents of all balanced \\boxed{...}, in the order they appear (nested ones after their parent)."""
+        return list(self.contents)
+
+    def get_last_boxed_content(self) -> Optional[str]:
+        """
+        Content of the last \\boxed{...}, the one the answer is parsed from.
+        Returns None if there is none or if it is not closed (earlier boxes are not used then).
+        """
+        return self.contents[-1] if self.last_closed else None
+
+@lru_cache(maxsize=BOXED_MESSAGE_CACHE_SIZE)
+def get_boxed_message(text: str) -> BoxedMessage:
+    """Returns the \\boxed{} index of a message, scanning it only on the first call for that message in this process."""
+    return BoxedMessage(text)
+
+def get_fingerprint(message: Union[dict, str]) -> bytes:
+    if isinstance(message, dict):
+        message = f"{message['role']}\0{message['content']}"
+    return hashlib.blake2b(str(message).encode(), digest_size=16).digest()
+
+class TranscriptIndex:
+    """
+    Index of the messages of a transcript that an answer can be parsed from. A transcript that grows over solver
+    rounds is indexed incrementally with extend(), only the new messages are looked at.
+
+    The index holds a 16-byte fingerprint per message and the BoxedMessage of each candidate, i.e. its boxed contents
+    and the parse failures found so far, but none of the message texts. Solvers keep one index per conversation and
+    pass it to check_many, so that it travels to the parse workers and back and earlier rounds are neither scanned
+    nor parsed again; its pickle grows with the number of messages and answers, not with their length.
+    """
+
+    def __init__(self, messages: Optional[list[Union[dict, str]]] = None):
+        self.fingerprints = []
+        self.candidates = [] # (message index, BoxedMessage or content) of messages an answer may be parsed from, in message order
+        if messages is not None:
+            self.extend(messages)
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+    def extend(self, messages: list[Union[dict, str]]) -> "TranscriptIndex":
+        """
+        Indexes the messages past the already indexed prefix. If the transcript does not start with the indexed
+        messages (e.g. a different transcript), the index is rebuilt.
+        """
+        n_indexed = len(self.fingerprints)
+        if len(messages) < n_indexed or any(get_fingerprint(messages[i]) != self.fingerprints[i] for i in range(n_indexed)):
+            self.fingerprints, self.candidates, n_indexed = [], [], 0
+        for i in range(n_indexed, len(messages)):
+            message = messages[i]
+            self.fingerprints.append(get_fingerprint(message))
+            if isinstance(message, str):
+                content = message
+            elif message["role"] == "assistant" or "```" in message["content"]: # code output or assistant message
+                content = message["content"]
+            else:
+                continue
+            self.candidates.append((i, get_boxed_message(content) if isinstance(content, str) else content))
+        return self
+
+    def iter_candidates(self) -> Iterator[tuple[int, Union[str, BoxedMessage]]]:
+        """
+        Yields (message index, BoxedMessage) for the candidate messages in priority order (last message first).
+        Contents that are not strings are yielded as they are.
+        """
+        yield from reversed(self.candidates)
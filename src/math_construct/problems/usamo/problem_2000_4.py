@@ -32,7 +32,7 @@ class Problem14(Problem):
         parameters=["n", "k"],
         source="2000 USAMO Problem 4",
         original_parameters={"n": 10, "k": 18},
-        original_solution=get_solution(10, 18),
+        original_solution=lambda: get_solution(10, 18),
         problem_url="https://artofproblemsolving.com/wiki/index.php/2000_USAMO_Problems/Problem_4",
         solution_url="https://artofproblemsolving.com/wiki/index.php/2000_USAMO_Problems/Problem_4",
         tags=[Tag.COMBINATORICS, Tag.IS_GENERALIZED, Tag.FIND_MAX_MIN],
@@ -60,7 +60,7 @@ class Problem_USAMO_2002_5(Problem):
         parameters=["a", "b"],
         source="2002 USAMO Problem 5",
         original_parameters={"a": 22, "b": 15},
-        original_solution=get_solution(22, 15),
+        original_solution=lambda: get_solution(22, 15),
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_SIMPLIFIED],
         problem_url="https://artofproblemsolving.com/wiki/index.php/2002_USAMO_Problems/Problem_5",
         solution_url="https://artofproblemsolving.com/wiki/index.php/2002_USAMO_Problems/Problem_5",
@@ -54,7 +54,7 @@ class Problem_USAMO_2005_1(Problem):
         parameters=["a", "b", "c", "d"],
         source="2005 USAMO Problem 1",
         original_parameters={"a": 123, "b": 456, "c": 789, "d": 101},
-        original_solution=get_solution(123 * 456 * 789 * 101),
+        original_solution=lambda: get_solution(123 * 456 * 789 * 101),
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY],
         problem_url="https://artofproblemsolving.com/wiki/index.php/2005_USAMO_Problems/Problem_1",
         solution_url="https://artofproblemsolving.com/wiki/index.php/2005_USAMO_Problems/Problem_1",
@@ -19,7 +19,7 @@ class Problem_USAMO_2006_2(Problem):
         parameters=["k", "N"],
         source="2006 USAMO Problem 2",
         original_parameters={"k": 12, "N": 2*12**3 + 3*12**2 + 3*12},
-        original_solution=get_solution(12, 2*12**3 + 3*12**2 + 3*12),
+        original_solution=lambda: get_solution(12, 2*12**3 + 3*12**2 + 3*12),
         tags=[Tag.NUMBER_THEORY, Tag.FIND_MAX_MIN, Tag.IS_SIMPLIFIED],
         problem_url="https://artofproblemsolving.com/wiki/index.php/2006_USAMO_Problems/Problem_2",
         solution_url="https://artofproblemsolving.com/wiki/index.php/2006_USAMO_Problems/Problem_2",
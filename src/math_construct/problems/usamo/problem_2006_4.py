@@ -31,7 +31,7 @@ class Problem_USAMO_2006_4(Problem):
         parameters=["n"],
         source="2006 USAMO Problem 4",
         original_parameters={"n": 51},
-        original_solution=get_solution(51),
+        original_solution=lambda: get_solution(51),
         tags=[Tag.NUMBER_THEORY, Tag.FIND_ANY, Tag.IS_SIMPLIFIED],
         problem_url="https://artofproblemsolving.com/wiki/index.php/2006_USAMO_Problems/Problem_4",
         solution_url="https://artofproblemsolving.com/wiki/index.php/2006_USAMO_Problems/Problem_4",
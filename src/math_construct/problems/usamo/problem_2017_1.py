@@ -32,7 +32,7 @@ class Problem_USAMO_2017_1(Problem):
         parameters=["k"],
         source="2017 USAMO Problem 1",
         original_parameters={"k": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         problem_url="https://artofproblemsolving.com/wiki/index.php/2017_USAMO_Problems/Problem_1",
         solution_url="https://artofproblemsolving.com/wiki/index.php/2017_USAMO_Problems/Problem_1",
         tags=[Tag.NUMBER_THEORY, Tag.FIND_INF, Tag.IS_SIMPLIFIED],
@@ -22,7 +22,7 @@ class Problem3(Problem):
         parameters=["a", "b", "n"],
         source="USAMTS 98/99 Round 4",
         original_parameters={"a": 8, "b": 9, "n": 31},
-        original_solution=get_solution(8, 9, 31),
+        original_solution=lambda: get_solution(8, 9, 31),
         problem_url="https://files.usamts.org/Problems_10_4.pdf",
         solution_url="https://files.usamts.org/Solutions_10_4.pdf",
         tags=[Tag.NUMBER_THEORY, Tag.IS_ORIGINAL, Tag.IS_GENERALIZED, Tag.FIND_ANY]
@@ -19,7 +19,7 @@ class Problem9(Problem):
         parameters=["n"],
         source="USAMTS 01/02 Round 3",
         original_parameters={"n": 21},
-        original_solution=get_solution(21),
+        original_solution=lambda: get_solution(21),
         problem_url="https://files.usamts.org/Problems_13_3.pdf",
         solution_url="https://files.usamts.org/Solutions_13_3.pdf",
         tags=[Tag.ALGEBRA, Tag.FIND_ANY]
@@ -32,7 +32,7 @@ class Problem10(Problem):
         parameters=["k"],
         source="USAMTS 01/02 Round 4 Problem 4",
         original_parameters={"k": 9},
-        original_solution=get_solution(9),
+        original_solution=lambda: get_solution(9),
         problem_url="https://files.usamts.org/Problems_13_4.pdf",
         solution_url="https://files.usamts.org/Solutions_13_4.pdf",
         tags=[Tag.COMBINATORICS, Tag.IS_ORIGINAL, Tag.IS_GENERALIZED, Tag.FIND_MAX_MIN]
@@ -30,7 +30,7 @@ class Problem12(Problem):
         parameters=["k"],
         source="USAMTS 02/03 Round 1",
         original_parameters={"k": 10},
-        original_solution=get_solution(10),
+        original_solution=lambda: get_solution(10),
         problem_url="https://files.usamts.org/Problems_14_1.pdf",
         solution_url="https://files.usamts.org/Solutions_14_1.pdf",
         tags=[Tag.NUMBER_THEORY, Tag.IS_ORIGINAL, Tag.FIND_INF]
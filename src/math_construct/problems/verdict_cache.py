@@ -0,0 +1,190 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Union
+from loguru import logger
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def get_shared_code_files() -> list[str]:
+    """
+    Modules of the parsing/checking code shared by all problems: every module of math_construct except the
+    LLM clients (math_construct/llm) and the problem modules (math_construct/problems/<contest>).
+    """
+    paths = []
+    for root, dirs, files in os.walk(PACKAGE_DIR):
+        relative_root = os.path.relpath(root, PACKAGE_DIR)
+        if relative_root == ".":
+            dirs[:] = [d for d in dirs if d != "llm"]
+        elif relative_root == "problems":
+            dirs[:] = []
+        dirs[:] = [d for d in dirs if d != "__pycache__"]
+        paths.extend(os.path.join(root, name) for name in files if name.endswith(".py"))
+    return sorted(paths)
+
+# Verdicts depend on the problem module and on the shared parsing/checking code
+SHARED_CODE_FILES = get_shared_code_files()
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "math_construct")
+DEFAULT_MAX_ENTRIES = 200_000
+
+# Verdicts that depend on machine load rather than on the answer are never cached
+TRANSIENT_ERRORS = ["did not complete within", "Checker worker died", "Checker pool is shut down"]
+
+def hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def get_shared_code_hash() -> str:
+    """Hash of the shared parsing/checking code (SHARED_CODE_FILES), which verdicts and solutions depend on."""
+    return hashlib.sha256("".join(hash_file(path) for path in SHARED_CODE_FILES).encode()).hexdigest()
+
+def is_cacheable(details: str) -> bool:
+    return not any(err in details for err in TRANSIENT_ERRORS)
+
+def get_relevant_messages(output_str: Union[list[dict[str]], str]) -> list[str]:
+    """The parts of a transcript that Problem.parse looks at."""
+    if isinstance(output_str, str):
+        return [output_str]
+    messages = []
+    for message in output_str:
+        if isinstance(message, str):
+            messages.append(message)
+        elif message["role"] == "assistant" or "```" in (message["content"] or ""):
+            messages.append(message["content"])
+    return messages
+
+class VerdictCache:
+    """
+    Persistent sqlite cache of parse_and_check verdicts.
+
+    Entries are keyed on the problem name, its parameter values, the relevant messages of the transcript
+    and a hash of the checker code. When the source of a problem module changes, all its entries are dropped.
+    The cache keeps at most `max_entries` entries and evicts the least recently used ones.
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS verdicts (
+            key TEXT PRIMARY KEY, problem_name TEXT, value BLOB, last_access REAL)""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS verdicts_last_access ON verdicts (last_access)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS verdicts_problem_name ON verdicts (problem_name)")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS code_versions (
+            problem_name TEXT PRIMARY KEY, code_hash TEXT)""")
+        self.conn.commit()
+        self.shared_code_hash = get_shared_code_hash()
+        self.code_hashes = {}
+        self.n_hits = 0
+        self.n_misses = 0
+
+    def get_code_hash(self, problem_class: type) -> str:
+        """Hash of the checker code of the problem class, invalidates stale entries on first use."""
+        name = problem_class.config.name
+        if name in self.code_hashes:
+            return self.code_hashes[name]
+        code_hash = hashlib.sha256(
+            (self.shared_code_hash + hash_file(inspect.getsourcefile(problem_class))).encode()
+        ).hexdigest()
+        with self.lock:
+            row = self.conn.execute("SELECT code_hash FROM code_versions WHERE problem_name = ?", (name,)).fetchone()
+            if row is None or row[0] != code_hash:
+                if row is not None:
+                    logger.info(f"Source of {name} changed, invalidating its cached verdicts")
+                self.conn.execute("DELETE FROM verdicts WHERE problem_name = ?", (name,))
+                self.conn.execute("INSERT OR REPLACE INTO code_versions VALUES (?, ?)", (name, code_hash))
+                self.conn.commit()
+        self.code_hashes[name] = code_hash
+        return code_hash
+
+    def get_key(self, problem, output_str: Union[list[dict[str]], str]) -> str:
+        param_values = {param: getattr(problem, param) for param in problem.config.parameters}
+        key = json.dumps([
+            problem.config.name,
+            json.dumps(param_values, sort_keys=True, default=str),
+            get_relevant_messages(output_str),
+            self.get_code_hash(type(problem)),
+        ])
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get_many(self, keys: list[str]) -> dict[str, tuple[Any, bool, str, float]]:
+        """Returns a dict from key to (answer, is_correct, details, duration) for the keys found."""
+        found = {}
+        now = time.time()
+        with self.lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self.conn.execute(
+                    f"SELECT key, value FROM verdicts WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, value in rows:
+                    found[key] = pickle.loads(value)
+            self.conn.executemany("UPDATE verdicts SET last_access = ? WHERE key = ?", [(now, key) for key in found])
+            self.conn.commit()
+        self.n_hits += len(found)
+        self.n_misses += len(keys) - len(found)
+        return found
+
+    def get(self, key: str) -> Optional[tuple[Any, bool, str, float]]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, entries: list[tuple[str, str, tuple[Any, bool, str, float]]]):
+        """Stores (key, problem_name, (answer, is_correct, details, duration)) entries."""
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?)",
+                [(key, problem_name, pickle.dumps(value), now) for key, problem_name, value in entries]
+            )
+            n_entries = self.conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+            if n_entries > self.max_entries:
+                self.conn.execute(
+                    "DELETE FROM verdicts WHERE key IN (SELECT key FROM verdicts ORDER BY last_access LIMIT ?)",
+                    (n_entries - self.max_entries,)
+                )
+            self.conn.commit()
+
+    def put(self, key: str, problem_name: str, value: tuple[Any, bool, str, float]):
+        self.put_many([(key, problem_name, value)])
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM verdicts")
+            self.conn.execute("DELETE FROM code_versions")
+            self.conn.commit()
+        self.code_hashes = {}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+_cache = None
+_cache_disabled = os.environ.get("MATH_CONSTRUCT_VERDICT_CACHE", "1") == "0"
+_cache_lock = threading.Lock()
+
+def get_verdict_cache() -> Optional[VerdictCache]:
+    """
+    Returns the process-wide verdict cache, or None if caching is disabled.
+    The cache lives in $MATH_CONSTRUCT_CACHE_DIR (default ~/.cache/math_construct), set MATH_CONSTRUCT_VERDICT_CACHE=0 to disable it.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None and not _cache_disabled:
+            cache_dir = os.environ.get("MATH_CONSTRUCT_CACHE_DIR", DEFAULT_CACHE_DIR)
+            _cache = VerdictCache(os.path.join(cache_dir, "verdicts.sqlite"))
+        return _cache
+
+def set_verdict_cache(cache: Optional[VerdictCache]):
+    """Replaces the process-wide verdict cache, None disables caching."""
+    global _cache, _cache_disabled
+    with _cache_lock:
+        _cache = cache
+        _cache_disabled = cache is None
@@ -2,6 +2,8 @@ import re
 from sympy.parsing.latex import parse_latex
 import sympy
 import sys
+from itertools import chain
+from typing import Optional
 
 def latex2sympy_fixed(latex: str):
     # if _integer is present, replace it with _{integer} for any integer
@@ -52,4 +54,35 @@ def get_depth(solution):
         if len(set(depths)) > 1:
             return None
         return depths[0] + 1
-    return 0
\ No newline at end of file
+    return 0
+
+def get_rectangular_structure(solution):
+    """
+    Flattens a rectangular nested list or tuple in a single pass per level.
+    Returns its shape, the container type at each level, the primitive values in order and their types,
+    or None if the solution is not a list, is empty, ragged, or mixes containers and values at some level.
+    """
+    if not isinstance(solution, (list, tuple)):
+        return None
+    shape, container_types, level = [], [], [solution]
+    while True:
+        types = set(map(type, level))
+        if not types <= {list, tuple}:
+            if types & {list, tuple}:
+                return None
+            return shape, container_types, level, types
+        lengths = set(map(len, level))
+        if len(types) > 1 or len(lengths) > 1:
+            return None
+        shape.append(lengths.pop())
+        container_types.append(types.pop())
+        level = list(chain.from_iterable(level))
+        if len(level) == 0:
+            return None
+
+def get_percentile(values: list[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in [0, 100]) of values, None if there are none."""
+    if len(values) == 0:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values))) - 1))]
@@ -2,10 +2,14 @@ import argparse
 import json
 import os
 import re
-import time 
 import sys
-from math_construct.problems import get_all_problem_classes
+from math_construct.problems import get_all_problem_names, get_problem_class
 from math_construct.problems.problem import CheckerTag
+from math_construct.problems.checker_pool import shutdown_checker_pool
+from math_construct.problems.batch_check import check_many
+from math_construct.problems.verdict_cache import set_verdict_cache
+from math_construct.problems.check_stats import CheckStats, get_check_stats, set_check_stats
+from math_construct.latex_eval import get_branch_timings
 from loguru import logger
 
 # TODO figure out if problem is the original and separate metrics
@@ -13,9 +17,8 @@ from loguru import logger
 # Analyze (parse,check,aggregate) a run from outputs/ or logs/ with optional whitelists
 def analyze_run(run_dir, models_whitelist=None, problems_whitelist=None, no_parser=False, stop_timeout=False, 
                 max_variations=4, lengthstudy=False, tokensstudy=False):
-    # Prepare problem classes
-    problem_classes = get_all_problem_classes()
-    problem_classes = {problem_class.config.name: problem_class for problem_class in problem_classes}
+    # Prepare problem names, the classes are only imported for the problems in the run
+    all_problem_names = get_all_problem_names()
 
     # Find all models
     models = [f for f in os.listdir(run_dir) if os.path.isdir(os.path.join(run_dir, f))]
@@ -43,13 +46,14 @@ def analyze_run(run_dir, models_whitelist=None, problems_whitelist=None, no_pars
             problem_names = filtered_problem_names
         problem_names = sorted(problem_names)
 
-        # Go through problems
+        # Go through problems and load all instances, they are parsed and checked in one batch below
+        pending = []
         for problem_name in problem_names:
             results[model][problem_name] = []
-            if problem_name not in problem_classes:
+            if problem_name not in all_problem_names:
                 logger.warning(f"Problem {problem_name} not found in problem classes")
                 continue
-            problem_class = problem_classes[problem_name]
+            problem_class = get_problem_class(problem_name)
             with open(os.path.join(model_dir, f'{problem_name}.json'), "r") as f:
                 instances_json = json.load(f)
             
@@ -75,33 +79,26 @@ def analyze_run(run_dir, models_whitelist=None, problems_whitelist=None, no_pars
                             break
                         actual_response.append(message)
                     response = actual_response
+                pending.append((problem_name, i, entry, instance, response))
 
-                param_values = entry['problem']['param_values']
-                orig_param_values = entry['problem']['config']['original_parameters']
-                logger.debug(f"Problem: {problem_name}")
-
-                # Parse and check
-                # start timer 
-                ts_start = time.time()
-                answer, is_correct, details = instance.parse_and_check(response)
-
-                if is_correct and not details.startswith("CheckerTag.CORRECT"):
-                    raise ValueError(f"Answer is not correct but details are {details}")
-                
-                type_error = parse_solution_errors(details, response)
-
-                ts_end = time.time()
-                parsecheck_duration = ts_end - ts_start
-                parsecheck_durations[f"{model}/{problem_name}/{i}"] = parsecheck_duration
+        # Parse and check
+        checked, durations = check_many([(instance, response) for _, _, _, instance, response in pending], 
+                                        return_durations=True)
+        for (problem_name, i, entry, instance, response), (answer, is_correct, details), parsecheck_duration in zip(pending, checked, durations):
+            if is_correct and not details.startswith("CheckerTag.CORRECT"):
+                raise ValueError(f"Answer is not correct but details are {details}")
+            
+            type_error = parse_solution_errors(details, response)
+            parsecheck_durations[f"{model}/{problem_name}/{i}"] = parsecheck_duration
 
-                instance_result = entry.copy()
-                instance_result['answer'] = answer
-                instance_result['is_correct'] = is_correct
-                instance_result['parsecheck_details'] = details
-                instance_result["cost"] = entry["cost"]["cost"]
-                instance_result["output_tokens"] = entry["cost"].get("output_tokens", -1)
-                instance_result["type_error"] = type_error
-                results[model][problem_name].append(instance_result)
+            instance_result = entry.copy()
+            instance_result['answer'] = answer
+            instance_result['is_correct'] = is_correct
+            instance_result['parsecheck_details'] = details
+            instance_result["cost"] = entry["cost"]["cost"]
+            instance_result["output_tokens"] = entry["cost"].get("output_tokens", -1)
+            instance_result["type_error"] = type_error
+            results[model][problem_name].append(instance_result)
     
     if tokensstudy:
         tokens = {}
@@ -131,7 +128,7 @@ def analyze_run(run_dir, models_whitelist=None, problems_whitelist=None, no_pars
         error_types = dict()
         detailed_results = []
 
-        for problem_name in list(problem_classes.keys()):
+        for problem_name in all_problem_names:
             if len(res.get(problem_name, [])) == 0:
                 continue
             logger.debug(f"    Problem: {problem_name}")
@@ -172,13 +169,16 @@ def analyze_run(run_dir, models_whitelist=None, problems_whitelist=None, no_pars
             "error_types": normalized_error_types,
             "detailed_results": detailed_results
         }
-    # Optionally print timings 
-    # Sorted 
-    sorted_durations = sorted(parsecheck_durations.items(), key=lambda x: x[1], reverse=True)
-    sorted_durations = [f"{k}: {t:0.4f}s" for k, t in sorted_durations]
-    #logger.info("Parse and check durations:")
-    #for d in sorted_durations:
-    #    logger.info(d)
+    # Print the problems that dominate parse+check time if checker stats are recorded
+    if get_check_stats() is not None:
+        logger.info("Slowest problems (total parse / check time, slowest check relative to the timeout, peak RSS):")
+        for entry in get_check_stats().summarize()[:10]:
+            logger.info(f"    {entry['problem_name']}: {entry['parse_time_total']:0.3f}s / {entry['check_time_total']:0.3f}s, "
+                        f"{entry['max_timeout_fraction'] or 0:0.1%} of timeout, {entry['peak_rss_mb_max'] or 0:0.0f} MB, "
+                        f"{entry['n_timeouts']} timeouts")
+        logger.info("Time spent evaluating answer tokens per branch (count, total, mean):")
+        for branch, timing in get_branch_timings().to_dict().items():
+            logger.info(f"    {branch}: {timing['count']}, {timing['time_total']:0.3f}s, {1000 * timing['time_mean']:0.3f}ms")
     if lengthstudy:
         print(f"Problem names: {problem_names}")
         # dirty, save a bit of a different txt 
@@ -193,7 +193,7 @@ def analyze_run(run_dir, models_whitelist=None, problems_whitelist=None, no_pars
                     assert(len(chek) == 1)
 
                     try:
-                        problem_class = problem_classes[problem_name]
+                        problem_class = get_problem_class(problem_name)
                         instance_result = results[models[0]][problem_name][i]
                         instance = problem_class.from_json(instance_result["problem"])
                     except Exception as e:
@@ -269,7 +269,12 @@ if __name__ == "__main__":
     parser.add_argument("--no-cost", action="store_true", help="Do not print cost in the latex results")
     parser.add_argument("--lengthstudy", action="store_true", help="Tmp flag for diff output processing")
     parser.add_argument("--tokensstudy", action="store_true", help="Tmp flag for tokens study")
+    parser.add_argument("--no-verdict-cache", action="store_true", help="Re-parse and re-check all answers instead of using cached verdicts")
+    parser.add_argument("--checker-stats", type=str, choices=["jsonl", "csv"], default=None, 
+                        help="Record parse/check times, checker peak RSS, timeouts and answer sizes per problem and write them to the run directory. Disables the verdict cache.")
     args = parser.parse_args()
+    if args.no_verdict_cache or args.checker_stats is not None:
+        set_verdict_cache(None)
     if args.only_info:
         logger.remove()
         logger.add(sys.stdout, level="INFO")
@@ -278,11 +283,19 @@ if __name__ == "__main__":
     if args.reload and os.path.exists(args.store_file):
         runs_results = json.load(open(args.store_file, "r"))
     
-    for run in args.run:
-        if any([run == r["name"] for r in runs_results]):
-            continue
-        results, model_results = analyze_run(run, args.models, args.problems, args.no_parser, args.stop_timeout, args.max_variations, args.lengthstudy, args.tokensstudy)
-        runs_results.append({"name": run, "model_results": model_results})
+    try:
+        for run in args.run:
+            if any([run == r["name"] for r in runs_results]):
+                continue
+            if args.checker_stats is not None:
+                set_check_stats(CheckStats())
+            results, model_results = analyze_run(run, args.models, args.problems, args.no_parser, args.stop_timeout, args.max_variations, args.lengthstudy, args.tokensstudy)
+            runs_results.append({"name": run, "model_results": model_results})
+            if args.checker_stats is not None:
+                paths = get_check_stats().write(run, args.checker_stats)
+                logger.info(f"Wrote checker stats to {', '.join(paths)}")
+    finally:
+        shutdown_checker_pool()
 
     all_models = set()
     for run_result in runs_results:
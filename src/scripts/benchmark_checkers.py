@@ -0,0 +1,78 @@
+import argparse
+import json
+import os
+import sys
+from loguru import logger
+from math_construct.problems import get_all_problem_classes, get_matching_problem_classes
+from math_construct.problems.checker_pool import shutdown_checker_pool
+from math_construct.problems.checker_benchmark import DEFAULT_MIN_TIME, benchmark_checkers, compare_results
+
+# Times check() of every problem on the original solution, generated and scaled-up instances and a known-bad answer.
+# Save a baseline with --save, then compare later runs against it with --compare.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--problems", type=str, nargs="+", default=None, help="Regexes of problems to benchmark, all problems by default")
+    parser.add_argument("--n-instances", type=int, default=3, help="Number of generated instances per problem (besides the original)")
+    parser.add_argument("--scale", type=float, default=2, help="Factor applied to the integer parameters of the scaled-up instance")
+    parser.add_argument("--n-repeats", type=int, default=3, help="Number of timed check() calls per case, the minimum is compared")
+    parser.add_argument("--timeout", type=float, default=None, help="Timeout per check() call, defaults to the timeout of each problem")
+    parser.add_argument("--save", type=str, default=None, help="File to save the results to, e.g. to use them as a baseline")
+    parser.add_argument("--compare", type=str, default=None, help="Baseline file to compare the results with, exits with 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown above which a case is reported as a regression")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="Cases faster than this (in seconds) are never regressions")
+    args = parser.parse_args()
+
+    if args.problems is not None:
+        problem_classes = get_matching_problem_classes(args.problems)
+    else:
+        problem_classes = get_all_problem_classes()
+    logger.info(f"Benchmarking the checkers of {len(problem_classes)} problems")
+    try:
+        results = benchmark_checkers(problem_classes, n_instances=args.n_instances, scale=args.scale,
+                                     n_repeats=args.n_repeats, timeout=args.timeout)
+    finally:
+        shutdown_checker_pool()
+
+    if args.save is not None:
+        if os.path.dirname(args.save):
+            os.makedirs(os.path.dirname(args.save), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=4, default=str)
+        logger.info(f"Saved benchmark results to {args.save}")
+
+    errors = [
+        (name, case_name, case["error"]) for name, cases in results["problems"].items()
+        for case_name, case in (cases.items() if "error" not in cases else [("all", cases)]) if "error" in case
+    ]
+    for name, case_name, error in errors:
+        logger.warning(f"{name} ({case_name}): {error}")
+    accepted_bad = [name for name, cases in results["problems"].items() if cases.get("bad", {}).get("is_correct")]
+    if len(accepted_bad) > 0:
+        logger.warning(f"Known-bad answers accepted by: {accepted_bad}")
+
+    slowest = sorted(
+        ((case["time_min"], name, case_name) for name, cases in results["problems"].items()
+         for case_name, case in cases.items() if isinstance(case, dict) and "time_min" in case),
+        reverse=True,
+    )
+    logger.info("Slowest checks:")
+    for time_min, name, case_name in slowest[:10]:
+        logger.info(f"    {name} ({case_name}): {time_min:.4f}s")
+
+    if args.compare is not None:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        comparison = compare_results(baseline, results, args.threshold, args.min_time)
+        regressions = [entry for entry in comparison if entry["status"] in ("regression", "verdict_changed", "error")]
+        improvements = [entry for entry in comparison if entry["status"] == "improvement"]
+        for entry in improvements:
+            logger.info(f"Faster: {entry['problem_name']} ({entry['case']}): {entry['baseline']:.4f}s -> {entry['current']:.4f}s")
+        for entry in regressions:
+            if entry["status"] == "regression":
+                logger.error(f"Slower: {entry['problem_name']} ({entry['case']}): {entry['baseline']:.4f}s -> {entry['current']:.4f}s ({entry['ratio']:.2f}x)")
+            else:
+                logger.error(f"{entry['status']}: {entry['problem_name']} ({entry['case']})")
+        logger.info(f"Compared {len(comparison)} cases with {args.compare}: {len(regressions)} regressions, {len(improvements)} improvements")
+        if len(regressions) > 0:
+            sys.exit(1)
@@ -0,0 +1,57 @@
+import argparse
+import glob
+import json
+import os
+import sys
+from loguru import logger
+from math_construct.problems.parser_benchmark import benchmark_parser, collect_answers, compare_outputs
+
+# Times the answer parser on every \boxed{} payload of recorded runs (outputs/ and logs/) and data files (data/*.json).
+# Save the outputs with --save, then check later runs against them with --golden to catch behaviour changes.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=str, nargs="+", default=None, help="Run directories, defaults to all runs in outputs/ and logs/")
+    parser.add_argument("--data", type=str, nargs="+", default=None, help="JSON data files, defaults to data/*.json")
+    parser.add_argument("--n-repeats", type=int, default=1, help="Number of timed passes over the answers, the minimum is reported")
+    parser.add_argument("--n-slowest", type=int, default=10, help="Number of slowest answers to report")
+    parser.add_argument("--save", type=str, default=None, help="File to save the results (and outputs) to, e.g. to use them as golden outputs")
+    parser.add_argument("--golden", type=str, default=None, help="Results file with the expected outputs, exits with 1 if any output changed")
+    args = parser.parse_args()
+
+    runs = args.runs
+    if runs is None:
+        runs = sorted(d for d in glob.glob("outputs/*") + glob.glob("logs/*") if os.path.isdir(d))
+    data_files = args.data if args.data is not None else sorted(glob.glob("data/*.json"))
+    answers = collect_answers(runs, data_files)
+    logger.info(f"Collected {len(answers)} answers from {len(runs)} runs and {len(data_files)} data files")
+
+    results = benchmark_parser(answers, n_repeats=args.n_repeats, n_slowest=args.n_slowest)
+    summary = results["summary"]
+    logger.info(f"Parsed {summary['n_answers']} answers ({summary['n_errors']} errors) in {summary['time_total']:.3f}s: "
+                f"{summary['answers_per_second'] or 0:.1f} answers/s, {summary['mb_per_second'] or 0:.3f} MB/s")
+    logger.info(f"Latency p50 {1000 * (summary['time_p50'] or 0):.3f}ms, p90 {1000 * (summary['time_p90'] or 0):.3f}ms, "
+                f"p99 {1000 * (summary['time_p99'] or 0):.3f}ms, max {1000 * (summary['time_max'] or 0):.3f}ms")
+    logger.info("Slowest answers:")
+    for entry in results["slowest"]:
+        logger.info(f"    {entry['problem_name']} ({entry['time']:.4f}s, {entry['answer_length']} chars): {entry['answer'][:80]!r}")
+
+    if args.save is not None:
+        if os.path.dirname(args.save):
+            os.makedirs(os.path.dirname(args.save), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=4)
+        logger.info(f"Saved benchmark results to {args.save}")
+
+    if args.golden is not None:
+        with open(args.golden, "r") as f:
+            golden = json.load(f)
+        changed = compare_outputs(golden, results)
+        for entry in changed:
+            expected, current = entry["expected"], entry["current"]
+            logger.error(f"Changed: {entry['problem_name']} ({entry['key']}): "
+                         f"{expected['error'] or expected['output']!r} -> {current['error'] or current['output']!r}")
+        n_compared = sum(key in golden["outputs"] for key in results["outputs"])
+        logger.info(f"Compared {n_compared} outputs with {args.golden}: {len(changed)} changed")
+        if len(changed) > 0:
+            sys.exit(1)
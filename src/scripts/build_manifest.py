@@ -0,0 +1,27 @@
+import argparse
+import json
+import os
+import sys
+from math_construct.problems.registry import MANIFEST_PATH, get_stale_files, write_manifest
+from loguru import logger
+
+# Rebuilds the problem manifest used to look up problems without importing every problem module
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check", action="store_true", help="Only check whether the manifest is up to date, exits with 1 if it is stale")
+    args = parser.parse_args()
+
+    if args.check:
+        if not os.path.exists(MANIFEST_PATH):
+            logger.error(f"Problem manifest {MANIFEST_PATH} not found")
+            sys.exit(1)
+        with open(MANIFEST_PATH, "r") as f:
+            stale_files = get_stale_files(json.load(f))
+        if len(stale_files) > 0:
+            logger.error(f"Problem manifest is stale: {stale_files}")
+            sys.exit(1)
+        logger.info("Problem manifest is up to date")
+    else:
+        manifest = write_manifest()
+        logger.info(f"Wrote {len(manifest)} problems to {MANIFEST_PATH}")
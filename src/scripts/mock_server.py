@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import json
+import sys
+from loguru import logger
+from config.meta_config import get_pydantic_models_from_path
+from math_construct.llm.mock_server import MockLLMServer
+from math_construct.llm.mock_responders import ReplayResponder, SolutionResponder, load_problem_instances
+from math_construct.problems import get_matching_problem_classes
+from math_construct.problems.generation import generate_variations
+
+# A local OpenAI/Anthropic compatible server to run (and load test) run.py offline. Point a config at it with
+# inference.base_url: http://127.0.0.1:<port>/v1 (without /v1 for anthropic: models) and any API key, e.g.
+# OPENAI_API_KEY=mock. Answers are replayed from recorded runs (--replay) or built from the solutions of the
+# problems of a config (--config) or a problems file (--problems-file), echoes otherwise.
+
+def get_config_problems(config_path: str) -> list:
+    """The problem instances run.py builds for a config (generation is seeded per problem)."""
+    cfg = get_pydantic_models_from_path(config_path)[0]
+    if cfg.input_dir_revisions is not None:
+        return load_problem_instances(cfg.input_dir_revisions)
+    problem_classes = get_matching_problem_classes(cfg.problems, cfg.tags)
+    variations = generate_variations(problem_classes, cfg.n_variations, cfg.n_try_variations, n_workers=cfg.n_generation_workers)
+    return [problem for problems in variations for problem in problems]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--replay", type=str, nargs="+", default=None, help="Run directories whose recorded responses are replayed")
+    parser.add_argument("--replay-model", type=str, default=None, help="Model of the runs to replay, defaults to all")
+    parser.add_argument("--config", type=str, default=None, help="Run config whose problems are answered with their solutions")
+    parser.add_argument("--problems-file", type=str, default=None, help="Problems file (e.g. data/revised_problems.json) answered with their solutions")
+    parser.add_argument("--latency", type=str, default="fixed:0", help="Time to first token: fixed:<s>, uniform:<a>,<b>, exponential:<mean> or lognormal:<mu>,<sigma>")
+    parser.add_argument("--tokens-per-second", type=float, default=None, help="Decoding speed, defaults to instant")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with a 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 500")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After of the 429 responses in seconds")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="Concurrent requests above which requests get a 429")
+    parser.add_argument("--batch-delay", type=float, default=10.0, help="Seconds until a submitted batch is done")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sys.set_int_max_str_digits(0) # some solutions in the problems files are huge integers
+    responder = None
+    if args.replay is not None:
+        responder = ReplayResponder(args.replay, args.replay_model)
+    elif args.config is not None:
+        responder = SolutionResponder(get_config_problems(args.config))
+    elif args.problems_file is not None:
+        responder = SolutionResponder(load_problem_instances(args.problems_file))
+
+    server = MockLLMServer(
+        host=args.host,
+        port=args.port,
+        responder=responder,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        rate_limit_rate=args.rate_limit_rate,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+        max_in_flight=args.max_in_flight,
+        batch_delay=args.batch_delay,
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info(f"Server stats: {json.dumps(server.stats)}")
@@ -1,14 +1,15 @@
 import argparse
 import json
 import os
-import re
 import sys 
 from datetime import datetime
-from math_construct.problems import get_problem_class, get_all_problem_classes
-from math_construct.llm import DummyLLM, APIQuery, CoTSolver, CodeSolver
+from math_construct.problems import get_problem_class, get_matching_problem_classes
+from math_construct.problems.checker_pool import shutdown_checker_pool
+from math_construct.problems.generation import generate_variations
+from math_construct.llm import DummyLLM, APIQuery, CoTSolver, CodeSolver, BoxedAnswerStop, ByteBudgetStop
+from math_construct.llm.telemetry import TELEMETRY_FILE, log_summary, summarize_telemetry
 from config.meta_config import get_pydantic_models_from_path
 from loguru import logger
-from tqdm import tqdm
 
 # Disable Langchain tracing
 os.environ["LANGCHAIN_TRACING_V2"] = "false"
@@ -34,11 +35,6 @@ def result_to_string(result):
             end_string += message["content"] + "\n"
     return end_string
 
-def satisfies_tags(problem_inst, tags):
-    if not tags:
-        return True
-    return any(tag in problem_inst.config.tags for tag in tags)
-
 def distance(problem1, problem2):
     # for all parameters in problem1.config.parameters, calculate the distance between the values of the parameters if they are floats
     distance = 0
@@ -106,18 +102,8 @@ def run(cfg, apis_restricted=None, models_restricted=None) -> None:
 
     logger.info(f"Models: { cfg.models}")
     # Find the problems
-    all_problems = get_all_problem_classes()
-
-    matched_problems = []
-    for problem in all_problems:
-        # Any regex should match 
-        for regex in cfg.problems:
-            if re.search(regex, problem.config.name):
-                matched_problems.append(problem)
-                break
-
-    if len(cfg.tags) > 0:
-        matched_problems = [ci for ci in matched_problems if satisfies_tags(ci, cfg.tags)]
+    # Only the matched problem modules are imported
+    matched_problems = get_matching_problem_classes(cfg.problems, cfg.tags)
 
     logger.info(f"Matched problems: {[p.config.name for p in matched_problems]}")
     logger.info(f"Total matched problems: {len(matched_problems)}")
@@ -140,12 +126,11 @@ def run(cfg, apis_restricted=None, models_restricted=None) -> None:
                 problem_instances.append((problem_class, problem_instance))
     else:
         problem_instances = [] # (class, instance) pair
-        for problem_class in tqdm(matched_problems):
-            if cfg.n_try_variations is None:
-                curr_instances = problem_class.generate_multiple(cfg.n_variations)
-            else:
-                curr_instances = filter_problems(problem_class.generate_multiple_explicit(cfg.n_try_variations), 
-                                                 cfg.n_variations)
+        all_variations = generate_variations(matched_problems, cfg.n_variations, cfg.n_try_variations, 
+                                             n_workers=cfg.n_generation_workers)
+        for problem_class, curr_instances in zip(matched_problems, all_variations):
+            if cfg.n_try_variations is not None:
+                curr_instances = filter_problems(curr_instances, cfg.n_variations)
             for inst in curr_instances:
                     problem_instances.append((problem_class, inst))
 
@@ -188,6 +173,11 @@ def run(cfg, apis_restricted=None, models_restricted=None) -> None:
                     problem_dumps[problem_class] = []
                 problem_dumps[problem_class].append(None)
 
+        stop_predicates = []
+        if cfg.inference.stop_after_boxed_tokens is not None:
+            stop_predicates.append(BoxedAnswerStop(cfg.inference.stop_after_boxed_tokens))
+        if cfg.inference.max_output_bytes is not None:
+            stop_predicates.append(ByteBudgetStop(cfg.inference.max_output_bytes))
         querier = APIQuery(
             model=model_name,
             api=api,
@@ -195,7 +185,18 @@ def run(cfg, apis_restricted=None, models_restricted=None) -> None:
             top_p=cfg.inference.top_p,
             max_tokens=cfg.inference.max_tokens,
             concurrent_requests=cfg.inference.concurrent_requests,
-            timeout=cfg.inference.timeout
+            timeout=cfg.inference.timeout,
+            requests_per_minute=cfg.inference.requests_per_minute,
+            tokens_per_minute=cfg.inference.tokens_per_minute,
+            cache_dir=cfg.inference.cache_dir,
+            cache_mode=cfg.inference.cache_mode,
+            stream=cfg.inference.stream,
+            stop_predicates=stop_predicates,
+            batch=cfg.inference.batch,
+            batch_dir=cfg.inference.batch_dir,
+            batch_poll_interval=cfg.inference.batch_poll_interval,
+            telemetry_path=os.path.join(run_dir, TELEMETRY_FILE) if not cfg.test_run else None,
+            base_url=cfg.inference.base_url,
         )
         if cfg.solver.type_solver == "code":
             solver = CodeSolver(
@@ -276,8 +277,17 @@ def run(cfg, apis_restricted=None, models_restricted=None) -> None:
                         json.dump(dumps, f, indent=4)
                     print(f"Finished and saved:", problem_path)
 
+        if querier.telemetry is not None:
+            querier.telemetry.close()
         logger.info("Run finished")
 
+    telemetry_path = os.path.join(run_dir, TELEMETRY_FILE)
+    if not cfg.test_run and os.path.exists(telemetry_path):
+        summary = summarize_telemetry(telemetry_path)
+        log_summary(summary)
+        with open(os.path.join(run_dir, "telemetry_summary.json"), "w") as f:
+            json.dump(summary, f, indent=4)
+
 
 if __name__ == "__main__":
     import argparse
@@ -291,4 +301,7 @@ if __name__ == "__main__":
     cfg = get_pydantic_models_from_path(args.config)[0]
     logger.info(f"Running config: {cfg}")
     with logger.catch(reraise=True):
-        run(cfg, apis_restricted=args.apis, models_restricted=args.models)
+        try:
+            run(cfg, apis_restricted=args.apis, models_restricted=args.models)
+        finally:
+            shutdown_checker_pool()
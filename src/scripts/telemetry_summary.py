@@ -0,0 +1,30 @@
+import argparse
+import json
+import os
+from loguru import logger
+from math_construct.llm.telemetry import TELEMETRY_FILE, load_events, log_summary, summarize_events
+
+# Summarizes the request telemetry of runs (outputs/<run>/telemetry.jsonl) per provider and model, e.g. over all
+# runs of a run.sh sweep to find the providers that bottleneck it and to tune concurrent_requests per model.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("runs", type=str, nargs="+", help="Run directories (or telemetry files)")
+    parser.add_argument("--save", type=str, default=None, help="File to save the summary to")
+    args = parser.parse_args()
+
+    events = []
+    for run in args.runs:
+        path = os.path.join(run, TELEMETRY_FILE) if os.path.isdir(run) else run
+        if not os.path.exists(path):
+            logger.warning(f"No telemetry in {run}")
+            continue
+        events += load_events(path)
+    summary = {"n_events": len(events), "providers": summarize_events(events, "provider"), "models": summarize_events(events, "model")}
+    logger.info(f"Loaded {len(events)} request events from {len(args.runs)} runs")
+    log_summary(summary)
+
+    if args.save is not None:
+        with open(args.save, "w") as f:
+            json.dump(summary, f, indent=4)
+        logger.info(f"Saved the summary to {args.save}")
@@ -0,0 +1,390 @@
+import asyncio
+import json
+import threading
+import time
+import httpx
+import pytest
+from openai import AsyncOpenAI
+from math_construct.llm import APIQuery
+from math_construct.llm import clients
+from math_construct.llm.clients import get_client_pool, run_sync
+from math_construct.llm.response_cache import ResponseCache
+from math_construct.llm.streaming import BoxedAnswerStop, ByteBudgetStop
+from math_construct.llm.mock_server import MockLLMServer, count_tokens
+from math_construct.llm.mock_responders import ReplayResponder, SolutionResponder
+from math_construct.llm.telemetry import load_events, summarize_telemetry
+from math_construct.llm.rate_limit import FATAL, RATE_LIMITED, RETRYABLE, classify_error, get_rate_limiter, parse_duration, reset_rate_limiters
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limiters():
+    # the limiters are shared per provider within a process
+    reset_rate_limiters()
+    yield
+    reset_rate_limiters()
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    # the clients of run_queries outlive the call, so a test's mock transports must not leak into the next one
+    yield
+    run_sync(get_client_pool().aclose())
+
+def chat_completion(content: str, prompt_tokens: int = 10, completion_tokens: int = 5) -> dict:
+    return {
+        "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+    }
+
+def use_mock_transport(monkeypatch, handler):
+    """Makes the client pool create OpenAI clients whose requests go to handler instead of the network."""
+    created = []
+    def create_async_client(api, api_key, base_url=None, timeout=None):
+        client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0,
+                             http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        created.append(client)
+        return client
+    monkeypatch.setattr(clients, "create_async_client", create_async_client)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    return created
+
+def event_stream(events: list[dict], sent: list, done: bool = True) -> httpx.Response:
+    """A server-sent event response, `sent` records how many events the client actually read."""
+    async def body():
+        for event in events:
+            sent.append(event)
+            name = f"event: {event['type']}\n" if "type" in event else ""
+            yield f"{name}data: {json.dumps(event)}\n\n".encode()
+            await asyncio.sleep(0)
+        if done:
+            yield b"data: [DONE]\n\n"
+    return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body())
+
+def chat_chunks(deltas: list[str], prompt_tokens: int = 10) -> list[dict]:
+    chunk = {"id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o"}
+    chunks = [{**chunk, "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]} for delta in deltas]
+    usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(deltas), "total_tokens": prompt_tokens + len(deltas)}
+    return chunks + [{**chunk, "choices": [], "usage": usage}]
+
+def test_async_queries(monkeypatch):
+    state = {"in_flight": 0, "max_in_flight": 0, "max_threads": 0}
+    async def handler(request):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        state["max_threads"] = max(state["max_threads"], threading.active_count())
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        content = json.loads(request.content)["messages"][-1]["content"]
+        return httpx.Response(200, json=chat_completion(f"answer to {content}"))
+    created = use_mock_transport(monkeypatch, handler)
+
+    querier = APIQuery("gpt-4o", api="openai", concurrent_requests=100, sleep_after_request=0)
+    n_threads = threading.active_count()
+    outputs, detailed_cost, cost = querier.run_queries([[{"role": "user", "content": str(i)}] for i in range(300)])
+    assert outputs == [f"answer to {i}" for i in range(300)]
+    assert cost["input_tokens"] == 3000 and cost["output_tokens"] == 1500 and len(detailed_cost) == 300
+    # one client for all requests, at most concurrent_requests in flight, no thread per request
+    # (only tqdm's monitor and the bounded default executor of the event loop)
+    assert len(created) == 1 and 50 < state["max_in_flight"] <= 100
+    assert state["max_threads"] <= n_threads + 40
+    # the client (and its connections) is kept for the next call, e.g. the next round of a solver
+    assert len(get_client_pool()) == 1
+    querier.run_queries([[{"role": "user", "content": "again"}]])
+    assert len(created) == 1 and len(get_client_pool()) == 1
+
+def test_parse_duration():
+    assert parse_duration("30") == 30
+    assert parse_duration("6m0s") == 360
+    assert parse_duration("1h2m3.5s") == 3723.5
+    assert parse_duration("150ms") == 0.15
+    assert parse_duration("2000-01-01T00:00:00Z") == 0 # in the past
+    assert 50 < parse_duration("2999-01-01T00:00:00Z")
+    assert parse_duration("soon") is None
+
+def test_classify_error():
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    def status_error(status, headers=None):
+        from openai import APIStatusError
+        return APIStatusError("error", response=httpx.Response(status, headers=headers, request=request), body=None)
+    assert classify_error(status_error(429, {"retry-after": "7"})) == (RATE_LIMITED, 7)
+    assert classify_error(status_error(429, {"x-ratelimit-remaining-tokens": "0", "x-ratelimit-reset-tokens": "1m30s"})) == (RATE_LIMITED, 90)
+    assert classify_error(status_error(503, {"retry-after-ms": "500"})) == (RETRYABLE, 0.5)
+    assert classify_error(status_error(400)) == (FATAL, None)
+    assert classify_error(status_error(401)) == (FATAL, None)
+    assert classify_error(httpx.ConnectError("refused")) == (RETRYABLE, None)
+    assert classify_error(ValueError("rate limit exceeded")) == (RATE_LIMITED, None)
+
+def test_rate_limited_queries(monkeypatch):
+    state = {"calls": {}, "in_flight": 0, "max_in_flight_after_429": 0, "seen_429": False}
+    async def handler(request):
+        content = json.loads(request.content)["messages"][-1]["content"]
+        state["calls"][content] = state["calls"].get(content, 0) + 1
+        if content == "bad":
+            return httpx.Response(400, json={"error": {"message": "invalid request"}})
+        if content == "flaky" and state["calls"][content] == 1:
+            return httpx.Response(500, json={"error": {"message": "server error"}})
+        if content == "limited" and state["calls"][content] == 1:
+            state["seen_429"] = True
+            return httpx.Response(429, headers={"retry-after": "0.05"}, json={"error": {"message": "slow down"}})
+        state["in_flight"] += 1
+        if state["seen_429"]:
+            state["max_in_flight_after_429"] = max(state["max_in_flight_after_429"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        return httpx.Response(200, json=chat_completion(f"answer to {content}"))
+    use_mock_transport(monkeypatch, handler)
+
+    querier = APIQuery("gpt-4o", api="openai", concurrent_requests=16, sleep_after_request=0, backoff_base=0.01, sleep_on_error=0.05)
+    queries = ["limited", "flaky", "bad"] + [str(i) for i in range(40)]
+    outputs, _, cost = querier.run_queries([[{"role": "user", "content": query}] for query in queries])
+    assert outputs == ["answer to limited", "answer to flaky", ""] + [f"answer to {i}" for i in range(40)]
+    assert state["calls"]["bad"] == 1 # fatal errors are not retried
+    assert state["calls"]["limited"] == 2 and state["calls"]["flaky"] == 2
+    assert cost["input_tokens"] == 42 * 10
+
+    stats = querier.get_rate_limiter().get_stats()
+    assert stats[RATE_LIMITED] == 1 and stats[RETRYABLE] == 1 and stats[FATAL] == 1
+    assert stats["successes"] == 42 and stats["requests"] == 45
+    assert stats["concurrency_decreases"] == 1
+    # the concurrency was halved on the rate limit and then grew back one request at a time
+    assert state["max_in_flight_after_429"] <= 16
+
+def test_requests_per_minute(monkeypatch):
+    async def handler(request):
+        return httpx.Response(200, json=chat_completion("ok"))
+    use_mock_transport(monkeypatch, handler)
+
+    # a bucket of 600 requests per minute starts full and then refills at 10 requests per second
+    querier = APIQuery("gpt-4o", api="openai", concurrent_requests=50, sleep_after_request=0, requests_per_minute=600)
+    limiter = querier.get_rate_limiter()
+    limiter.request_bucket.level = 0
+    ts_start = time.monotonic()
+    outputs, _, _ = querier.run_queries([[{"role": "user", "content": str(i)}] for i in range(5)])
+    assert outputs == ["ok"] * 5
+    assert time.monotonic() - ts_start >= 0.4
+    assert limiter.get_stats()["throttle_wait"] > 0
+
+def test_rate_limiter_per_model_and_limits():
+    limiter = get_rate_limiter("openai", None, "gpt-4o", 50, requests_per_minute=600)
+    limiter.on_error(RATE_LIMITED, retry_after=30)
+    assert get_rate_limiter("openai", None, "gpt-4o", 50, requests_per_minute=600) is limiter
+
+    # different limits or another model get a fresh limiter, without the halved concurrency and the pause
+    for other in (get_rate_limiter("openai", None, "gpt-4o", 8, tokens_per_minute=1000), get_rate_limiter("openai", None, "gpt-4o-mini", 50, requests_per_minute=600)):
+        assert other is not limiter and other.concurrency == other.max_concurrency and other.get_wait(0) == 0
+    other = get_rate_limiter("openai", None, "gpt-4o", 8, tokens_per_minute=1000)
+    assert other.max_concurrency == 8 and other.request_bucket is None and other.token_bucket.per_minute == 1000
+
+def test_sleep_after_request(monkeypatch):
+    in_flight = []
+    async def handler(request):
+        in_flight.append(limiter.in_flight)
+        return httpx.Response(200, json=chat_completion("ok"))
+    use_mock_transport(monkeypatch, handler)
+
+    # the sleep after a request does not hold its slot, the next request is sent while the first one sleeps
+    querier = APIQuery("gpt-4o", api="openai", concurrent_requests=1, sleep_after_request=0.5)
+    limiter = querier.get_rate_limiter()
+    ts_start = time.monotonic()
+    outputs, _, _ = querier.run_queries([[{"role": "user", "content": str(i)}] for i in range(3)])
+    assert outputs == ["ok"] * 3 and in_flight == [1, 1, 1]
+    assert time.monotonic() - ts_start < 1.0 and limiter.in_flight == 0
+
+def test_response_cache(monkeypatch, tmp_path):
+    n_calls = {"n": 0}
+    async def handler(request):
+        n_calls["n"] += 1
+        body = json.loads(request.content)
+        return httpx.Response(200, json=chat_completion(f"sample {n_calls['n']} t={body['temperature']}", prompt_tokens=1000000))
+    use_mock_transport(monkeypatch, handler)
+    queries = [[{"role": "user", "content": "q"}]] * 3 + [[{"role": "user", "content": "r"}]]
+
+    querier = APIQuery("gpt-4o", api="openai", concurrent_requests=1, sleep_after_request=0, temperature=1, cache_dir=str(tmp_path))
+    outputs, detailed_cost, _ = querier.run_queries(queries)
+    assert n_calls["n"] == 4 and len(set(outputs)) == 4 # identical queries are independent samples
+    assert querier.cache.get_stats()["writes"] == 4 and querier.cache.get_stats()["hits"] == 0
+    assert len(list(tmp_path.glob("*/*/*.json.gz"))) == 4
+
+    # a rerun replays every sample, also in read-only mode, replayed responses cost nothing
+    for mode in ["rw", "ro"]:
+        replay = APIQuery("gpt-4o", api="openai", sleep_after_request=0, temperature=1, cache_dir=str(tmp_path), cache_mode=mode)
+        replay_outputs, replay_cost, total = replay.run_queries(queries)
+        assert replay_outputs == outputs and total["cost"] == 0
+        assert replay_cost == [{**d, "cost": 0, "cached": True} for d in detailed_cost]
+        stats = replay.cache.get_stats()
+        assert n_calls["n"] == 4 and stats["hit_rate"] == 1 and stats["writes"] == 0
+        assert stats["saved_cost"] == sum(d["cost"] for d in detailed_cost) > 0
+
+    # any change of the request misses, read-only mode does not store the new response
+    other = APIQuery("gpt-4o", api="openai", sleep_after_request=0, temperature=0.5, cache_dir=str(tmp_path), cache_mode="ro")
+    assert other.run_queries(queries[:1])[0] == ["sample 5 t=0.5"]
+    assert other.cache.get_stats()["misses"] == 1 and len(list(tmp_path.glob("*/*/*.json.gz"))) == 4
+
+    # write-only mode queries the provider and refreshes the entries
+    refresh = APIQuery("gpt-4o", api="openai", sleep_after_request=0, temperature=1, cache_dir=str(tmp_path), cache_mode="wo")
+    assert refresh.run_queries(queries[3:])[0] == ["sample 6 t=1"]
+    assert ResponseCache(str(tmp_path)).get(refresh.get_cache_keys(queries[3:])[0])["output"] == "sample 6 t=1"
+
+def test_streaming(monkeypatch, tmp_path):
+    deltas = ["The answer is ", "\\boxed{", "1, \\{2\\}", "}", ".", " Let", " me", " double", " check", "."] + [" more"] * 100
+    sent = []
+    async def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        return event_stream(chat_chunks(deltas), sent)
+    use_mock_transport(monkeypatch, handler)
+
+    querier = APIQuery("gpt-4o", api="openai", sleep_after_request=0, stream=True)
+    outputs, detailed_cost, _ = querier.run_queries([[{"role": "user", "content": "q"}]])
+    assert outputs == ["".join(deltas)]
+    assert detailed_cost[0]["input_tokens"] == 10 and detailed_cost[0]["output_tokens"] == len(deltas) # reported usage
+    assert detailed_cost[0]["ttft"] >= 0 and detailed_cost[0]["tokens_per_second"] > 0 and not detailed_cost[0]["truncated"]
+
+    # stop 3 chunks after the balanced box, the rest of the stream is not read
+    sent.clear()
+    querier = APIQuery("gpt-4o", api="openai", sleep_after_request=0, stop_predicates=[BoxedAnswerStop(n_tokens=3)], cache_dir=str(tmp_path))
+    outputs, detailed_cost, cost = querier.run_queries([[{"role": "user", "content": "q" * 40}]] * 2)
+    assert outputs == ["The answer is \\boxed{1, \\{2\\}}. Let me"] * 2
+    # truncated outputs are not cached, a run without early stop would replay them as full completions
+    assert querier.cache.get_stats()["writes"] == 0 and len(list(tmp_path.iterdir())) == 0
+    assert len(sent) < 2 * 20 and all(d["truncated"] for d in detailed_cost)
+    # the usage of a stopped stream is estimated: at least one token per chunk, the prompt at 4 characters per token
+    assert detailed_cost[0]["output_tokens"] >= 7 and detailed_cost[0]["input_tokens"] == 10
+    assert cost["cost"] == sum(querier.get_cost(d) for d in detailed_cost) > 0
+
+    outputs, detailed_cost, _ = APIQuery("gpt-4o", api="openai", sleep_after_request=0, stop_predicates=[ByteBudgetStop(20)]).run_queries([[{"role": "user", "content": "q"}]])
+    assert outputs[0] == "".join(deltas[:2]) and detailed_cost[0]["truncated"]
+
+def test_batch_mode(monkeypatch, tmp_path):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    queries = [[{"role": "system", "content": "Be brief."}, {"role": "user", "content": f"question {i}"}] for i in range(30)]
+    with MockLLMServer(batch_delay=0.2, batch_error_rate=0.2) as server:
+        querier = APIQuery("gpt-4o", api="openai", batch=True, batch_dir=str(tmp_path / "batches"), batch_poll_interval=0.05,
+                           sleep_after_request=0, cache_dir=str(tmp_path / "cache"))
+        querier.base_url = server.url
+        outputs, detailed_cost, cost = querier.run_queries(queries)
+        assert outputs == [f"Mock response to: question {i}" for i in range(30)]
+        # one batch, the requests that failed in it are sent one by one (at the full price)
+        assert server.stats["batches_created"] == 1 and server.stats["batch_requests"] == 30 and server.stats["completions"] == 30
+        full_costs = [querier.get_cost(d) for d in detailed_cost]
+        n_batch_priced = sum(d["cost"] == c / 2 for d, c in zip(detailed_cost, full_costs))
+        assert 0 < n_batch_priced < 30 and sum(d["cost"] == c for d, c in zip(detailed_cost, full_costs)) == 30 - n_batch_priced
+        assert cost["cost"] == sum(d["cost"] for d in detailed_cost)
+        assert len(list((tmp_path / "batches").iterdir())) == 0 # the saved batch ID is removed once its results are in
+
+        # a replay from the cache saves what the batch cost, at the batch price where it applied
+        replay = APIQuery("gpt-4o", api="openai", batch=True, batch_dir=str(tmp_path / "batches"), sleep_after_request=0,
+                          cache_dir=str(tmp_path / "cache"), base_url=server.url)
+        assert replay.run_queries(queries)[0] == outputs and server.stats["batches_created"] == 1
+        assert abs(replay.cache.get_stats()["saved_cost"] - cost["cost"]) < 1e-12
+
+def test_batch_resume(monkeypatch, tmp_path):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    queries = [[{"role": "user", "content": f"question {i}"}] for i in range(5)]
+    with MockLLMServer(batch_delay=1.0) as server:
+        def get_querier():
+            querier = APIQuery("gpt-4o", api="openai", batch=True, batch_dir=str(tmp_path), batch_poll_interval=0.05)
+            querier.base_url = server.url
+            return querier
+        # the run is interrupted while the batch is in progress
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(asyncio.wait_for(get_querier().run_queries_async(queries), timeout=0.3))
+        assert server.stats["batches_created"] == 1 and len(list(tmp_path.iterdir())) == 1
+        outputs, _, _ = get_querier().run_queries(queries)
+        assert outputs == [f"Mock response to: question {i}" for i in range(5)]
+        assert server.stats["batches_created"] == 1 and server.stats["completions"] == 5
+        assert len(list(tmp_path.iterdir())) == 0
+
+def test_anthropic_batch_mode(monkeypatch, tmp_path):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    queries = [[{"role": "system", "content": "Be brief."}, {"role": "user", "content": f"question {i}"}] for i in range(10)]
+    with MockLLMServer() as server:
+        querier = APIQuery("claude-3-5-sonnet", api="anthropic", batch=True, batch_dir=str(tmp_path), batch_poll_interval=0.05)
+        querier.base_url = server.url[:-len("/v1")]
+        outputs, detailed_cost, _ = querier.run_queries(queries)
+        assert outputs == [f"Mock response to: question {i}" for i in range(10)]
+        assert server.stats["batches_created"] == 1 and server.stats["completions"] == 10
+        assert all(d["input_tokens"] == 6 for d in detailed_cost) # system and user message
+
+def test_telemetry(monkeypatch, tmp_path):
+    n_calls = {}
+    async def handler(request):
+        content = json.loads(request.content)["messages"][-1]["content"]
+        n_calls[content] = n_calls.get(content, 0) + 1
+        if content == "flaky" and n_calls[content] == 1:
+            return httpx.Response(500, json={"error": {"message": "server error"}})
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=chat_completion(f"answer to {content}", completion_tokens=20))
+    use_mock_transport(monkeypatch, handler)
+
+    path = tmp_path / "run" / "telemetry.jsonl"
+    querier = APIQuery("gpt-4o", api="openai", concurrent_requests=2, sleep_after_request=0, backoff_base=0.01, telemetry_path=str(path))
+    _, detailed_cost, cost = querier.run_queries([[{"role": "user", "content": content}] for content in ["flaky", "a", "b", "c"]])
+    querier.telemetry.close()
+
+    events = load_events(str(path))
+    assert len(events) == 5 and all(event["provider"] == "openai" and event["model"] == "gpt-4o" for event in events)
+    failed = [event for event in events if event.get("error") is not None]
+    assert len(failed) == 1 and failed[0]["error"] == "retryable" and failed[0]["error_class"] == "InternalServerError"
+    assert failed[0]["attempt"] == 0 and failed[0]["backoff"] >= 0
+    assert sorted(event["attempt"] for event in events) == [0, 0, 0, 0, 1]
+    assert all(event["latency"] >= 0.01 and event["queue_wait"] >= 0 for event in events if event.get("error") is None)
+
+    summary = summarize_telemetry(str(path))
+    stats = summary["providers"]["openai"]
+    assert summary["n_events"] == 5 and summary["models"]["gpt-4o"]["n_attempts"] == 5
+    assert stats["n_successes"] == 4 and stats["retry_rate"] == 1 / 5 and stats["errors"] == {"retryable": 1}
+    assert stats["latency_p50"] <= stats["latency_p95"] <= stats["latency_p99"]
+    assert stats["output_tokens"] == 80 and stats["tokens_per_second"] > 0
+    assert abs(stats["cost"] - cost["cost"]) < 1e-12
+    assert stats["n_cached"] == 0 and stats["cache_hit_rate"] == 0
+
+    # replayed responses are recorded as cached, they do not count as provider requests
+    path = tmp_path / "cached" / "telemetry.jsonl"
+    querier = APIQuery("gpt-4o", api="openai", sleep_after_request=0, telemetry_path=str(path), cache_dir=str(tmp_path / "cache"))
+    for _ in range(2):
+        querier.run_queries([[{"role": "user", "content": content}] for content in ["a", "b"]])
+    querier.telemetry.close()
+    events = load_events(str(path))
+    assert [event.get("cached", False) for event in events] == [False, False, True, True]
+    assert all(event["cost"] == 0 and "latency" not in event for event in events[2:])
+    stats = summarize_telemetry(str(path))["providers"]["openai"]
+    assert stats["n_attempts"] == stats["n_successes"] == 2 and stats["n_cached"] == 2 and stats["cache_hit_rate"] == 0.5
+    assert stats["retry_rate"] == 0 and stats["output_tokens"] == 40 and stats["latency_p50"] >= 0.01
+
+def test_mock_server_load(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "mock")
+    queries = [[{"role": "user", "content": f"question {i}"}] for i in range(60)]
+    with MockLLMServer(latency="uniform:0.02,0.05", tokens_per_second=2000, rate_limit_rate=0.15, error_rate=0.1, retry_after=0.01) as server:
+        querier = APIQuery("gpt-4o", api="openai", base_url=server.url, stream=True, concurrent_requests=30,
+                           sleep_after_request=0, backoff_base=0.01, sleep_on_error=0.05, max_retries=20)
+        outputs, detailed_cost, _ = querier.run_queries(queries)
+        assert outputs == [f"Mock response to: question {i}" for i in range(60)]
+        assert all(d["ttft"] >= 0.02 and not d["truncated"] for d in detailed_cost)
+        assert all(d["output_tokens"] == count_tokens(output) for output, d in zip(outputs, detailed_cost))
+        stats = querier.get_rate_limiter().get_stats()
+        assert server.stats["rate_limited"] == stats["rate_limited"] > 0 and server.stats["errors"] == stats["retryable"] > 0
+        assert server.stats["streams"] == 60 and 1 < server.stats["max_in_flight"] <= 30
+
+def test_mock_server_responders(monkeypatch, tmp_path):
+    from math_construct.llm import CoTSolver
+    from math_construct.problems import get_matching_problem_classes
+    from math_construct.problems.batch_check import check_many
+    from math_construct.problems.generation import generate_variations
+    monkeypatch.setenv("OPENAI_API_KEY", "mock")
+    problems = generate_variations(get_matching_problem_classes(["dutch-2012-2", "emc-2016-1"], []), 2)
+    problems = [problem for variations in problems for problem in variations]
+
+    # templated answers from the solutions, checked by the solvers like a model's
+    with MockLLMServer(responder=SolutionResponder(problems)) as server:
+        solver = CoTSolver(APIQuery("gpt-4o", api="openai", base_url=server.url, sleep_after_request=0))
+        transcripts, _ = solver.solve(problems)
+    assert all(is_correct for _, is_correct, _ in check_many(zip(problems, transcripts)))
+
+    # replayed from a recorded run
+    run_file = tmp_path / "run" / "gpt-4o" / "problems.json"
+    run_file.parent.mkdir(parents=True)
+    run_file.write_text(json.dumps([{"problem": problem.to_json(), "response": [{"role": "assistant", "content": f"recorded {i}"}]}
+                                    for i, problem in enumerate(problems)]))
+    with MockLLMServer(responder=ReplayResponder([str(tmp_path / "run")])) as server:
+        solver = CoTSolver(APIQuery("gpt-4o", api="openai", base_url=server.url, sleep_after_request=0))
+        transcripts, _ = solver.solve(problems)
+    assert [transcript[-1]["content"] for transcript in transcripts] == [f"recorded {i}" for i in range(len(problems))]
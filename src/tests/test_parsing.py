@@ -2,7 +2,10 @@ import pytest
 from math_construct.parsing import parse_answer, match_list_depth
 from fractions import Fraction
 from math_construct.problems.imo_shortlist.problem_2001_c5 import Problem17
+from math_construct.problems.transcript_index import TranscriptIndex, get_boxed_message
+from math_construct.latex_eval import get_branch_timings
 import pytest
+import pickle
 import time
 import sympy
 
@@ -132,4 +135,106 @@ def test_errors():
 
 def test_latex():
     assert parse_answer(r"\cos(\frac{2\pi}{9})") == 0.766044443118978
-    assert parse_answer(r"\log_8 13") == 1.2334799060470307
\ No newline at end of file
+    assert parse_answer(r"\log_8 13") == 1.2334799060470307
+
+def test_latex_cache():
+    from math_construct.latex_eval import get_latex_expression
+    expression = get_latex_expression(r"\frac{3}{6} + 2^{10}")
+    assert get_latex_expression(r"\frac{3}{6} + 2^{10}") is expression
+    assert expression.get_value(Fraction) == Fraction(2049, 2) and expression.get_value() == 1024.5
+    assert get_latex_expression(r"9 \cdot 10^{4999}").get_value() == 9 * 10 ** 4999
+    assert get_latex_expression(r"\sqrt{2}").get_value(Fraction) is None
+    hits = get_latex_expression.cache_info().hits
+    assert parse_answer(r"\frac{1}{2}, \frac{1}{2}, 2^{10}, 2^{10}", Fraction) == [Fraction(1, 2), Fraction(1, 2), 1024, 1024]
+    assert get_latex_expression.cache_info().hits > hits
+    with pytest.raises(ValueError):
+        get_latex_expression(r"\frac{1}{").get_expr()
+
+def test_fast_path():
+    # common answer tokens that are evaluated without sympy, with the same result as the sympy path
+    from math_construct.latex_eval import get_fast_value, LatexExpression
+    tokens = ["-3", "2^{10}", "2^10", r"\frac{1}{2}", r"-\frac{3}{4}", "1/3", "-20/100", r"9 \cdot 10^{4999} - 1",
+              r"2 \times 3 + 1", "(2+3)*4", "-2^{2}", "2^{-1}", "10^{300}", "1000000000000000000000/3", r"5^3 \cdot 2"]
+    for token in tokens:
+        for primitive_type in [None, int, Fraction]:
+            fast_value = get_fast_value(token, primitive_type)
+            sympy_value = LatexExpression(token).get_value(primitive_type)
+            if fast_value is not None:
+                assert type(fast_value) == type(sympy_value) and fast_value == sympy_value, token
+            else:
+                assert token == "2^{-1}" and primitive_type == Fraction
+    # cancelling sums are left to sympy, whose N() does not give 0 for them
+    assert get_fast_value("3-2-1") is None and get_fast_value("2^-1") is None and get_fast_value("2 3") is None
+    assert parse_answer("-3, 2^{10}, -\\frac{1}{2}", Fraction) == [Fraction(-3), 1024, Fraction(-1, 2)]
+
+def test_fast_list_parser():
+    # FastParseList makes the same decisions as ParseList, including on malformed answers
+    answers = [
+        "1, 2, 3", r"1\n2\n3", "(1, 2), (3, 4),", "((1,2),(3,4)), 5", r"\frac{1}{2}, \frac{x}{2}, \frac{1}{2}+1, -\frac{3}{4}",
+        "(1+2)*3, (4)", "1,,2", "f(1,2), 3", r"\begin{pmatrix} 1 & 2 \\ 3 & 4 \end{pmatrix}, (1, 2)", "(1, 2", "1, 2)",
+        r"\{\{1, 17\}, \{2, 18\}\}", r"[[1, 1, 2]\n[1, 2,3)\n(1, 3,4)]\n[[1,2,3]]", r"\ 5, \\\(1, 2)", "3b,b,b,\\frac{1}{3}",
+        r"\begin{array}{cc}(1, 2) & (2,3) \\ 3 & (1,2)\end{array}, 2", ", ".join(str(i) for i in range(3000)),
+    ]
+    for answer in answers:
+        for primitive_type in [None, int, Fraction, str]:
+            outputs = []
+            for legacy_parser in [True, False]:
+                try:
+                    outputs.append(parse_answer(answer, primitive_type, legacy_parser=legacy_parser))
+                except Exception as e:
+                    outputs.append(f"{type(e).__name__}: {e}")
+            assert outputs[0] == outputs[1], (answer, primitive_type)
+
+def test_transcript_index():
+    message = get_boxed_message(r"} first \boxed{1, \{2\}} then \boxed{\frac{1}{2}, \boxed{3}} and \boxed{4")
+    assert message.get_boxed_contents() == [r"1, \{2\}", r"\frac{1}{2}, \boxed{3}", "3"]
+    assert message.get_last_boxed_content() is None # the last \boxed{ is not closed
+    assert get_boxed_message(r"\boxed{1} \boxed{\boxed{2}}").get_last_boxed_content() == "2"
+    assert get_boxed_message("no answer").get_last_boxed_content() is None
+
+    transcript = [{"role": "user", "content": r"\boxed{1}"}, {"role": "assistant", "content": r"\boxed{2}"}]
+    index = TranscriptIndex(transcript)
+    assert [i for i, _ in index.iter_candidates()] == [1]
+    transcript = transcript + [{"role": "user", "content": "```\n\\boxed{x}\n```"}, {"role": "assistant", "content": "Great"}]
+    assert [i for i, _ in index.extend(transcript).iter_candidates()] == [3, 2, 1]
+    assert Problem17.parse_list(transcript, index) == [[2]]
+    # a different transcript rebuilds the index
+    assert [i for i, _ in index.extend([{"role": "assistant", "content": "a"}]).iter_candidates()] == [0]
+    # parse failures are kept as (type, message), each later parse raises a fresh exception
+    index = TranscriptIndex()
+    with pytest.raises(Exception) as first:
+        Problem17.parse_list([{"role": "assistant", "content": "no answer here"}], index)
+    _, message = next(index.iter_candidates())
+    assert message.parse_failures[Problem17] == (type(first.value), str(first.value))
+    with pytest.raises(Exception) as second:
+        Problem17.parse_list([{"role": "assistant", "content": "no answer here"}], index)
+    assert second.value is not first.value and str(second.value) == str(first.value)
+    # the index keeps the boxed contents but not the messages, its pickle does not grow with their length
+    long_transcript = [{"role": "assistant", "content": "x" * 1000000 + r"\boxed{2}"}]
+    index = TranscriptIndex(long_transcript)
+    assert len(pickle.dumps(index)) < 1000
+    assert Problem17.parse_list(long_transcript, pickle.loads(pickle.dumps(index))) == [[2]]
+
+def test_exact_evaluation():
+    # integers are evaluated exactly, also past the 50001 digits of the numeric evaluation
+    assert match_list_depth(parse_answer(r"10^{60000}+1"), 0) == 10 ** 60000 + 1
+    assert match_list_depth(parse_answer(r"\binom{40}{20}"), 0) == 137846528820
+    assert match_list_depth(parse_answer(r"2^{2023}-1"), 0) == 2 ** 2023 - 1
+    assert match_list_depth(parse_answer(r"\sqrt{4} \cdot 5!"), 0) == 240
+    # irrational values fall back to the numeric evaluation
+    assert match_list_depth(parse_answer(r"\sqrt{2} \cdot 10^{20}"), 0) == 141421356237309504880
+    assert get_branch_timings().counts.get("exact", 0) > 0
+
+def test_fast_matrix_rows():
+    matrix = r"\begin{array}{ccc}" + r" \\ ".join(" & ".join(str(30 * i + j) for j in range(30)) for i in range(30)) + r"\end{array}"
+    assert parse_answer(matrix, int) == [[30 * i + j for j in range(30)] for i in range(30)]
+    for answer in [r"\begin{pmatrix} 1 & -2 & 007 \\ +3 & 4 & -99999999999999999999 \end{pmatrix}",
+                   r"\begin{bmatrix} 1 &\n 2 \\ 3 & x \\ \frac{1}{2} & 4, \\ \end{bmatrix}, 5", r"\begin{array}{c} 1 \\ 2 \end{array}"]:
+        for primitive_type in [None, int, Fraction, str]:
+            outputs = []
+            for legacy_parser in [True, False]:
+                try:
+                    outputs.append(parse_answer(answer, primitive_type, legacy_parser=legacy_parser))
+                except Exception as e:
+                    outputs.append(f"{type(e).__name__}: {e}")
+            assert outputs[0] == outputs[1], (answer, primitive_type)
@@ -1,8 +1,24 @@
 import pytest
 from math_construct.problems.usamts.problem_1998_4_1 import Problem3
 from math_construct.problems.usamts.problem_2001_4_4 import Problem10
-from math_construct.problems import Problem
+from math_construct.problems import Problem, get_all_problem_classes
+from math_construct.problems.problem import CheckerTag, ProblemConfig
+from math_construct.problems.checker_pool import CheckerPool
+from math_construct.problems.batch_check import check_many
+from math_construct.problems.generation import generate_variations
+from math_construct.problems.check_stats import CheckStats, set_check_stats
+from math_construct.problems.checker_benchmark import benchmark_problem, compare_results, get_bad_answer
+from math_construct.problems.parser_benchmark import benchmark_parser, collect_answers, compare_outputs, format_answer
+from math_construct.problems.verdict_cache import VerdictCache, get_verdict_cache, set_verdict_cache
+from math_construct.problems.solution_cache import SolutionCache, get_solution_cache, set_solution_cache
 from math_construct.utils import get_depth
+import inspect
+import numpy as np
+import os
+import pickle
+import random
+import subprocess
+import sys
 import time
 from fractions import Fraction
 
@@ -27,6 +43,232 @@ def test_timeout_checker():
     with pytest.raises(TimeoutError):
         problem.check_with_timeout("123")
 
+def test_checker_pool():
+    pool = CheckerPool(max_workers=2, max_tasks_per_worker=3)
+    # workers are reused and retire after max_tasks_per_worker tasks
+    pids = [pool.run(os.getpid) for _ in range(6)]
+    assert len(set(pids)) == 2
+    assert os.getpid() not in pids
+    # a worker that times out is killed and replaced
+    with pytest.raises(TimeoutError):
+        pool.run(time.sleep, 4, timeout=1)
+    assert pool.run(sum, [1, 2, 3]) == 6
+    with pytest.raises(ZeroDivisionError):
+        pool.run(divmod, 1, 0)
+    pool.shutdown()
+    assert pool.n_workers == 0
+
+def test_check_many():
+    problems = [Problem3(8, 9, 31), Problem3(6, 7, 5), Problem3(8, 9, 31)]
+    outputs = [
+        [{"role": "assistant", "content": r"\boxed{" + problems[0].config.original_solution + "}"}],
+        [{"role": "assistant", "content": r"\boxed{67676}"}],
+        [{"role": "assistant", "content": "No boxed answer"}],
+    ]
+    results, durations = check_many(zip(problems, outputs), return_durations=True)
+    assert results == [problem.parse_and_check(output) for problem, output in zip(problems, outputs)]
+    assert results[0][1] and not results[2][1]
+    assert len(durations) == 3
+
+def test_check_many_transcript_indexes():
+    from math_construct.problems.transcript_index import TranscriptIndex
+    problem = Problem3(6, 7, 13)
+    transcript = [{"role": "user", "content": "question"}, {"role": "assistant", "content": "no answer here"}]
+    indexes = [TranscriptIndex()]
+    assert not check_many([(problem, transcript)], use_cache=False, indexes=indexes)[0][1]
+    # the index comes back from the parse worker with the failure of the first round
+    first_index = indexes[0]
+    assert len(first_index) == 2 and Problem3 in next(first_index.iter_candidates())[1].parse_failures
+    transcript = transcript + [{"role": "user", "content": "feedback"}, {"role": "assistant", "content": r"\boxed{7666766667776}"}]
+    assert check_many([(problem, transcript)], use_cache=False, indexes=indexes)[0][1]
+    assert indexes[0] is not first_index and len(indexes[0]) == 4
+    assert Problem3 in indexes[0].candidates[0][1].parse_failures
+
+def test_verdict_cache(tmp_path):
+    previous_cache = get_verdict_cache()
+    cache = VerdictCache(str(tmp_path / "verdicts.sqlite"), max_entries=2)
+    set_verdict_cache(cache)
+    try:
+        problems = [Problem3(8, 9, 31), Problem3(6, 7, 5), Problem3(6, 7, 13)]
+        outputs = [[{"role": "assistant", "content": r"\boxed{67676}"}] for _ in problems]
+        results = check_many(zip(problems, outputs))
+        assert cache.n_hits == 0 and cache.n_misses == 3
+        # same parameters and messages hit the cache, irrelevant messages are ignored
+        outputs_with_feedback = [[{"role": "user", "content": "feedback"}] + output for output in outputs]
+        assert check_many(zip(problems[1:], outputs_with_feedback[1:])) == results[1:]
+        assert cache.n_hits == 2
+        # the least recently used entry was evicted
+        key = cache.get_key(problems[0], outputs[0])
+        assert cache.get(key) is None
+        assert cache.get(cache.get_key(problems[1], outputs[1]))[:3] == results[1]
+        # a change in the checker code invalidates all entries of the problem
+        cache.conn.execute("UPDATE code_versions SET code_hash = 'outdated'")
+        cache.code_hashes = {}
+        assert cache.get(cache.get_key(problems[1], outputs[1])) is None
+    finally:
+        cache.close()
+        set_verdict_cache(previous_cache)
+
+def test_verdict_cache_shared_code(tmp_path, monkeypatch):
+    import math_construct.problems.verdict_cache as verdict_cache
+    shared_files = [os.path.basename(path) for path in verdict_cache.SHARED_CODE_FILES]
+    assert all(name in shared_files for name in ["parsing.py", "latex_eval.py", "transcript_index.py", "check_stats.py"])
+    assert all("llm" not in path and "usamts" not in path for path in verdict_cache.SHARED_CODE_FILES)
+    # a change in any shared module invalidates the cached verdicts
+    shared_file = tmp_path / "shared.py"
+    shared_file.write_text("x = 1")
+    monkeypatch.setattr(verdict_cache, "SHARED_CODE_FILES", verdict_cache.SHARED_CODE_FILES + [str(shared_file)])
+    problem, output = Problem3(6, 7, 13), [{"role": "assistant", "content": r"\boxed{67676}"}]
+    cache = VerdictCache(str(tmp_path / "verdicts.sqlite"))
+    key = cache.get_key(problem, output)
+    cache.put(key, problem.config.name, (67676, True, "", 0.0))
+    cache.close()
+    cache = VerdictCache(str(tmp_path / "verdicts.sqlite"))
+    assert cache.get(cache.get_key(problem, output)) is not None
+    cache.close()
+    shared_file.write_text("x = 2")
+    cache = VerdictCache(str(tmp_path / "verdicts.sqlite"))
+    assert cache.get_key(problem, output) != key and cache.get(key) is None
+    cache.close()
+
+def test_solution_cache(tmp_path):
+    n_calls = []
+    def get_solution(n):
+        n_calls.append(n)
+        return [[str(i)] * n for i in range(n)]
+
+    def make_config():
+        return ProblemConfig(name="test-deferred", statement="", formatting_instructions=None, parameters=[], source="",
+                             original_solution=lambda: get_solution(3), original_parameters={})
+
+    previous_cache = get_solution_cache()
+    set_solution_cache(SolutionCache(str(tmp_path)))
+    try:
+        class DeferredProblem(Problem):
+            config = make_config()
+        # the solution is only computed on first access
+        assert n_calls == []
+        assert DeferredProblem.get_solution_info() == (str, 2)
+        assert DeferredProblem.config.original_solution == get_solution(3)
+        assert len(n_calls) == 2
+        # a fresh config loads the solution and its structure from disk
+        class CachedProblem(Problem):
+            config = make_config()
+        assert CachedProblem.get_solution_info() == (str, 2)
+        assert CachedProblem.config.original_solution == get_solution(3)
+        assert CachedProblem.parse(r"\boxed{(1, 2), (3, 4)}") == [["1", "2"], ["3", "4"]]
+        assert len(n_calls) == 3
+        assert "original_solution" in CachedProblem.config.to_dict()
+    finally:
+        set_solution_cache(previous_cache)
+
+def test_solution_cache_shared_code(tmp_path, monkeypatch):
+    import math_construct.problems.verdict_cache as verdict_cache
+    shared_file = tmp_path / "shared.py"
+    shared_file.write_text("x = 1")
+    monkeypatch.setattr(verdict_cache, "SHARED_CODE_FILES", verdict_cache.SHARED_CODE_FILES + [str(shared_file)])
+    source_file = inspect.getsourcefile(Problem3)
+    SolutionCache(str(tmp_path / "solutions")).put("test-shared", source_file, (int, 1), [1, 2])
+    assert SolutionCache(str(tmp_path / "solutions")).get_solution("test-shared", source_file) == (True, [1, 2])
+    # a change in the shared code (e.g. problem.py or parsing.py) invalidates the cached solutions
+    shared_file.write_text("x = 2")
+    assert SolutionCache(str(tmp_path / "solutions")).get_solution("test-shared", source_file) == (False, None)
+
+def test_deferred_solution_pickle():
+    from math_construct.problems.konhauser.problem_2014_7 import ProblemKonhauser20147, get_solution
+    fields = {field: ProblemKonhauser20147.config.__dict__[field] for field in ["name", "statement", "formatting_instructions", "parameters", "source", "original_parameters"]}
+    config = ProblemConfig(**fields, original_solution=ProblemKonhauser20147.config.__dict__["solution_fn"])
+    # pickling (e.g. to a checker worker) leaves the solution deferred, the worker finds the function in the module
+    unpickled = pickle.loads(pickle.dumps(config))
+    assert "original_solution" not in config.__dict__ and "original_solution" not in unpickled.__dict__
+    assert unpickled.is_solution_deferred() and "solution_fn" not in unpickled.__dict__
+    assert unpickled.original_solution == get_solution(3, 3, 2)
+    # a computed solution is pickled as a value
+    assert pickle.loads(pickle.dumps(unpickled)).__dict__["original_solution"] == get_solution(3, 3, 2)
+
+def test_check_stats(tmp_path):
+    stats = CheckStats()
+    set_check_stats(stats)
+    try:
+        problem = Problem3(8, 9, 31)
+        problem.parse_and_check([{"role": "assistant", "content": r"\boxed{" + problem.config.original_solution + "}"}])
+        problem.parse_and_check([{"role": "assistant", "content": "no answer"}])
+        check_many([(problem, [{"role": "assistant", "content": r"\boxed{67676}"}])], use_cache=False)
+    finally:
+        set_check_stats(None)
+    assert len(stats.records) == 3
+    assert stats.records[0]["check_time"] > 0 and stats.records[0]["peak_rss_mb"] > 0
+    assert stats.records[1]["check_time"] is None and stats.records[1]["answer_size"] == 0
+    assert stats.records[2]["answer_size"] == 1 and not stats.records[2]["timed_out"]
+    summary = stats.summarize()
+    assert len(summary) == 1 and summary[0]["n"] == 3 and summary[0]["n_checked"] == 2
+    assert sum(summary[0][f"check_hist_{bucket}"] for bucket in ["<0.001s", "<0.01s", "<0.1s", "<1s", "<10s", ">=10s"]) == 2
+    for fmt in ["jsonl", "csv"]:
+        records_path, summary_path = stats.write(str(tmp_path), fmt)
+        assert os.path.exists(records_path) and os.path.exists(summary_path)
+
+def test_checker_benchmark():
+    cases = benchmark_problem(Problem10, n_instances=1, n_repeats=2)
+    assert set(cases.keys()) == {"original", "generated_0", "scaled", "bad"}
+    assert cases["original"]["is_correct"] and cases["generated_0"]["is_correct"]
+    assert cases["scaled"]["params"]["k"] > 9 and cases["scaled"]["answer_size"] > cases["original"]["answer_size"]
+    assert not cases["bad"]["is_correct"] and cases["bad"]["time_min"] > 0
+    assert get_bad_answer([1, 2, 3]) == [1, 1, 2] and get_bad_answer((5,)) == (6,) and get_bad_answer("x") is None
+
+    baseline = {"problems": {"p": {"original": {"time_min": 0.1, "is_correct": True},
+                                   "bad": {"time_min": 0.1, "is_correct": False},
+                                   "scaled": {"time_min": 0.0001, "is_correct": True}}}}
+    current = {"problems": {"p": {"original": {"time_min": 0.2, "is_correct": True},
+                                  "bad": {"time_min": 0.1, "is_correct": True},
+                                  "scaled": {"time_min": 0.0005, "is_correct": True}},
+                            "q": {"original": {"time_min": 1.0, "is_correct": True}}}}
+    status = {entry["case"]: entry["status"] for entry in compare_results(baseline, current, threshold=0.2)}
+    assert status == {"original": "regression", "bad": "verdict_changed", "scaled": "ok"}
+
+def test_parser_benchmark(tmp_path):
+    import json
+    os.makedirs(tmp_path / "run" / "model")
+    instances = [{"response": [{"role": "user", "content": r"\boxed{9}"},
+                               {"role": "assistant", "content": r"First \boxed{(1, 2), (3, 4)}, then \boxed{(1, 2), (3, x)}"}]}]
+    with open(tmp_path / "run" / "model" / "imo-shortlist-2001-c5.json", "w") as f:
+        json.dump(instances, f)
+    with open(tmp_path / "data.json", "w") as f:
+        json.dump([{"config": {"name": "imo-shortlist-2001-c5", "original_solution": [[1, 2], [5, 6]]}},
+                   {"problem_name": "unknown-problem", "response": r"\boxed{1}"}], f)
+    assert format_answer([[1, Fraction(-1, 2)], [3, 4]]) == r"(1, -\frac{1}{2}), (3, 4)"
+
+    answers = collect_answers([str(tmp_path / "run")], [str(tmp_path / "data.json")])
+    assert [answer["answer"] for answer in answers] == ["(1, 2), (3, 4)", "(1, 2), (3, x)", "(1, 2), (5, 6)"]
+    assert answers[0]["primitive_type"] == int and answers[0]["depth"] == 2
+    results = benchmark_parser(answers, n_repeats=2)
+    assert results["summary"]["n_answers"] == 3 and results["summary"]["n_errors"] == 1
+    assert results["summary"]["time_p50"] <= results["summary"]["time_max"] and len(results["slowest"]) == 3
+    assert compare_outputs(results, results) == []
+    golden = json.loads(json.dumps(results))
+    golden["outputs"][answers[0]["key"]]["output_hash"] = "0"
+    assert [entry["key"] for entry in compare_outputs(golden, results)] == [answers[0]["key"]]
+
+def test_answer_format_precheck():
+    from math_construct.problems.emc.problem_2016_1 import ProblemEMC20161
+    problem = ProblemEMC20161(10)
+    assert problem.get_answer_format() == {"is_integer": True, "expected_length": 10, "min_val_inclusive": 1}
+    task_stats = {}
+    assert problem.check_answer([1, 2], task_stats) == (False, f"{CheckerTag.INCORRECT_LENGTH}: Expected 10 elements, got 2")
+    assert task_stats == {"prechecked": True}
+    # answers the format cannot be checked on are left to the checker, as are answers with the right format
+    assert problem.precheck_answer(5) is None
+    task_stats = {}
+    assert problem.check_answer(problem.get_solution(), task_stats)[0] and "prechecked" not in task_stats
+
+def test_answer_format_declared():
+    # every declared format evaluates for the original instance and accepts the original solution
+    problem_classes = [cls for cls in get_all_problem_classes(include_backups=True) if cls.config.answer_format is not None]
+    assert len(problem_classes) >= 30
+    for problem_class in problem_classes:
+        problem = problem_class.get_original()
+        assert problem.get_answer_format().keys() == problem_class.config.answer_format.keys()
+        assert problem.precheck_answer(problem.get_solution()) is None, problem_class.config.name
+
 def test_check_format():
     assert Problem.check_format([1, 2, 3], is_integer=True)[0]
     assert not Problem.check_format([1.001, 2, 3], is_integer=True)[0]
@@ -61,6 +303,32 @@ def test_check_format():
     assert Problem.check_format([[[1, 2, 3], [3, 4]], [[5, 6], [7, 8]]], expected_size_all_axes=[2, 2, None])[0]
     assert not Problem.check_format([[[1, 2], [3, 4]], [[5, 6], [7, 8]]], expected_size_all_axes=[2, 2, 3])[0]
 
+def test_check_format_vectorized(monkeypatch):
+    import math_construct.problems.problem as problem_module
+    matrix = [[i * 10 + j for j in range(10)] for i in range(10)]
+    cases = [
+        (matrix, dict(is_integer=True, is_unique=True, is_square_matrix=True, min_val_inclusive=0)),
+        (matrix, dict(max_val_exclusive=50)),
+        (matrix, dict(expected_size_all_axes=[10, 9])),
+        (matrix, dict(expected_size_all_axes=[10, 10, None])),
+        (matrix[:9] + [matrix[0]], dict(is_unique=True)),
+        ([row[:] for row in matrix[:9]] + [matrix[0][:9]], dict(is_matrix=True)),
+        ([[float(x) for x in row] for row in matrix], dict(is_integer=True)),
+        ([[float(x) for x in row] for row in matrix], dict(is_float=True, min_val_exclusive=0.5)),
+        ([tuple(row) for row in matrix], dict(is_unique=True, is_matrix=True)),
+        (list(range(100)), dict(is_matrix=True)),
+        (list(range(100)) + [2**70], dict(is_integer=True, max_val_inclusive=99)),
+    ]
+    for solution, kwargs in cases:
+        monkeypatch.setattr(problem_module, "VECTORIZED_CHECK_MIN_SIZE", 1)
+        vectorized = Problem.check_format(solution, **kwargs)
+        monkeypatch.setattr(problem_module, "VECTORIZED_CHECK_MIN_SIZE", float("inf"))
+        assert vectorized == Problem.check_format(solution, **kwargs)
+    # ragged and mixed solutions are left to the Python path
+    assert Problem.check_format_vectorized([[1, 2], [3]] * 50) is None
+    assert Problem.check_format_vectorized([1, 2.5] * 50) is None
+    assert Problem.check_format_vectorized([Fraction(1, 2)] * 100) is None
+
 def test_problem3_json_serialization():
     # Create an instance of Problem3
     original = Problem3(a=8, b=9, n=13)
@@ -154,8 +422,41 @@ def test_generate_instances():
     with pytest.raises(ValueError):
         problems = Problem10.generate_instances(15)
 
+def test_problem_hash():
+    assert Problem3(6, 7, 13) == Problem3(6, 7, 13)
+    assert hash(Problem3(6, 7, 13)) == hash(Problem3(6, 7, 13))
+    assert Problem3(6, 7, 13) != Problem3(6, 7, 5)
+    original = Problem3.get_original()
+    reconstructed = Problem3.from_json(original.to_json())
+    assert len({original, reconstructed, Problem3(6, 7, 5)}) == 2
+    reconstructed.set_revision("revised", None)
+    assert original != reconstructed
+
+def test_generate_variations():
+    problems = Problem3.generate_multiple(20)
+    assert len(set(problems)) == len(problems)
+    assert problems == Problem3.generate_multiple(20)
+    serial = generate_variations([Problem3, Problem10], 5)
+    assert generate_variations([Problem3, Problem10], 5, n_workers=2) == serial
+    assert [len(variations) for variations in serial] == [5, 5]
+
+def test_generate_variations_keeps_rng_state():
+    random.seed(123)
+    np.random.seed(123)
+    expected = (random.random(), np.random.rand())
+    random.seed(123)
+    np.random.seed(123)
+    generate_variations([Problem3], 5)
+    assert (random.random(), np.random.rand()) == expected
+
 def test_problem_str():
     problem = Problem3(6, 7, 13)
     assert "6" in str(problem)
     assert "7" in str(problem)
     assert "13" in str(problem)
+
+def test_big_integer_answers():
+    # a fresh process that only loads the problem base, like a checker worker, still parses huge integers
+    code = "import math_construct.problems.problem; from math_construct.parsing import parse_answer; print(len(str(parse_answer('9' * 5000))))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+    assert result.returncode == 0 and result.stdout.split()[-1] == "5000"
@@ -1,5 +1,6 @@
 from math_construct.parsing import parse_answer, match_list_depth
-from math_construct.problems import get_all_problem_classes
+from math_construct.problems import get_all_problem_classes, get_all_problem_names
+from math_construct.problems.registry import MANIFEST_PATH, build_manifest, get_stale_files
 from fractions import Fraction
 from math import factorial
 import math
@@ -102,6 +103,15 @@ def test_all_problems():
         orig_problem = problem_cls.get_original()
         assert orig_problem.check_raw(orig_problem.config.original_solution)
 
+def test_manifest():
+    # Rebuild with scripts/build_manifest.py if this fails
+    with open(MANIFEST_PATH, "r") as f:
+        manifest = json.load(f)
+    assert get_stale_files(manifest) == []
+    assert manifest == build_manifest()
+    assert len(set(get_all_problem_names())) == len(get_all_problem_names())
+    assert [p.config.name for p in get_all_problem_classes()] == get_all_problem_names()
+
 def test_problem0():
     from math_construct.problems.backups.problem0 import Problem0
     orig_problem = Problem0.get_original()